@@ -0,0 +1,215 @@
+"""ヘッドレスでゲームループを計測するベンチマーク
+
+SDLのダミードライバで画面と音を無効にし、乱数のシードとキー入力の台本を固定して
+指定フレーム数だけゲームをできるだけ速く進め、フェーズごとの処理時間とオブジェクト数をJSONで出力する。
+
+使い方:
+    python benchmark.py --frames 3000 --seed 1 --output result.json
+    python benchmark.py --script inputs.json
+    python benchmark.py --replay play.rec  # main.py --record で記録したプレイを再生して計測
+    python benchmark.py --dirty-rects      # 変わった部分だけを表示に反映するモードで計測
+    python benchmark.py --quality low      # エフェクトの量を変えて計測（autoは処理時間に応じて切り替える）
+
+キー入力の台本（--script）は次の形式のJSON:
+    [{"from": 0, "to": 600, "keys": ["RIGHT", "SPACE"]}, {"from": 600, "to": 700, "keys": ["UP"]}]
+fromのフレームからtoの直前のフレームまで、keysのキーが押されているものとして扱う。
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# main.pyのimport前に設定しておく必要がある
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import numpy as np
+import pygame
+
+# 起動時のログはJSONと混ざらないように標準エラー出力へ回す
+with contextlib.redirect_stdout(sys.stderr):
+    import main as game_module
+from dirty_rects import DirtyRects
+from frame_scheduler import PHASES as FRAME_PHASES
+from replay import InputReplay, PressedKeys
+
+# ゲームのフェーズ（FrameSchedulerで計測）と、表示への反映
+PHASES = FRAME_PHASES + ("flip",)
+
+# 台本を指定しない場合の入力：右へ進みながら定期的にジャンプと射撃をする
+DEFAULT_SCRIPT = [
+    {"from": 0, "to": 100000, "keys": ["RIGHT"]},
+    {"every": 40, "length": 3, "keys": ["UP"]},
+    {"every": 7, "length": 1, "keys": ["SPACE"]},
+]
+
+
+class InputScript:
+    """フレーム番号から押されているキーを求める入力の台本
+
+    各区間は {"from", "to", "keys"}（範囲指定）か
+    {"every", "length", "keys"}（every フレームごとに length フレームだけ押す）で指定する。
+    """
+
+    def __init__(self, entries):
+        self.entries = []
+        for entry in entries:
+            keys = frozenset(pygame.key.key_code(name.lower()) for name in entry["keys"])
+            self.entries.append((entry, keys))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def keys_at(self, frame):
+        """指定フレームで押されているキーを返す"""
+        pressed = set()
+        for entry, keys in self.entries:
+            if "every" in entry:
+                if frame % entry["every"] < entry.get("length", 1):
+                    pressed |= keys
+            elif entry.get("from", 0) <= frame < entry.get("to", frame + 1):
+                pressed |= keys
+        return PressedKeys(pressed)
+
+
+def summarize(samples):
+    """処理時間の一覧（秒）をミリ秒の統計値にまとめる"""
+    if not samples:
+        return {"total_ms": 0.0, "mean_ms": 0.0, "median_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "total_ms": round(sum(ordered) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(p95 * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def run(frames, seed, script, dirty_rects=False, quality="high"):
+    """指定フレーム数を進めて計測結果を返す"""
+    game_module.quality.set_mode(quality)
+    runtime = game_module.init_runtime()
+    screen = runtime.screen
+    game_module.seed_random(seed)
+    game = game_module.Game(runtime)
+    presenter = DirtyRects(screen.get_size(), enabled=dirty_rects)
+
+    timings = {phase: [] for phase in PHASES}
+    game.scheduler.hooks.append(lambda phase, elapsed: timings[phase].append(elapsed))
+    frame_times = []
+    peak_counts = dict.fromkeys(game.entity_counts(), 0)
+    simulated_frames = 0
+    idle_frames = 0  # ゲームオーバー中でゲームが進まなかったフレーム
+    perf_counter = time.perf_counter
+
+    gc_before = [generation["collections"] for generation in gc.get_stats()]
+    started = perf_counter()
+    while simulated_frames < frames:
+        frame_start = perf_counter()
+        pygame.event.pump()
+
+        if game.begin_frame():
+            keys = script.keys_at(simulated_frames)
+
+            game.update(keys)
+            game.handle_collisions()
+            game.draw(screen, dirty_rects=presenter)
+            simulated_frames += 1
+
+            for name, count in game.entity_counts().items():
+                if count > peak_counts[name]:
+                    peak_counts[name] = count
+        else:
+            idle_frames += 1
+
+        t4 = perf_counter()
+        presenter.present()
+        frame_end = perf_counter()
+        timings["flip"].append(frame_end - t4)
+        frame_times.append(frame_end - frame_start)
+        game_module.quality.record(frame_end - frame_start)
+    elapsed = perf_counter() - started
+    gc_collections = [generation["collections"] - before for generation, before in zip(gc.get_stats(), gc_before)]
+
+    return {
+        "frames": frames,
+        "idle_frames": idle_frames,
+        "seed": seed,
+        "elapsed_s": round(elapsed, 4),
+        "fps": round(len(frame_times) / elapsed, 2) if elapsed > 0 else None,
+        "frame": summarize(frame_times),
+        "phases": {phase: summarize(samples) for phase, samples in timings.items()},
+        "entities": {"peak": peak_counts, "final": game.entity_counts()},
+        "pools": game_module.pool_stats(),
+        "scratch_rects": game_module.scratch_rects.stats(),
+        "sound": runtime.sound_dispatcher.stats(),
+        "world_chunks": game.world.stats(),
+        "quality": game_module.quality.stats(),
+        "gc_collections": gc_collections,
+        "presented_pixels": {
+            "mode": "dirty_rects" if dirty_rects else "flip",
+            "total": presenter.total_pixels,
+            "mean_per_frame": round(presenter.total_pixels / max(1, presenter.presents)),
+            "full_frames": presenter.full_presents,
+            "screen": screen.get_width() * screen.get_height(),
+        },
+        "score": game.game_state.score,
+        "environment": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ゲームループをヘッドレスで計測する")
+    parser.add_argument("--frames", type=int, default=3000, help="進めるフレーム数")
+    parser.add_argument("--seed", type=int, default=1, help="乱数のシード")
+    parser.add_argument("--script", help="キー入力の台本（JSON）のパス")
+    parser.add_argument("--replay", help="main.py --record で記録したファイルのパス（シードとフレーム数も記録どおり）")
+    parser.add_argument("--dirty-rects", action="store_true", help="変わった部分だけを表示に反映するモードで計測")
+    parser.add_argument(
+        "--quality",
+        choices=game_module.QUALITY_MODES,
+        default="high",
+        help="エフェクトの量（既定は結果を比べやすいようにhighで固定）",
+    )
+    parser.add_argument("--output", help="結果を書き出すJSONファイルのパス（省略時は標準出力）")
+    args = parser.parse_args(argv)
+
+    frames, seed = args.frames, args.seed
+    if args.replay:
+        script = InputReplay.load(args.replay)
+        frames, seed = len(script), script.seed
+    elif args.script:
+        script = InputScript.load(args.script)
+    else:
+        script = InputScript(DEFAULT_SCRIPT)
+
+    # ゲーム中のログはJSONと混ざらないように標準エラー出力へ回す
+    with contextlib.redirect_stdout(sys.stderr):
+        result = run(frames, seed, script, dirty_rects=args.dirty_rects, quality=args.quality)
+
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
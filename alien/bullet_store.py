@@ -0,0 +1,103 @@
+from collections import deque
+
+
+class BulletStore:
+    """エイリアンの弾を発射順に保持するコンテナ
+
+    毎フレームのupdate()で、カメラから見て二度と画面に入らない弾と
+    寿命（フレーム数）を使い切った弾を取り除く。
+    上限を超えて追加された場合は古い弾から捨てる。
+    poolを指定した場合は、取り除いた弾をpool.release()で戻す。
+    """
+
+    def __init__(self, view_width, view_height, max_bullets=256, max_lifetime=300, margin=100, pool=None):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.max_bullets = max_bullets
+        self.max_lifetime = max_lifetime
+        self.margin = margin
+        self.pool = pool
+        self.bullets = deque()
+
+        # ソーク試験でメモリが定常状態になっているかを確認するためのカウンタ
+        self.spawned = 0
+        self.culled_offscreen = 0
+        self.culled_expired = 0
+        self.evicted = 0
+        self.removed = 0
+
+    def __iter__(self):
+        return iter(self.bullets)
+
+    def __len__(self):
+        return len(self.bullets)
+
+    def add(self, bullet):
+        """弾を追加する（上限を超えたら最も古い弾を捨てる）"""
+        bullet.age = 0
+        self.bullets.append(bullet)
+        self.spawned += 1
+        while len(self.bullets) > self.max_bullets:
+            evicted = self.bullets.popleft()
+            evicted.active = False
+            self.evicted += 1
+            self._release(evicted)
+
+    def remove(self, bullet):
+        """命中などで不要になった弾を取り除く"""
+        bullet.active = False
+        self.bullets.remove(bullet)
+        self.removed += 1
+        self._release(bullet)
+
+    def _release(self, bullet):
+        if self.pool is not None:
+            self.pool.release(bullet)
+
+    def is_offscreen(self, bullet, camera_x):
+        """弾がもう画面に入ってこないかどうか"""
+        margin = self.margin
+        if bullet.y < -margin or bullet.y > self.view_height + margin:
+            return True
+        # カメラは右にしか進まないので、左に抜けた弾は戻ってこない
+        if bullet.x < camera_x - margin:
+            return True
+        # 画面より右にいる弾は、右へ進んでいる場合だけ消す（左向きの弾はこれから画面に入る）
+        return bullet.vx >= 0 and bullet.x > camera_x + self.view_width + margin
+
+    def update(self, camera_x):
+        """全弾を移動させ、画面外・寿命切れの弾を取り除く"""
+        survivors = deque()
+        for bullet in self.bullets:
+            bullet.update()
+            bullet.age += 1
+            if not bullet.active:
+                self.removed += 1
+            elif bullet.age >= self.max_lifetime:
+                bullet.active = False
+                self.culled_expired += 1
+            elif self.is_offscreen(bullet, camera_x):
+                bullet.active = False
+                self.culled_offscreen += 1
+            else:
+                survivors.append(bullet)
+                continue
+            self._release(bullet)
+        self.bullets = survivors
+
+    def clear(self):
+        """全弾を消去する（カウンタは累計のまま残す）"""
+        for bullet in self.bullets:
+            self._release(bullet)
+        self.bullets.clear()
+
+    def stats(self):
+        """生存数と削除理由ごとの累計を返す"""
+        return {
+            "live": len(self.bullets),
+            "spawned": self.spawned,
+            "culled_offscreen": self.culled_offscreen,
+            "culled_expired": self.culled_expired,
+            "evicted": self.evicted,
+            "removed": self.removed,
+        }
@@ -0,0 +1,103 @@
+import pygame
+
+
+class DirtyRects:
+    """画面のうち変わった部分だけを表示に反映する（dirty rect方式）
+
+    描画した物の画面上の範囲をmark()で登録し、present()で今回と前回に登録した範囲だけを
+    pygame.display.update()で転送する（前回の位置に残った絵を消すため前回の範囲も含める）。
+    次のフレームは画面全体をflip()する:
+    - 最初のフレームと、mark_all()されたフレーム（画面全体を覆うエフェクトなど）とその次のフレーム
+    - 前回全体を転送したときからカメラがscroll_thresholdピクセルより大きく動いたフレーム
+    - 転送する範囲の合計が画面のfull_ratioを超えるフレーム
+    カメラの移動がscroll_threshold以内なら、scroll()が前回全体を転送したときのカメラ位置を返すので、
+    その位置で描画すれば背景はそのまま残せる。
+
+    enabledがFalseの場合は毎回flip()するだけ（転送したピクセル数の計測だけ行う）。
+    """
+
+    def __init__(self, size, enabled=True, scroll_threshold=1.0, full_ratio=0.6):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.enabled = enabled
+        self.scroll_threshold = scroll_threshold
+        self.full_ratio = full_ratio
+        self.rects = []
+        self.previous_rects = []
+        self.full = True
+        self.covered = False  # 画面全体を覆う物を描画した（次のフレームで消すために全体を転送する）
+        self.camera_x = None  # 前回全体を転送したときのカメラ位置
+        self.drawn = False
+
+        # 計測用
+        self.pixels = 0  # 直前のpresent()で転送したピクセル数
+        self.total_pixels = 0
+        self.presents = 0
+        self.full_presents = 0
+
+    def scroll(self, camera_x):
+        """このフレームの描画に使うカメラ位置を返す（大きく動いた場合は全体を転送する）"""
+        self.drawn = True
+        if not self.enabled:
+            return camera_x
+        if self.camera_x is None or abs(camera_x - self.camera_x) > self.scroll_threshold:
+            self.camera_x = camera_x
+            self.full = True
+        return self.camera_x
+
+    def mark(self, rect):
+        """描画した範囲を登録する（Noneや空のRectは無視）"""
+        if rect:
+            self.rects.append(rect)
+
+    def mark_many(self, rects):
+        self.rects.extend(rects)
+
+    def mark_all(self):
+        """このフレームは画面全体を転送する（画面全体を覆う物を描画した場合）"""
+        self.full = True
+        self.covered = True
+
+    def _merge(self, rects):
+        """画面内に切り詰め、重なる範囲を1つにまとめる"""
+        merged = []
+        screen_rect = self.screen_rect
+        for rect in rects:
+            rect = screen_rect.clip(rect)
+            if not rect.width or not rect.height:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def present(self):
+        """描画した内容を表示に反映し、転送したピクセル数を返す"""
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if not self.enabled:
+            pygame.display.flip()
+            pixels = screen_area
+            self.full_presents += 1
+        elif not self.drawn and not self.full:
+            # 描画していないフレームは前回から何も変わっていない
+            pixels = 0
+        else:
+            rects = None if self.full else self._merge(self.previous_rects + self.rects)
+            if rects is None or sum(rect.width * rect.height for rect in rects) > screen_area * self.full_ratio:
+                pygame.display.flip()
+                pixels = screen_area
+                self.full_presents += 1
+            else:
+                if rects:
+                    pygame.display.update(rects)
+                pixels = sum(rect.width * rect.height for rect in rects)
+            self.previous_rects = self.rects
+            self.rects = []
+            self.full = self.covered
+            self.covered = False
+        self.drawn = False
+        self.pixels = pixels
+        self.total_pixels += pixels
+        self.presents += 1
+        return pixels
@@ -0,0 +1,62 @@
+class EntityPool:
+    """使い終わったオブジェクトを捨てずに取っておき、次の生成で使い回すフリーリスト
+
+    clsは reset(...) でコンストラクタと同じ引数から状態を初期化し直せるクラス。
+    acquire() は空きがあればそれをresetして返し、無ければ新しく作る。
+    release() で戻されたオブジェクトは max_free 個まで取っておく。
+    """
+
+    def __init__(self, cls, max_free=256):
+        self.cls = cls
+        self.max_free = max_free
+        self.free = []
+
+        # 使い回しがどれだけ効いているかを確認するためのカウンタ
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self.discarded = 0
+
+    def acquire(self, *args, **kwargs):
+        """オブジェクトを取り出す（空きが無ければ新しく作る）"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits += 1
+            return obj
+        self.misses += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj):
+        """使い終わったオブジェクトを戻す（以後そのオブジェクトを参照しないこと）"""
+        self.released += 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+        else:
+            self.discarded += 1
+
+    def stats(self):
+        """空きの数と累計の取り出し・戻し回数を返す"""
+        return {
+            "free": len(self.free),
+            "hits": self.hits,
+            "misses": self.misses,
+            "released": self.released,
+            "discarded": self.discarded,
+        }
+
+
+def compact(items, keep, release=None):
+    """keep(item)がFalseのものを、残りの順番を保ったままリストからその場で取り除く
+
+    list.removeを繰り返すと1件ごとに詰め直しが起きるので、1回の走査でまとめて詰める。
+    取り除いたものはrelease(item)に渡す。
+    """
+    kept = 0
+    for item in items:
+        if keep(item):
+            items[kept] = item
+            kept += 1
+        elif release is not None:
+            release(item)
+    del items[kept:]
@@ -0,0 +1,88 @@
+import sys
+from collections import deque
+
+# ログレベル（loggingモジュールと同じ値）
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR", OFF: "OFF"}
+
+
+def parse_level(name):
+    """"debug" や "INFO" などのレベル名を数値にする"""
+    for level, level_name in LEVEL_NAMES.items():
+        if level_name == name.upper():
+            return level
+    raise ValueError(f"Unknown log level: {name}")
+
+
+class EventLog:
+    """毎フレームのデバッグ出力を溜めておくリングバッファ
+
+    levelより低いレベルの記録は何もせずに捨てる。記録したイベントは標準出力には書かず、
+    最新capacity件だけをメモリに残し、dump()で必要なときにまとめて書き出す。
+    メッセージは "%s" 形式で受け取り、書き出すときに初めて文字列にする。
+    echo_level以上のイベントは記録と同時に標準エラー出力にも書く。
+    """
+
+    def __init__(self, capacity=1024, level=INFO, echo_level=WARNING, clock=None):
+        self.level = level
+        self.echo_level = echo_level
+        self.clock = clock  # frame属性を持つ時計（記録時のフレーム番号用）
+        self.events = deque(maxlen=capacity)
+        self.recorded = 0  # 累計の記録数（バッファから溢れた分も含む）
+
+    def __len__(self):
+        return len(self.events)
+
+    def enabled(self, level):
+        """このレベルのイベントが記録されるかどうか（重い引数を作る前の判定用）"""
+        return level >= self.level
+
+    def log(self, level, category, message, *args):
+        if level < self.level:
+            return
+        frame = self.clock.frame if self.clock is not None else self.recorded
+        event = (frame, level, category, message, args)
+        self.events.append(event)
+        self.recorded += 1
+        if level >= self.echo_level:
+            print(self.format(event), file=sys.stderr)
+
+    def debug(self, category, message, *args):
+        if DEBUG >= self.level:
+            self.log(DEBUG, category, message, *args)
+
+    def info(self, category, message, *args):
+        if INFO >= self.level:
+            self.log(INFO, category, message, *args)
+
+    def warning(self, category, message, *args):
+        self.log(WARNING, category, message, *args)
+
+    def error(self, category, message, *args):
+        self.log(ERROR, category, message, *args)
+
+    @staticmethod
+    def format(event):
+        frame, level, category, message, args = event
+        if args:
+            message = message % args
+        return f"[{frame:>7}] {LEVEL_NAMES.get(level, level):<7} {category:<8} {message}"
+
+    def dump(self, file=None, category=None):
+        """溜まっているイベントを古い順に書き出す（categoryを指定した場合はそのカテゴリだけ）"""
+        if file is None:
+            file = sys.stderr
+        dropped = self.recorded - len(self.events)
+        print(f"--- event log: {len(self.events)} events ({dropped} older events dropped) ---", file=file)
+        for event in self.events:
+            if category is None or event[2] == category:
+                print(self.format(event), file=file)
+        print("--- end of event log ---", file=file)
+
+    def clear(self):
+        self.events.clear()
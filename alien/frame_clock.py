@@ -0,0 +1,83 @@
+class FrameClock:
+    """フレーム数で進むゲーム内の時計
+
+    time.time() の代わりに使うことで、処理速度に関係なく
+    同じ入力からは同じ結果が得られる（記録した入力の再生やベンチマーク用）。
+    """
+
+    def __init__(self, fps=60):
+        self.fps = fps
+        self.frame = 0
+
+    def tick(self):
+        """1フレーム進める"""
+        self.frame += 1
+
+    def now(self):
+        """ゲーム開始からの経過時間（秒）"""
+        return self.frame / self.fps
+
+
+class FixedTimestep:
+    """一定の間隔（tick）でシミュレーションを進めるためのアキュムレータ
+
+    advance(now) に実時間を渡すと、前回からの経過時間を貯めて、進めるべきtick数を返す。
+    描画が遅れた場合はtickをまとめて進めて描画の回数を減らす（シミュレーションは飛ばさない）。
+    ただし1回の描画あたり max_ticks を超える分は諦めて捨てる（処理落ちが止まらなくなるのを防ぐ）。
+    """
+
+    def __init__(self, tick_rate=60, max_ticks=5):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.last_time = None
+
+        # 直近1秒間の実測値
+        self.measured_tick_rate = 0.0
+        self.measured_render_rate = 0.0
+        self.total_ticks = 0
+        self.total_renders = 0
+        self.dropped_ticks = 0
+        self._window_start = None
+        self._window_ticks = 0
+        self._window_renders = 0
+
+    @property
+    def alpha(self):
+        """描画の補間係数（前回のtickから次のtickまでの進み具合、0〜1）"""
+        return self.accumulator / self.dt
+
+    def advance(self, now):
+        """経過時間を加算し、このフレームで進めるtick数を返す"""
+        if self.last_time is None:
+            # 最初のフレームはすぐに1tick進めて描画する
+            self.last_time = now
+            self._window_start = now
+            self.accumulator = self.dt
+        else:
+            self.accumulator += now - self.last_time
+            self.last_time = now
+
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_ticks:
+            self.dropped_ticks += ticks - self.max_ticks
+            ticks = self.max_ticks
+            self.accumulator = self.dt * ticks
+        self.accumulator -= ticks * self.dt
+
+        self.total_ticks += ticks
+        self._window_ticks += ticks
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.measured_tick_rate = self._window_ticks / elapsed
+            self.measured_render_rate = self._window_renders / elapsed
+            self._window_start = now
+            self._window_ticks = 0
+            self._window_renders = 0
+        return ticks
+
+    def rendered(self):
+        """描画したことを記録する（描画レートの計測用）"""
+        self.total_renders += 1
+        self._window_renders += 1
@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager
+
+# 1フレームの処理の順番
+# input: プレイヤーの操作（スライムの移動・射撃）とカメラ
+# spawn: チャンクの読み込みとエイリアンの攻撃（新しい物を作る）
+# simulate: 全オブジェクトを1回ずつ動かす
+# collide: 衝突判定と、倒したエイリアン・爆発の処理
+# cull: 消えた物・画面外に出た物を取り除く
+# render: 描画（ゲームの状態を変えない）
+PHASES = ("input", "spawn", "simulate", "collide", "cull", "render")
+
+
+class FrameScheduler:
+    """1フレームの処理をPHASESの順番どおりに実行させ、フェーズごとの処理時間を測る
+
+    begin_frame() でフレームを始め、各フェーズを with scheduler.phase(名前): の中で実行する。
+    同じフレームでフェーズの順番が前後したり、renderの他のフェーズが2回実行されたりするとRuntimeErrorになる
+    （オブジェクトを2回動かしたり、描画中に状態を変えたりするのを防ぐ）。
+    renderは描画のたびに実行してよい（1回の描画の前に複数フレーム進めることも、進めずに描き直すこともある）。
+
+    hooksに登録した関数は、フェーズが終わるたびに (フェーズ名, 処理時間[秒]) で呼ばれる。
+    """
+
+    def __init__(self, phases=PHASES, timer=time.perf_counter):
+        self.phases = phases
+        self.order = {name: index for index, name in enumerate(phases)}
+        self.timer = timer
+        self.hooks = []
+        self.position = -1  # このフレームで最後に実行したフェーズの番号
+        self.frames = 0
+
+        # フェーズごとの直近の処理時間と累計（秒）
+        self.last = dict.fromkeys(phases, 0.0)
+        self.totals = dict.fromkeys(phases, 0.0)
+        self.counts = dict.fromkeys(phases, 0)
+
+    def begin_frame(self):
+        """新しいフレームを始める"""
+        self.position = -1
+        self.frames += 1
+
+    @contextmanager
+    def phase(self, name):
+        """フェーズnameの処理を実行する範囲"""
+        index = self.order[name]
+        if index < self.position or (index == self.position and name != "render"):
+            raise RuntimeError(f"Phase '{name}' ran after '{self.phases[self.position]}' in the same frame")
+        self.position = index
+        started = self.timer()
+        yield
+        elapsed = self.timer() - started
+        self.last[name] = elapsed
+        self.totals[name] += elapsed
+        self.counts[name] += 1
+        for hook in self.hooks:
+            hook(name, elapsed)
+
+    def stats(self):
+        """フェーズごとの平均処理時間（ミリ秒）を返す"""
+        return {
+            name: round(self.totals[name] / self.counts[name] * 1000, 4) if self.counts[name] else 0.0
+            for name in self.phases
+        }
@@ -6,16 +6,31 @@ import time
 import os
 import numpy as np
 import asyncio
-
-# Pygameの初期化
-pygame.init()
-pygame.mixer.init()  # サウンド用の初期化
-
-# 画面の設定
+import functools
+import contextlib
+
+from particles import ParticleSystem, SHRINK
+from spatial_hash import SpatialHash
+from bullet_store import BulletStore
+from platform_index import PlatformIndex
+from sprite_cache import SpriteCache, to_colorkey_format, to_display_format
+from frame_clock import FrameClock, FixedTimestep
+from replay import InputRecorder, InputReplay
+from event_log import EventLog, INFO, parse_level
+from sound_cache import SoundCache, SynthesizedSound
+from font_cache import FontCache
+from dirty_rects import DirtyRects
+from entity_pool import EntityPool, compact
+from sound_dispatcher import SoundDispatcher, SoundPolicy
+from world_chunks import ChunkStream, WorldChunk, chunk_random, spaced_positions
+from frame_scheduler import FrameScheduler
+from scratch_rects import ScratchRects
+from quality_governor import QUALITY_MODES, QualityGovernor
+
+# 画面の設定（pygameの初期化と画面の作成は init_runtime() で行う）
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Infinite Side-Scroller Game")
+FPS = 60
 
 # 色の定義
 BLACK = (0, 0, 0)
@@ -29,68 +44,162 @@ PURPLE = (200, 100, 255)  # 紫色
 APPLE_RED = (255, 50, 50)
 BROWN = (139, 69, 19)  # 茶色
 
-# 多重スクロール背景の読み込み
-try:
-    from parallax_background import ParallaxBackground, print_asset_requirements
-
-    parallax_background = ParallaxBackground()
-    print_asset_requirements()
-except ImportError as e:
-    print(f"Parallax background module not found: {e}")
-    parallax_background = None
-
-# フォントの初期化
-try:
-    # Linuxの日本語フォントを試す
-    font = pygame.font.SysFont("notosanscjkjp", 24)  # Noto Sans CJK JP
-    big_font = pygame.font.SysFont("notosanscjkjp", 48)
-except:
+# 全エフェクト共通のパーティクルシステム
+particle_system = ParticleSystem()
+
+# 描画中の一時的なRect（画面上の範囲など）はフレームごとに使い回す
+scratch_rects = ScratchRects()
+
+# 画質レベルごとのエフェクトの量（低い順）
+# particles: 爆発のパーティクル数の倍率
+# slime_sparkle_interval / apple_sparkle_interval: 紫フォームのスライム・りんごのキラキラを出す間隔（フレーム）
+# glow_rings: スライムの光の輪の本数の倍率
+# platform_sparks: 飛んでいくプラットフォームの火花の数
+QUALITY_LEVELS = (
+    (
+        "low",
+        {
+            "particles": 0.3,
+            "slime_sparkle_interval": 15,
+            "apple_sparkle_interval": 30,
+            "glow_rings": 0.4,
+            "platform_sparks": 0,
+        },
+    ),
+    (
+        "medium",
+        {
+            "particles": 0.6,
+            "slime_sparkle_interval": 10,
+            "apple_sparkle_interval": 20,
+            "glow_rings": 0.6,
+            "platform_sparks": 3,
+        },
+    ),
+    (
+        "high",
+        {
+            "particles": 1.0,
+            "slime_sparkle_interval": 5,
+            "apple_sparkle_interval": 10,
+            "glow_rings": 1.0,
+            "platform_sparks": 6,
+        },
+    ),
+)
+QUALITY_LABELS = {"auto": "自動", "low": "低", "medium": "中", "high": "高"}
+
+# 処理が重くなったらエフェクトを減らす（エフェクトの量はゲームの展開には影響しない）
+quality = QualityGovernor(QUALITY_LEVELS, budget=1 / FPS)
+
+
+def effect_count(count):
+    """画質レベルに合わせたパーティクルの数"""
+    return max(1, round(count * quality.settings["particles"]))
+
+
+def glow_ring_count(count):
+    """画質レベルに合わせた光の輪の本数"""
+    return max(1, round(count * quality.settings["glow_rings"]))
+
+
+# ゲーム内の時間はフレーム数で数える（処理速度によらず結果を再現できるように）
+frame_clock = FrameClock(FPS)
+
+# ゲーム中のデバッグ出力（標準出力には書かず、直近のものだけをメモリに残す）
+# F9キーまたはエラー発生時に標準エラー出力へ書き出す
+event_log = EventLog(capacity=2048, clock=frame_clock)
+
+
+def seed_random(seed):
+    """ゲームが使う全ての乱数のシードを設定する"""
+    random.seed(seed)
+    np.random.seed(seed)
+    particle_system.seed(seed)
+
+
+# 日本語フォントの候補（上から順に探し、見つかったパスはfont_cacheに保存される）
+FONT_CANDIDATES = (
+    "notosanscjkjp",  # Noto Sans CJK JP
+    "hackgenconsole",  # HackGen Console
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "meiryo",  # Windowsの日本語フォント（WSL対応）
+)
+
+
+# フォントの読み込み
+def load_fonts():
+    """UI用のフォント（通常サイズ, 大きいサイズ）を読み込む"""
+    font_cache = FontCache()
+    path = font_cache.resolve(FONT_CANDIDATES)
+    if path is None:
+        # デフォルトフォント（英語のみ）
+        print("Warning: Japanese font not found, using default font")
+    return font_cache.load(FONT_CANDIDATES, 24), font_cache.load(FONT_CANDIDATES, 48)
+
+
+class Sounds:
+    """ゲームで使う効果音一式
+
+    指定しなかった効果音は鳴らない（アセットを読み込まずにゲームのクラスを使う場合など）。
+    """
+
+    NAMES = (
+        "eat",
+        "alien_destroy",
+        "explosion",
+        "green_apple",
+        "double_jump",
+        "purple_apple",
+        "spike_damage",
+        "bgm",
+    )
+
+    def __init__(self, **sounds):
+        for name in self.NAMES:
+            sound = sounds.pop(name, None)
+            setattr(self, name, sound if sound is not None else SynthesizedSound(name, 0.0))
+        if sounds:
+            raise TypeError(f"Unknown sounds: {', '.join(sounds)}")
+
+
+# 何も鳴らさない効果音一式（各クラスの既定値）
+SILENT_SOUNDS = Sounds()
+
+# 効果音ごとの同時発音数・再発音の最短間隔（秒）・優先度（SoundDispatcherで使う）
+# 大量に重なる撃破音・爆発音は数を絞り、プレイヤーの操作に対する効果音は優先して鳴らす
+SOUND_POLICIES = {
+    "eat": SoundPolicy(max_voices=2, min_interval=0.05, priority=2),
+    "alien_destroy": SoundPolicy(max_voices=3, min_interval=0.05, priority=1),
+    "explosion": SoundPolicy(max_voices=3, min_interval=0.05, priority=0),
+    "green_apple": SoundPolicy(max_voices=1, min_interval=0.0, priority=3),
+    "double_jump": SoundPolicy(max_voices=1, min_interval=0.0, priority=3),
+    "purple_apple": SoundPolicy(max_voices=1, min_interval=0.0, priority=3),
+    "spike_damage": SoundPolicy(max_voices=1, min_interval=0.0, priority=4),
+}
+
+
+def dispatch_sounds(sounds, dispatcher):
+    """BGM以外の効果音をdispatcher経由で鳴らすようにした効果音一式を返す"""
+    return Sounds(
+        **{name: dispatcher.wrap(name, getattr(sounds, name)) for name in Sounds.NAMES if name != "bgm"},
+        bgm=sounds.bgm,
+    )
+
+
+def load_sound_file(path, volume):
+    """効果音ファイルを読み込む（無い場合は鳴らない効果音を返す）"""
     try:
-        font = pygame.font.SysFont("hackgenconsole", 24)  # HackGen Console
-        big_font = pygame.font.SysFont("hackgenconsole", 48)
-    except:
-        try:
-            # TTFファイルを直接読み込み
-            font = pygame.font.Font("/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc", 24)
-            big_font = pygame.font.Font("/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc", 48)
-        except:
-            try:
-                # Windowsの日本語フォントも試す（WSL対応）
-                font = pygame.font.SysFont("meiryo", 24)
-                big_font = pygame.font.SysFont("meiryo", 48)
-            except:
-                # デフォルトフォント（英語のみ）
-                font = pygame.font.Font(None, 24)
-                big_font = pygame.font.Font(None, 48)
-                print("Warning: Japanese font not found, using default font")
-
-# サウンドの読み込み
-try:
-    eat_sound = pygame.mixer.Sound("pnyo.wav")
-    eat_sound.set_volume(0.3)
-except:
-    print("Warning: Sound file 'pnyo.wav' not found. Game will run without sound.")
-    eat_sound = pygame.mixer.Sound(buffer=bytes(0))
-
-try:
-    alien_destroy_sound = pygame.mixer.Sound("alien_destroy.wav")
-    alien_destroy_sound.set_volume(0.5)
-except:
-    print("Warning: Sound file 'alien_destroy.wav' not found. Game will run without sound.")
-    alien_destroy_sound = pygame.mixer.Sound(buffer=bytes(0))
-
-try:
-    explosion_sound = pygame.mixer.Sound("explosion.wav")
-    explosion_sound.set_volume(0.4)
-except:
-    print("Warning: Sound file 'explosion.wav' not found. Game will run without sound.")
-    explosion_sound = pygame.mixer.Sound(buffer=bytes(0))
+        sound = pygame.mixer.Sound(path)
+    except (pygame.error, FileNotFoundError):
+        print(f"Warning: Sound file '{path}' not found. Game will run without sound.")
+        return SynthesizedSound(path, volume)
+    return SynthesizedSound(path, volume, sound)
 
 
 # 緑りんご効果音を生成
-def generate_green_apple_sound():
-    sample_rate = 22050
-    duration = 1.0
+def generate_green_apple_sound(sample_rate=22050, duration=1.0, seed=0):
+    rng = np.random.default_rng(seed)
     t = np.linspace(0, duration, int(sample_rate * duration))
 
     # 「BOOM!」という感じの音
@@ -108,7 +217,7 @@ def generate_green_apple_sound():
     wave3 = np.sin(2 * np.pi * frequency * 0.5 * t) * envelope * 0.3
 
     # ノイズ成分を追加
-    noise = np.random.normal(0, 0.1, len(t)) * envelope * 0.2
+    noise = rng.normal(0, 0.1, len(t)) * envelope * 0.2
 
     # 全体を合成
     wave = wave1 + wave2 + wave3 + noise
@@ -123,19 +232,11 @@ def generate_green_apple_sound():
     # ステレオ化
     stereo_wave = np.column_stack((wave_int, wave_int))
 
-    # Pygameのサウンドオブジェクトを作成
-    sound = pygame.sndarray.make_sound(stereo_wave)
-    return sound
-
-
-green_apple_sound = generate_green_apple_sound()
-green_apple_sound.set_volume(0.7)
+    return stereo_wave
 
 
 # 二段ジャンプ効果音を生成
-def generate_double_jump_sound():
-    sample_rate = 22050
-    duration = 0.5
+def generate_double_jump_sound(sample_rate=22050, duration=0.5):
     t = np.linspace(0, duration, int(sample_rate * duration))
 
     # パワーアップ感のある上昇音
@@ -167,19 +268,12 @@ def generate_double_jump_sound():
     # ステレオ化
     stereo_wave = np.column_stack((wave_int, wave_int))
 
-    # Pygameのサウンドオブジェクトを作成
-    sound = pygame.sndarray.make_sound(stereo_wave)
-    return sound
-
-
-double_jump_sound = generate_double_jump_sound()
-double_jump_sound.set_volume(0.5)
+    return stereo_wave
 
 
 # 紫りんご効果音を生成
-def generate_purple_apple_sound():
-    sample_rate = 22050
-    duration = 1.2
+def generate_purple_apple_sound(sample_rate=22050, duration=1.2, seed=0):
+    rng = np.random.default_rng(seed)
     t = np.linspace(0, duration, int(sample_rate * duration))
 
     # 強力なパワーアップ感のある音
@@ -199,7 +293,7 @@ def generate_purple_apple_sound():
     wave5 = np.sin(2 * np.pi * frequency * 4 * t) * envelope * 0.2  # 2オクターブ
 
     # 魔法的な効果音のためのノイズ成分
-    magic_noise = np.random.normal(0, 0.05, len(t)) * envelope * 0.3
+    magic_noise = rng.normal(0, 0.05, len(t)) * envelope * 0.3
 
     # 全体を合成
     wave = wave1 + wave2 + wave3 + wave4 + wave5 + magic_noise
@@ -214,20 +308,13 @@ def generate_purple_apple_sound():
     # ステレオ化
     stereo_wave = np.column_stack((wave_int, wave_int))
 
-    # Pygameのサウンドオブジェクトを作成
-    sound = pygame.sndarray.make_sound(stereo_wave)
-    return sound
-
-
-purple_apple_sound = generate_purple_apple_sound()
-purple_apple_sound.set_volume(0.6)
+    return stereo_wave
 
 
 # トゲダメージ効果音を生成
-def generate_spike_damage_sound():
+def generate_spike_damage_sound(sample_rate=22050, duration=0.3, seed=0):
     """トゲダメージの効果音（グサッという音）を生成"""
-    duration = 0.3  # 0.3秒
-    sample_rate = 22050
+    rng = np.random.default_rng(seed)
     t = np.linspace(0, duration, int(sample_rate * duration), False)
 
     # 刺すような鋭い音の組み合わせ
@@ -244,7 +331,7 @@ def generate_spike_damage_sound():
     damage_wave = np.sin(2 * np.pi * damage_freq * t) * 0.2
 
     # ノイズを追加（刺すような質感）
-    noise = np.random.normal(0, 0.1, len(t))
+    noise = rng.normal(0, 0.1, len(t))
 
     # 急激な減衰エンベロープ（一瞬でサッと音が消える）
     attack = np.linspace(0, 1, int(sample_rate * 0.01))  # 素早い立ち上がり
@@ -264,17 +351,12 @@ def generate_spike_damage_sound():
     # 16ビット整数に変換
     audio_data = (stereo_wave * 32767).astype(np.int16)
 
-    return pygame.sndarray.make_sound(audio_data)
-
-
-spike_damage_sound = generate_spike_damage_sound()
-spike_damage_sound.set_volume(0.7)
+    return audio_data
 
 
 # BGM生成関数
-def generate_bgm():
-    sample_rate = 22050
-    duration = 8.0  # 8秒のループ
+def generate_bgm(sample_rate=22050, duration=8.0, seed=0):
+    rng = np.random.default_rng(seed)
     t = np.linspace(0, duration, int(sample_rate * duration))
 
     # ドラムビートのパターン（キック、スネア、ハイハット）
@@ -283,91 +365,141 @@ def generate_bgm():
 
     # ベースライン
     bass_notes = [65.41, 73.42, 82.41, 65.41, 87.31, 73.42, 65.41, 82.41]  # Low notes
-    bass_wave = np.zeros(len(t))
 
     # メロディライン
     melody_notes = [261.63, 329.63, 392.00, 329.63, 440.00, 392.00, 329.63, 261.63]
-    melody_wave = np.zeros(len(t))
 
-    # ドラムビート
-    drum_wave = np.zeros(len(t))
+    # 全パートを1つのバッファに直接足し込む
+    wave = np.zeros(len(t))
 
     for i in range(len(bass_notes)):
         start_time = i * (duration / len(bass_notes))
         end_time = (i + 1) * (duration / len(bass_notes))
         start_idx = int(start_time * sample_rate)
-        end_idx = int(end_time * sample_rate)
-
-        if end_idx > len(t):
-            end_idx = len(t)
+        end_idx = min(int(end_time * sample_rate), len(t))
 
+        # 音符ごとに区切って計算する（配列が小さいほうがキャッシュに乗って速い）
+        segment = wave[start_idx:end_idx]
         segment_t = t[start_idx:end_idx] - start_time
+        phase = 2 * np.pi * segment_t
+
+        # 減衰エンベロープは exp(-4t) の累乗で作る（expの呼び出しは1回だけ）
+        decay4 = np.exp(-4 * segment_t)
+        decay8 = decay4 * decay4
+        decay12 = decay8 * decay4
 
         # ベースライン（サイン波 + ノコギリ波）
-        bass_freq = bass_notes[i]
-        bass_envelope = np.exp(-segment_t * 8) * (1 - np.exp(-segment_t * 20))
-        bass_segment = (
-            (np.sin(2 * np.pi * bass_freq * segment_t) * 0.8 + np.sin(2 * np.pi * bass_freq * 2 * segment_t) * 0.3)
-            * bass_envelope
-            * 0.6
-        )
-        bass_wave[start_idx:end_idx] = bass_segment
+        bass_phase = phase * bass_notes[i]
+        bass_envelope = decay8 * (1 - decay12 * decay8)
+        segment += (np.sin(bass_phase) * 0.8 + np.sin(bass_phase * 2) * 0.3) * bass_envelope * 0.6
 
         # メロディライン
-        melody_freq = melody_notes[i]
-        melody_envelope = np.exp(-segment_t * 4) * (1 - np.exp(-segment_t * 12))
-        melody_segment = (
-            (np.sin(2 * np.pi * melody_freq * segment_t) * 0.6 + np.sin(2 * np.pi * melody_freq * 3 * segment_t) * 0.2)
-            * melody_envelope
-            * 0.4
-        )
-        melody_wave[start_idx:end_idx] = melody_segment
+        melody_phase = phase * melody_notes[i]
+        melody_envelope = decay4 * (1 - decay12)
+        segment += (np.sin(melody_phase) * 0.6 + np.sin(melody_phase * 3) * 0.2) * melody_envelope * 0.4
 
         # ドラムビート（より音楽的に）
         if i % 2 == 0:  # キック
-            drum_env = np.exp(-segment_t * 12)
-            kick = np.sin(2 * np.pi * 55 * segment_t) * drum_env * 0.7
-            drum_wave[start_idx:end_idx] += kick
+            segment += np.sin(phase * 55) * decay12 * 0.7
 
         if i % 4 == 2:  # スネア（ノイズ量を減らす）
-            snare_env = np.exp(-segment_t * 8)
             # トーンとノイズのミックス
-            snare_tone = np.sin(2 * np.pi * 200 * segment_t) * snare_env * 0.3
-            snare_noise = np.random.normal(0, 0.1, len(segment_t)) * snare_env * 0.2
-            drum_wave[start_idx:end_idx] += snare_tone + snare_noise
+            snare_tone = np.sin(phase * 200) * 0.3
+            snare_noise = rng.normal(0, 0.1, len(segment_t)) * 0.2
+            segment += (snare_tone + snare_noise) * decay8
 
     # ハイハット（よりクリーンに）
     hihat_pattern = np.sin(2 * np.pi * beats_per_second * 8 * t) > 0.8
-    hihat_env = np.exp(-((t % (1 / beats_per_second / 2)) * 20))
-    hihat_clean = np.sin(2 * np.pi * 8000 * t) * hihat_pattern * hihat_env * 0.1
-
-    # 全体をミックス
-    wave = bass_wave + melody_wave + drum_wave + hihat_clean
+    hihat_env = np.exp(-((t % (beat_interval / 2)) * 20))
+    wave += np.sin(2 * np.pi * 8000 * t) * hihat_pattern * hihat_env * 0.1
 
     # 音量を調整
-    wave = wave * 0.4
-    wave = np.clip(wave, -1, 1)
+    wave *= 0.4
+    np.clip(wave, -1, 1, out=wave)
 
     # 16bit整数に変換
     wave_int = (wave * 32767).astype(np.int16)
 
     # ステレオ化
-    stereo_wave = np.column_stack((wave_int, wave_int))
+    return np.column_stack((wave_int, wave_int))
+
+
+def load_sounds(sound_cache):
+    """効果音を読み込む（合成する効果音は2回目以降の起動ではディスクのキャッシュから読み込む）"""
+    sounds = {
+        "eat": load_sound_file("pnyo.wav", 0.3),
+        "alien_destroy": load_sound_file("alien_destroy.wav", 0.5),
+        "explosion": load_sound_file("explosion.wav", 0.4),
+        "green_apple": sound_cache.load(generate_green_apple_sound, volume=0.7),
+        "double_jump": sound_cache.load(generate_double_jump_sound, volume=0.5),
+        "purple_apple": sound_cache.load(generate_purple_apple_sound, volume=0.6),
+        "spike_damage": sound_cache.load(generate_spike_damage_sound, volume=0.7),
+    }
+
+    # BGMを読み込み
+    try:
+        sounds["bgm"] = SynthesizedSound("bgm", 0.7, pygame.mixer.Sound("bgm.mp3"))  # 音量調整
+        print("✓ BGM loaded from bgm.mp3")
+    except (pygame.error, FileNotFoundError):
+        print("⚠ Failed to load bgm.mp3, using generated BGM")
+        sounds["bgm"] = sound_cache.load(generate_bgm, volume=0.6)
+
+    # キャッシュに無かった効果音はバックグラウンドで合成する（その間は鳴らない）
+    if sound_cache.pending:
+        print(f"Synthesizing {len(sound_cache.pending)} sounds in the background (cache: {sound_cache.directory})")
+    sound_cache.synthesize_pending()
+    return Sounds(**sounds)
+
 
-    # Pygameのサウンドオブジェクトを作成
-    sound = pygame.sndarray.make_sound(stereo_wave)
-    return sound
+class Runtime:
+    """画面・フォント・効果音・背景など、ゲームの実行に必要なもの一式"""
 
+    def __init__(self, screen, font, big_font, sounds, parallax_background=None, sound_dispatcher=None):
+        self.screen = screen
+        self.font = font
+        self.big_font = big_font
+        self.sounds = sounds
+        self.parallax_background = parallax_background
+        self.sound_dispatcher = sound_dispatcher
 
-# BGMを読み込み
-try:
-    bgm = pygame.mixer.Sound("bgm.mp3")
-    bgm.set_volume(0.7)  # 音量調整
-    print("✓ BGM loaded from bgm.mp3")
-except pygame.error:
-    print("⚠ Failed to load bgm.mp3, using generated BGM")
-    bgm = generate_bgm()
-    bgm.set_volume(0.6)
+
+_runtime = None
+
+
+def init_runtime():
+    """pygameを初期化して画面を開き、フォント・効果音・背景を読み込む（2回目以降は同じものを返す）
+
+    モジュールのimport時には何もしないので、ゲームのクラスだけを使う場合は呼ばなくてよい。
+    """
+    global _runtime
+    if _runtime is not None:
+        return _runtime
+
+    # Pygameの初期化
+    pygame.init()
+    pygame.mixer.init()  # サウンド用の初期化
+
+    # 画面の設定
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Infinite Side-Scroller Game")
+
+    font, big_font = load_fonts()
+    # 効果音はチャンネルを割り当てるディスパッチャ経由で鳴らす（BGMは予約したチャンネルで鳴らす）
+    sound_dispatcher = SoundDispatcher(SOUND_POLICIES, clock=frame_clock)
+    sounds = dispatch_sounds(load_sounds(SoundCache()), sound_dispatcher)
+
+    # 多重スクロール背景の読み込み
+    try:
+        from parallax_background import ParallaxBackground, print_asset_requirements
+
+        parallax_background = ParallaxBackground()
+        print_asset_requirements()
+    except ImportError as e:
+        print(f"Parallax background module not found: {e}")
+        parallax_background = None
+
+    _runtime = Runtime(screen, font, big_font, sounds, parallax_background, sound_dispatcher)
+    return _runtime
 
 
 class GameState:
@@ -382,11 +514,11 @@ class GameState:
 
     def trigger_game_over(self):
         self.game_over = True
-        self.game_over_time = time.time()
+        self.game_over_time = frame_clock.now()
 
     def should_reset(self):
         if self.game_over:
-            return time.time() - self.game_over_time >= self.game_over_duration
+            return frame_clock.now() - self.game_over_time >= self.game_over_duration
         return False
 
     def reset(self):
@@ -398,6 +530,7 @@ class GameState:
 class Camera:
     def __init__(self):
         self.x = 0
+        self.previous_x = 0  # 前回のtickでの位置（描画の補間用）
         self.follow_speed = 0.1
 
     def update(self, target_x):
@@ -414,108 +547,143 @@ class Camera:
 
     def reset(self):
         self.x = 0
+        self.previous_x = 0
+
+    def interpolated(self, alpha):
+        """前回のtickから今回のtickまでをalphaで補間した位置のカメラを返す（描画用）"""
+        view = Camera()
+        view.x = view.previous_x = self.previous_x + (self.x - self.previous_x) * alpha
+        return view
+
+
+# ワールドはCHUNK_WIDTHごとのチャンクに区切り、チャンクの番号とワールドのシードから決まる内容をまとめて生成する
+CHUNK_WIDTH = 1000
+PLATFORM_WIDTH = 100
+PLATFORM_HEIGHT = 20
+ALIEN_ROWS = (50, 200, 350, SCREEN_HEIGHT - 150)
+
+# りんごの種類ごとの出現確率（残りは赤りんご）
+APPLE_TYPE_CHANCES = (
+    ("purple", 0.02),
+    ("green", 0.05),
+    ("brown", 0.10),
+    ("blue", 0.25),
+)
+
+
+def choose_apple_type(rng):
+    """rngで確率に従ってりんごの種類を選ぶ"""
+    rand = rng.random()
+    for apple_type, chance in APPLE_TYPE_CHANCES:
+        if rand < chance:
+            return apple_type
+        rand -= chance
+    return "red"
+
+
+def chunk_starts(rng, index):
+    """チャンクの最初のプラットフォーム・エイリアン・りんごのx座標
+
+    前のチャンクは最後の物とこことの間隔を揃えるので、チャンクの境目でも間隔が変わらない。
+    最初のチャンクは、スライムの足場とエイリアンが来るまでの余裕を決まった位置に置く。
+    """
+    left = index * CHUNK_WIDTH
+    starts = (left + rng.randint(0, 50), left + rng.randint(0, 300), left + rng.randint(0, 150))
+    if index == 0:
+        return 0, 600, 150
+    return starts
+
+
+def plan_chunk(world_seed, index):
+    """チャンクに置くプラットフォーム・エイリアン・りんごを決める（ワーカースレッドからも呼ばれる）"""
+    rng = chunk_random(world_seed, index)
+    platform_x, alien_x, apple_x = chunk_starts(rng, index)
+    platform_end, alien_end, apple_end = chunk_starts(chunk_random(world_seed, index + 1), index + 1)
+    initial = index == 0
+
+    # プラットフォーム（最初のチャンクは等間隔で、トゲ無し。それ以外は10%の確率でトゲプラットフォーム）
+    platforms = []
+    step = 150 if initial else None
+    for x in spaced_positions(rng, platform_x, platform_end, PLATFORM_WIDTH + 50, PLATFORM_WIDTH + 200, step):
+        y = rng.randint(100, 500)
+        platforms.append((x, y, not initial and rng.random() < 0.1))
+
+    # エイリアン（10%の確率で赤いエイリアン）
+    aliens = []
+    step = 400 if initial else None
+    for x in spaced_positions(rng, alien_x, alien_end, 300, 600, step):
+        y = rng.choice(ALIEN_ROWS)
+        aliens.append((x, y, "red" if rng.random() < 0.1 else "normal"))
+
+    # りんご（プラットフォームの高さあたりに置く）
+    apples = []
+    for x in spaced_positions(rng, apple_x, apple_end, 150, 300):
+        platform_y = rng.randint(200, 450)
+        apples.append((x, platform_y - 50, choose_apple_type(rng)))
+
+    left = index * CHUNK_WIDTH
+    return WorldChunk(index, left, left + CHUNK_WIDTH, platforms, aliens, apples)
 
 
 class PlatformGenerator:
     def __init__(self):
-        self.platforms = []
-        self.last_platform_x = 0
-        self.platform_width = 100
-        self.platform_height = 20
-        self.min_gap = 50
-        self.max_gap = 200
-        self.min_height = 100
-        self.max_height = 500
-
-        # 初期プラットフォームを生成
-        self.generate_initial_platforms()
-
-    def generate_initial_platforms(self):
-        # 画面内に初期プラットフォームを配置
-        for i in range(10):
-            x = i * 150
-            y = random.randint(self.min_height, self.max_height)
-            self.platforms.append(Block(x, y, self.platform_width, self.platform_height))
-            self.last_platform_x = x
-
-    def update(self, camera_x):
-        # カメラの右端より先にプラットフォームを生成
-        rightmost_visible = camera_x + SCREEN_WIDTH + 200
-
-        while self.last_platform_x < rightmost_visible:
-            # 新しいプラットフォームを生成
-            gap = random.randint(self.min_gap, self.max_gap)
-            new_x = self.last_platform_x + self.platform_width + gap
-            new_y = random.randint(self.min_height, self.max_height)
-
-            # 10%の確率でトゲプラットフォームを生成
-            if random.random() < 0.1:  # 10%の確率
-                platform = SpikedPlatform(new_x, new_y, self.platform_width, self.platform_height)
-                print(f"Generated spiked platform at x={new_x}, y={new_y}")
+        self.platforms = PlatformIndex()  # x座標順の索引（範囲検索用）
+        self.platform_width = PLATFORM_WIDTH
+        self.platform_height = PLATFORM_HEIGHT
+
+    def load_chunk(self, chunk):
+        """チャンクのプラットフォームを作る"""
+        for x, y, spiked in chunk.platforms:
+            if spiked:
+                platform = SpikedPlatform(x, y, self.platform_width, self.platform_height)
+                event_log.debug("platform", "Generated spiked platform at x=%s, y=%s", x, y)
             else:
-                platform = Block(new_x, new_y, self.platform_width, self.platform_height)
-
+                platform = Block(x, y, self.platform_width, self.platform_height)
             self.platforms.append(platform)
-            self.last_platform_x = new_x
 
-        # 画面外のプラットフォームを削除
-        leftmost_visible = camera_x - 200
-        self.platforms = [platform for platform in self.platforms if platform.rect.right > leftmost_visible]
+    def release_before(self, x):
+        """右端がx以下のプラットフォームを取り除く（チャンクを手放したとき）"""
+        self.platforms.evict_before(x)
 
     def reset(self):
-        self.platforms = []
-        self.last_platform_x = 0
-        self.generate_initial_platforms()
+        self.platforms.clear()
 
 
 class AlienGenerator:
-    def __init__(self):
+    def __init__(self, sounds=SILENT_SOUNDS):
+        self.sounds = sounds
         self.aliens = []
-        self.last_alien_x = 600
-        self.attack_timer = 0
+        self.grid = SpatialHash(cell_size=128)  # 衝突判定用のブロードフェーズ
+        self.attack_timer = float("-inf")  # 最初の攻撃はすぐに行う
         self.attack_interval = 1.0  # 1秒間隔
-        self.generate_initial_aliens()
-
-    def generate_initial_aliens(self):
-        # 初期エイリアンを配置
-        for i in range(5):
-            x = 600 + i * 400
-            y = random.choice([50, 200, 350, SCREEN_HEIGHT - 150])
-            # 10%の確率で赤いエイリアンを生成
-            alien_type = "red" if random.random() < 0.1 else "normal"
-            self.aliens.append(Alien(x, y, alien_type))
-            if alien_type == "red":
-                print(f"Generated RED alien at x={x}, y={y}")
-            self.last_alien_x = x
-
-    def update(self, camera_x):
-        # 新しいエイリアンを生成
-        rightmost_visible = camera_x + SCREEN_WIDTH + 300
-
-        while self.last_alien_x < rightmost_visible:
-            gap = random.randint(300, 600)
-            new_x = self.last_alien_x + gap
-            new_y = random.choice([50, 200, 350, SCREEN_HEIGHT - 150])
-
-            # 10%の確率で赤いエイリアンを生成
-            alien_type = "red" if random.random() < 0.1 else "normal"
-            self.aliens.append(Alien(new_x, new_y, alien_type))
-            self.last_alien_x = new_x
+
+    def load_chunk(self, chunk):
+        """チャンクのエイリアンを作る"""
+        for x, y, alien_type in chunk.aliens:
+            self.aliens.append(Alien(x, y, alien_type, self.sounds))
             if alien_type == "red":
-                print(f"Generated RED alien at x={new_x}, y={new_y}")
+                event_log.debug("alien", "Generated RED alien at x=%s, y=%s", x, y)
             else:
-                print(f"Generated new alien at x={new_x}, y={new_y}")  # デバッグ用
+                event_log.debug("alien", "Generated new alien at x=%s, y=%s", x, y)
 
-        # 画面外のエイリアンを削除（破壊されたものも削除）
-        leftmost_visible = camera_x - 200
+    def release_before(self, x):
+        """x以左のエイリアンを取り除く（チャンクを手放したとき。分裂で現れたものも含む）"""
         initial_count = len(self.aliens)
-        self.aliens = [alien for alien in self.aliens if alien.x > leftmost_visible and alien.alive]
+        compact(self.aliens, lambda alien: alien.x > x)
         removed_count = initial_count - len(self.aliens)
         if removed_count > 0:
-            print(f"Removed {removed_count} aliens")  # デバッグ用
+            event_log.debug("alien", "Removed %s aliens", removed_count)
+
+    def remove_destroyed(self):
+        """破壊されたエイリアンを取り除く"""
+        compact(self.aliens, _is_alive)
+
+    def rebuild_grid(self):
+        """衝突判定用グリッドを今の位置で作り直す"""
+        self.grid.rebuild(self.aliens)
 
     def should_attack(self):
-        current_time = time.time()
+        current_time = frame_clock.now()
         if current_time - self.attack_timer >= self.attack_interval:
             self.attack_timer = current_time
             return True
@@ -524,22 +692,48 @@ class AlienGenerator:
     def get_active_aliens(self):
         return [alien for alien in self.aliens if alien.alive]
 
+    def query(self, rect):
+        """rectの近くにいる生存中のエイリアンを返す"""
+        return [alien for alien in self.grid.query(rect) if alien.alive]
+
     def add_alien(self, x, y, alien_type="normal"):
         """エイリアンを追加する（赤いエイリアンの分裂用）"""
-        self.aliens.append(Alien(x, y, alien_type))
-        print(f"Spawned alien at x={x}, y={y}, type={alien_type}")
+        alien = Alien(x, y, alien_type, self.sounds)
+        self.aliens.append(alien)
+        self.grid.insert(alien)
+        event_log.debug("alien", "Spawned alien at x=%s, y=%s, type=%s", x, y, alien_type)
 
     def reset(self):
         self.aliens = []
-        self.last_alien_x = 600
-        self.attack_timer = 0
-        self.generate_initial_aliens()
+        self.grid.clear()
+        self.attack_timer = float("-inf")  # 最初の攻撃はすぐに行う
 
 
 class AlienBullet:
+    __slots__ = (
+        "x",
+        "y",
+        "previous_x",
+        "previous_y",
+        "radius",
+        "speed",
+        "angle",
+        "vx",
+        "vy",
+        "active",
+        "color",
+        "rect",
+        "age",
+    )
+
     def __init__(self, x, y, angle):
-        self.x = x
-        self.y = y
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, angle)
+
+    def reset(self, x, y, angle):
+        """状態を初期化する（プールから取り出したときにも使う）"""
+        self.x = self.previous_x = x
+        self.y = self.previous_y = y
         self.radius = 5
         self.speed = 8
         self.angle = angle
@@ -547,7 +741,8 @@ class AlienBullet:
         self.vy = math.sin(angle) * self.speed
         self.active = True
         self.color = (255, 0, 0)  # 赤色
-        self.rect = pygame.Rect(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+        self.rect.update(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+        self.age = 0  # 発射からのフレーム数（BulletStoreが寿命判定に使う）
 
     def update(self):
         self.x += self.vx
@@ -560,33 +755,142 @@ class AlienBullet:
             screen_x = self.x - camera.x
             screen_y = self.y
             if screen_x > -50 and screen_x < SCREEN_WIDTH + 50:
-                pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), self.radius)
+                return pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), self.radius)
+
+
+# 撃ち終わったエイリアンの弾を使い回すプール
+alien_bullet_pool = EntityPool(AlienBullet, max_free=512)
+
+
+# エイリアンの種類ごとの見た目
+ALIEN_TYPES = {
+    "normal": {
+        "width": 50,
+        "height": 60,
+        "color": (150, 255, 150),  # 薄い緑色
+        "eye_color": BLACK,
+        "antenna_color": (100, 200, 100),
+    },
+    "red": {
+        "width": 75,  # 大きくする
+        "height": 90,
+        "color": (255, 100, 100),  # 赤色
+        "eye_color": (255, 255, 0),  # 黄色い目
+        "antenna_color": (200, 50, 50),
+    },
+    "spawned": {
+        "width": 70,  # 大きくする
+        "height": 85,
+        "color": (100, 100, 255),  # 青色（スライムを狙う特別な能力）
+        "eye_color": (255, 0, 0),  # 赤い目
+        "antenna_color": (50, 50, 200),
+    },
+}
+
+# スプライトの余白（触角と腕が本体の矩形からはみ出す分）
+ALIEN_SPRITE_PADDING = 20
+
+
+def render_alien_sprite(alien_type):
+    """エイリアン1体分の見た目をスプライトに描画する（浮遊オフセットなし）"""
+    spec = ALIEN_TYPES[alien_type]
+    width = spec["width"]
+    height = spec["height"]
+    color = spec["color"]
+    eye_color = spec["eye_color"]
+    antenna_color = spec["antenna_color"]
+
+    pad = ALIEN_SPRITE_PADDING
+    sprite = pygame.Surface((width + pad * 2, height + pad * 2), pygame.SRCALPHA)
+    origin_x = pad
+    origin_y = pad
+
+    # エイリアンの体（楕円）
+    body_rect = pygame.Rect(origin_x, origin_y + height * 0.3, width, height * 0.7)
+    pygame.draw.ellipse(sprite, color, body_rect)
+
+    # エイリアンの頭（円）
+    head_radius = width // 3
+    head_x = origin_x + width // 2
+    head_y = origin_y + head_radius
+    pygame.draw.circle(sprite, color, (head_x, head_y), head_radius)
+
+    # 触角
+    antenna_length = 15
+    # 左の触角
+    left_antenna_x = head_x - head_radius // 2
+    left_antenna_y = head_y - head_radius
+    pygame.draw.line(
+        sprite,
+        antenna_color,
+        (left_antenna_x, left_antenna_y),
+        (left_antenna_x - 5, left_antenna_y - antenna_length),
+        3,
+    )
+    pygame.draw.circle(sprite, antenna_color, (left_antenna_x - 5, left_antenna_y - antenna_length), 4)
+
+    # 右の触角
+    right_antenna_x = head_x + head_radius // 2
+    right_antenna_y = head_y - head_radius
+    pygame.draw.line(
+        sprite,
+        antenna_color,
+        (right_antenna_x, right_antenna_y),
+        (right_antenna_x + 5, right_antenna_y - antenna_length),
+        3,
+    )
+    pygame.draw.circle(sprite, antenna_color, (right_antenna_x + 5, right_antenna_y - antenna_length), 4)
+
+    # 目（2つの大きな楕円）
+    left_eye_x = head_x - head_radius // 3
+    right_eye_x = head_x + head_radius // 3
+    eye_y = head_y - head_radius // 4
+    eye_width = 8
+    eye_height = 12
+
+    pygame.draw.ellipse(
+        sprite, eye_color, (left_eye_x - eye_width // 2, eye_y - eye_height // 2, eye_width, eye_height)
+    )
+    pygame.draw.ellipse(
+        sprite, eye_color, (right_eye_x - eye_width // 2, eye_y - eye_height // 2, eye_width, eye_height)
+    )
+
+    # 腕（細い楕円）
+    arm_width = 8
+    arm_height = 25
+    # 左腕
+    left_arm_rect = pygame.Rect(origin_x - arm_width // 2, origin_y + height * 0.4, arm_width, arm_height)
+    pygame.draw.ellipse(sprite, color, left_arm_rect)
+
+    # 右腕
+    right_arm_rect = pygame.Rect(origin_x + width - arm_width // 2, origin_y + height * 0.4, arm_width, arm_height)
+    pygame.draw.ellipse(sprite, color, right_arm_rect)
+
+    return to_display_format(sprite)
+
+
+# 種類ごとに一度だけ描画したエイリアンのスプライト
+alien_sprites = SpriteCache(render_alien_sprite)
+
+
+# 赤いエイリアンを倒したときに分裂して現れる位置（画面の4角：右上、右下、左上、左下）
+RED_ALIEN_SPLIT_CORNERS = (("right", "top"), ("right", "bottom"), ("left", "top"), ("left", "bottom"))
 
 
 class Alien:
-    def __init__(self, x, y, alien_type="normal"):
-        self.x = x
-        self.y = y
+    def __init__(self, x, y, alien_type="normal", sounds=SILENT_SOUNDS):
+        self.x = self.previous_x = x
+        self.y = self.previous_y = y
         self.alien_type = alien_type
 
-        if alien_type == "red":
-            self.width = 75  # 大きくする
-            self.height = 90
-            self.color = (255, 100, 100)  # 赤色
-            self.eye_color = (255, 255, 0)  # 黄色い目
-            self.antenna_color = (200, 50, 50)
-        elif alien_type == "spawned":
-            self.width = 70  # 大きくする
-            self.height = 85
-            self.color = (100, 100, 255)  # 青色（スライムを狙う特別な能力）
-            self.eye_color = (255, 0, 0)  # 赤い目
-            self.antenna_color = (50, 50, 200)
-        else:
-            self.width = 50
-            self.height = 60
-            self.color = (150, 255, 150)  # 薄い緑色
-            self.eye_color = BLACK
-            self.antenna_color = (100, 200, 100)
+        spec = ALIEN_TYPES.get(alien_type, ALIEN_TYPES["normal"])
+        self.width = spec["width"]
+        self.height = spec["height"]
+        self.color = spec["color"]
+        self.eye_color = spec["eye_color"]
+        self.antenna_color = spec["antenna_color"]
+        self.sprite_key = alien_type if alien_type in ALIEN_TYPES else "normal"
+        self.sounds = sounds
 
         self.rect = pygame.Rect(x, y, self.width, self.height)
         self.hover_offset = 0
@@ -601,28 +905,22 @@ class Alien:
             if self.hover_offset > 2 * math.pi:
                 self.hover_offset -= 2 * math.pi
 
-    def destroy(self):
-        if self.alive:
-            self.alive = False
-            alien_destroy_sound.play()
-
-            # 赤いエイリアンが破壊された場合、4体のエイリアンを生成する情報を返す
-            if self.alien_type == "red":
-                spawn_info = []
-                # ゲーム画面の4角に配置：右上、右下、左上、左下
-                # 現在のカメラ位置を基準にした画面の4角
-                positions = [
-                    {"x": "screen_right", "y": "screen_top"},  # 右上
-                    {"x": "screen_right", "y": "screen_bottom"},  # 右下
-                    {"x": "screen_left", "y": "screen_top"},  # 左上
-                    {"x": "screen_left", "y": "screen_bottom"},  # 左下
-                ]
-                for pos in positions:
-                    spawn_info.append({"x": pos["x"], "y": pos["y"], "type": "spawned"})
-                return {"destroyed": True, "spawn_aliens": spawn_info, "current_alien_pos": {"x": self.x, "y": self.y}}
+            # 衝突判定用のrectを浮遊位置に合わせる
+            self.rect.x = self.x
+            self.rect.y = self.y + math.sin(self.hover_offset) * self.hover_amount
+
+    def destroy(self, play_sound=True):
+        """エイリアンを倒す（すでに倒されていた場合はFalseを返す）"""
+        if not self.alive:
+            return False
+        self.alive = False
+        if play_sound:
+            self.sounds.alien_destroy.play()
+        return True
 
-            return {"destroyed": True}
-        return {"destroyed": False}
+    def split_corners(self):
+        """倒されたときに分裂して現れるエイリアンの位置（画面の角）を返す"""
+        return RED_ALIEN_SPLIT_CORNERS if self.alien_type == "red" else ()
 
     def shoot(self, slime_x=None, slime_y=None):
         bullets = []
@@ -637,7 +935,7 @@ class Alien:
                 math.radians(random.uniform(205, 225)),  # 下寄り
             ]
             for angle in angles:
-                bullets.append(AlienBullet(bullet_x, bullet_y, angle))
+                bullets.append(alien_bullet_pool.acquire(bullet_x, bullet_y, angle))
         elif self.alien_type == "spawned" and slime_x is not None and slime_y is not None:
             # spawnedタイプはスライムを狙う
             # スライムの中心を狙う
@@ -649,18 +947,19 @@ class Alien:
             dy = target_y - bullet_y
             angle = math.atan2(dy, dx)
 
-            bullets.append(AlienBullet(bullet_x, bullet_y, angle))
-            print(f"Spawned alien shooting at slime! Angle: {math.degrees(angle):.1f}°")
+            bullets.append(alien_bullet_pool.acquire(bullet_x, bullet_y, angle))
+            event_log.debug("alien", "Spawned alien shooting at slime! Angle: %.1f°", math.degrees(angle))
         else:
             # 通常のエイリアンは1発
             angle = math.radians(random.uniform(135, 225))  # 左向きに調整
-            bullets.append(AlienBullet(bullet_x, bullet_y, angle))
+            bullets.append(alien_bullet_pool.acquire(bullet_x, bullet_y, angle))
 
         return bullets
 
-    def draw(self, screen, camera):
+    def sprite_position(self, camera):
+        """描画位置を返す（画面外ならNone）"""
         if not self.alive:
-            return
+            return None
 
         # カメラオフセットを適用した描画位置
         screen_x = self.x - camera.x
@@ -668,81 +967,38 @@ class Alien:
 
         # 画面外なら描画しない
         if screen_x < -self.width or screen_x > SCREEN_WIDTH:
-            return
+            return None
 
         # 浮遊による上下の動き
-        hover_y = screen_y + math.sin(self.hover_offset) * self.hover_amount
-
-        # 衝突判定用のrectを更新
-        self.rect.x = self.x
-        self.rect.y = self.y + math.sin(self.hover_offset) * self.hover_amount
-
-        # エイリアンの体（楕円）
-        body_rect = pygame.Rect(screen_x, hover_y + self.height * 0.3, self.width, self.height * 0.7)
-        pygame.draw.ellipse(screen, self.color, body_rect)
-
-        # エイリアンの頭（円）
-        head_radius = self.width // 3
-        head_x = screen_x + self.width // 2
-        head_y = hover_y + head_radius
-        pygame.draw.circle(screen, self.color, (head_x, head_y), head_radius)
-
-        # 触角
-        antenna_length = 15
-        # 左の触角
-        left_antenna_x = head_x - head_radius // 2
-        left_antenna_y = head_y - head_radius
-        pygame.draw.line(
-            screen,
-            self.antenna_color,
-            (left_antenna_x, left_antenna_y),
-            (left_antenna_x - 5, left_antenna_y - antenna_length),
-            3,
-        )
-        pygame.draw.circle(screen, self.antenna_color, (left_antenna_x - 5, left_antenna_y - antenna_length), 4)
-
-        # 右の触角
-        right_antenna_x = head_x + head_radius // 2
-        right_antenna_y = head_y - head_radius
-        pygame.draw.line(
-            screen,
-            self.antenna_color,
-            (right_antenna_x, right_antenna_y),
-            (right_antenna_x + 5, right_antenna_y - antenna_length),
-            3,
-        )
-        pygame.draw.circle(screen, self.antenna_color, (right_antenna_x + 5, right_antenna_y - antenna_length), 4)
+        hover = math.sin(self.hover_offset) * self.hover_amount
+        hover_y = screen_y + hover
 
-        # 目（2つの大きな楕円）
-        left_eye_x = head_x - head_radius // 3
-        right_eye_x = head_x + head_radius // 3
-        eye_y = head_y - head_radius // 4
-        eye_width = 8
-        eye_height = 12
+        return (int(screen_x) - ALIEN_SPRITE_PADDING, int(hover_y) - ALIEN_SPRITE_PADDING)
 
-        pygame.draw.ellipse(
-            screen, self.eye_color, (left_eye_x - eye_width // 2, eye_y - eye_height // 2, eye_width, eye_height)
-        )
-        pygame.draw.ellipse(
-            screen, self.eye_color, (right_eye_x - eye_width // 2, eye_y - eye_height // 2, eye_width, eye_height)
-        )
+    def draw(self, screen, camera):
+        position = self.sprite_position(camera)
+        if position is not None:
+            return screen.blit(alien_sprites.get(self.sprite_key), position)
 
-        # 腕（細い楕円）
-        arm_width = 8
-        arm_height = 25
-        # 左腕
-        left_arm_rect = pygame.Rect(screen_x - arm_width // 2, hover_y + self.height * 0.4, arm_width, arm_height)
-        pygame.draw.ellipse(screen, self.color, left_arm_rect)
 
-        # 右腕
-        right_arm_rect = pygame.Rect(
-            screen_x + self.width - arm_width // 2, hover_y + self.height * 0.4, arm_width, arm_height
-        )
-        pygame.draw.ellipse(screen, self.color, right_arm_rect)
+def draw_aliens(screen, camera, aliens):
+    """画面内のエイリアンを1回のblits呼び出しでまとめて描画し、描画した範囲のRectのリストを返す"""
+    blit_sequence = []
+    for alien in aliens:
+        position = alien.sprite_position(camera)
+        if position is not None:
+            blit_sequence.append((alien_sprites.get(alien.sprite_key), position))
+    return screen.blits(blit_sequence)
 
 
 class Explosion:
-    def __init__(self, x, y, power_level=1, play_sound=True):
+    __slots__ = ("x", "y", "power_level", "radius", "max_radius", "growth_speed", "active", "color")
+
+    def __init__(self, x, y, power_level=1, play_sound=True, sounds=SILENT_SOUNDS):
+        self.reset(x, y, power_level, play_sound, sounds)
+
+    def reset(self, x, y, power_level=1, play_sound=True, sounds=SILENT_SOUNDS):
+        """状態を初期化する（プールから取り出したときにも使う）"""
         self.x = x
         self.y = y
         self.power_level = power_level
@@ -751,28 +1007,26 @@ class Explosion:
         self.growth_speed = 2 + power_level * 0.5
         self.active = True
         self.color = ORANGE
-        self.particles = []
         self.create_particles()
 
         if play_sound:
-            explosion_sound.play()
+            sounds.explosion.play()
+
+    def lifetime_frames(self):
+        """爆発が消えるまでのフレーム数（パーティクルもこの時点で消える）"""
+        return math.ceil((self.max_radius - self.radius) / self.growth_speed) + 1
 
     def create_particles(self):
-        num_particles = 15 + self.power_level * 5
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8 + self.power_level * 2)
-            self.particles.append(
-                {
-                    "x": self.x,
-                    "y": self.y,
-                    "vx": math.cos(angle) * speed,
-                    "vy": math.sin(angle) * speed,
-                    "life": random.uniform(20, 40 + self.power_level * 5),
-                    "max_life": random.uniform(20, 40 + self.power_level * 5),
-                    "size": random.uniform(2, 4 + self.power_level),
-                }
-            )
+        particle_system.emit_burst(
+            self.x,
+            self.y,
+            effect_count(15 + self.power_level * 5),
+            speed=(2, 8 + self.power_level * 2),
+            life=(20, 40 + self.power_level * 5),
+            size=(2, 4 + self.power_level),
+            color=self.color,
+            ttl=self.lifetime_frames(),
+        )
 
     def update(self):
         if self.radius < self.max_radius:
@@ -780,14 +1034,6 @@ class Explosion:
         else:
             self.active = False
 
-        for i in range(len(self.particles) - 1, -1, -1):
-            particle = self.particles[i]
-            particle["x"] += particle["vx"]
-            particle["y"] += particle["vy"]
-            particle["life"] -= 1
-            if particle["life"] <= 0:
-                self.particles.pop(i)
-
     def draw(self, screen, camera):
         screen_x = self.x - camera.x
         screen_y = self.y
@@ -795,24 +1041,18 @@ class Explosion:
         if screen_x < -100 or screen_x > SCREEN_WIDTH + 100:
             return
 
-        pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), int(self.radius))
-
-        for particle in self.particles:
-            if particle["life"] > 0:
-                alpha_ratio = max(0, min(1, particle["life"] / particle["max_life"]))
-                color = (
-                    max(0, min(255, int(self.color[0] * alpha_ratio))),
-                    max(0, min(255, int(self.color[1] * alpha_ratio))),
-                    max(0, min(255, int(self.color[2] * alpha_ratio))),
-                )
-                particle_screen_x = particle["x"] - camera.x
-                particle_screen_y = particle["y"]
-                pos = (int(particle_screen_x), int(particle_screen_y))
-                pygame.draw.circle(screen, color, pos, max(1, int(particle["size"])))
+        # パーティクルはparticle_systemがまとめて描画する
+        return pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), int(self.radius))
 
 
 class BigExplosion:
-    def __init__(self, x, y, play_sound=True):
+    __slots__ = ("x", "y", "radius", "max_radius", "growth_speed", "active", "color")
+
+    def __init__(self, x, y, play_sound=True, sounds=SILENT_SOUNDS):
+        self.reset(x, y, play_sound, sounds)
+
+    def reset(self, x, y, play_sound=True, sounds=SILENT_SOUNDS):
+        """状態を初期化する（プールから取り出したときにも使う）"""
         self.x = x
         self.y = y
         self.radius = 10
@@ -820,28 +1060,26 @@ class BigExplosion:
         self.growth_speed = 4
         self.active = True
         self.color = (255, 100, 0)
-        self.particles = []
         self.create_particles()
 
         if play_sound:
-            alien_destroy_sound.play()
+            sounds.alien_destroy.play()
+
+    def lifetime_frames(self):
+        """爆発が消えるまでのフレーム数（パーティクルもこの時点で消える）"""
+        return math.ceil((self.max_radius - self.radius) / self.growth_speed) + 1
 
     def create_particles(self):
-        num_particles = 50
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(5, 15)
-            self.particles.append(
-                {
-                    "x": self.x,
-                    "y": self.y,
-                    "vx": math.cos(angle) * speed,
-                    "vy": math.sin(angle) * speed,
-                    "life": random.uniform(40, 80),
-                    "max_life": random.uniform(40, 80),
-                    "size": random.uniform(3, 8),
-                }
-            )
+        particle_system.emit_burst(
+            self.x,
+            self.y,
+            effect_count(50),
+            speed=(5, 15),
+            life=(40, 80),
+            size=(3, 8),
+            color=self.color,
+            ttl=self.lifetime_frames(),
+        )
 
     def update(self):
         if self.radius < self.max_radius:
@@ -849,14 +1087,6 @@ class BigExplosion:
         else:
             self.active = False
 
-        for i in range(len(self.particles) - 1, -1, -1):
-            particle = self.particles[i]
-            particle["x"] += particle["vx"]
-            particle["y"] += particle["vy"]
-            particle["life"] -= 1
-            if particle["life"] <= 0:
-                self.particles.pop(i)
-
     def draw(self, screen, camera):
         screen_x = self.x - camera.x
         screen_y = self.y
@@ -864,38 +1094,117 @@ class BigExplosion:
         if screen_x < -100 or screen_x > SCREEN_WIDTH + 100:
             return
 
-        pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), int(self.radius))
+        # パーティクルはparticle_systemがまとめて描画する
+        return pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), int(self.radius))
+
+
+# りんご・弾・キラキラのスプライトの透明色（どの絵にも使っていない色）
+SPRITE_COLORKEY = (255, 0, 255)
+
+
+def new_keyed_sprite(width, height):
+    """透明色で塗りつぶしたスプライト用のSurfaceを作る"""
+    sprite = pygame.Surface((width, height))
+    sprite.fill(SPRITE_COLORKEY)
+    return sprite
+
+
+# 大きい弾の見た目（中心の光る核の色と、周りを回るキラキラの色）
+PROJECTILE_STYLES = {
+    "gold": {"cores": (WHITE, (255, 255, 200)), "sparkles": ((255, 255, 150), (255, 200, 100))},  # 紫フォーム
+    (100, 150, 255): {"cores": ((200, 220, 255), (150, 180, 255)), "sparkles": ((150, 200, 255), (100, 180, 255))},
+}
+
+# 大きい弾のキラキラ（内側の輪と外側の輪の 数, 回転速度, 間隔の角度, 弾の半径からの距離, キラキラの半径）
+PROJECTILE_SPARKLE_RINGS = ((8, 8, 0.785, 8, 4), (6, -6, 1.047, 15, 3))
+
+
+def render_projectile_sprite(key):
+    """弾の本体（大きい弾は光る核も）をスプライトに描画する"""
+    color, radius, is_big = key
+    sprite = new_keyed_sprite(radius * 2 + 1, radius * 2 + 1)
+    center = (radius, radius)
+    pygame.draw.circle(sprite, color, center, radius)
+    if is_big:
+        inner, middle = PROJECTILE_STYLES.get(color, PROJECTILE_STYLES["gold"])["cores"]
+        pygame.draw.circle(sprite, inner, center, radius // 2)
+        pygame.draw.circle(sprite, middle, center, radius // 3)
+    return to_colorkey_format(sprite, SPRITE_COLORKEY)
+
+
+def render_sparkle_sprite(key):
+    """キラキラ1粒（半径sizeの円）をスプライトに描画する"""
+    color, size = key
+    sprite = new_keyed_sprite(size * 2 + 1, size * 2 + 1)
+    pygame.draw.circle(sprite, color, (size, size), size)
+    return to_colorkey_format(sprite, SPRITE_COLORKEY)
+
+
+projectile_sprites = SpriteCache(render_projectile_sprite)
+sparkle_sprites = SpriteCache(render_sparkle_sprite)
 
-        for particle in self.particles:
-            if particle["life"] > 0:
-                alpha_ratio = max(0, min(1, particle["life"] / particle["max_life"]))
-                color = (max(0, min(255, int(255 * alpha_ratio))), max(0, min(255, int(100 * alpha_ratio))), 0)
-                particle_screen_x = particle["x"] - camera.x
-                particle_screen_y = particle["y"]
-                pos = (int(particle_screen_x), int(particle_screen_y))
-                pygame.draw.circle(screen, color, pos, max(1, int(particle["size"])))
+
+@functools.lru_cache(maxsize=4)
+def sparkle_ring_offsets(now, radius):
+    """時刻nowでの大きい弾のキラキラの (弾の中心からのx, y, キラキラの半径, 輪の番号) のタプル"""
+    offsets = []
+    for ring, (count, speed, spacing, distance, size) in enumerate(PROJECTILE_SPARKLE_RINGS):
+        for i in range(count):
+            angle = (now * speed + i * spacing) % (2 * math.pi)
+            offsets.append((math.cos(angle) * (radius + distance), math.sin(angle) * (radius + distance), size, ring))
+    return tuple(offsets)
 
 
 class Projectile:
-    def __init__(self, x, y, direction, power_level=1, is_big=False):
-        self.x = x
-        self.y = y
+    __slots__ = (
+        "x",
+        "y",
+        "previous_x",
+        "previous_y",
+        "radius",
+        "speed",
+        "direction",
+        "active",
+        "color",
+        "creation_time",
+        "explosion",
+        "explosion_delay",
+        "rect",
+        "power_level",
+        "is_big",
+        "can_penetrate",
+        "sounds",
+        "velocity_x",
+        "velocity_y",
+    )
+
+    def __init__(self, x, y, direction, power_level=1, is_big=False, sounds=SILENT_SOUNDS):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, direction, power_level, is_big, sounds)
+
+    def reset(self, x, y, direction, power_level=1, is_big=False, sounds=SILENT_SOUNDS):
+        """状態を初期化する（プールから取り出したときにも使う）"""
+        self.x = self.previous_x = x
+        self.y = self.previous_y = y
         self.radius = 100 if is_big else 8  # 大きい弾は半径100に超巨大化
         self.speed = 22 if is_big else 10  # 大きい弾は速度22に増加
         self.direction = direction
         self.active = True
         self.color = (255, 200, 0) if is_big else PURPLE  # 大きい弾は金色
-        self.creation_time = time.time()
+        self.creation_time = frame_clock.now()
         self.explosion = None
         self.explosion_delay = 1.0 if is_big else 0.5  # 大きい弾はもっと長く飛ぶ
-        self.rect = pygame.Rect(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+        self.rect.update(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
         self.power_level = power_level
         self.is_big = is_big
         self.can_penetrate = is_big and power_level == 4  # 紫フォーム（power_level 4）の大きい弾のみ貫通
+        self.sounds = sounds
+        self.velocity_x = None  # 上方向の弾だけが設定する
+        self.velocity_y = None
 
     def move(self):
         # velocity_xとvelocity_yが設定されている場合はそれを使用（上方向の弾用）
-        if hasattr(self, "velocity_x") and hasattr(self, "velocity_y"):
+        if self.velocity_x is not None and self.velocity_y is not None:
             self.x += self.velocity_x
             self.y += self.velocity_y
         else:
@@ -906,66 +1215,61 @@ class Projectile:
         self.rect.y = self.y - self.radius
 
     def update(self):
-        if time.time() - self.creation_time >= self.explosion_delay and not self.explosion:
+        if self.explosion:
+            # 爆発エフェクトの更新
+            if self.explosion.active:
+                self.explosion.update()
+        elif frame_clock.now() - self.creation_time >= self.explosion_delay:
             explosion_power = self.power_level * (3 if self.is_big else 1)  # 大きい弾の爆発力も増加
-            self.explosion = Explosion(self.x, self.y, explosion_power)
+            self.explosion = explosion_pool.acquire(self.x, self.y, explosion_power, sounds=self.sounds)
             self.active = False
 
+    def add_blits(self, camera, blit_sequence):
+        """飛んでいる弾のスプライトと位置をblit_sequenceに追加し、描画する範囲のRectを返す（画面外・爆発後はNone）"""
+        if not self.active:
+            return None
+        screen_x = self.x - camera.x
+        screen_y = self.y
+        if screen_x <= -50 or screen_x >= SCREEN_WIDTH + 50:
+            return None
+
+        radius = self.radius
+        center_x = int(screen_x)
+        center_y = int(screen_y)
+        blit_sequence.append(
+            (projectile_sprites.get((self.color, radius, self.is_big)), (center_x - radius, center_y - radius))
+        )
+
+        # 大きい弾は周りを回るキラキラ（回転角は全部の弾で共通なのでフレームごとに1回だけ計算する）
+        if self.is_big:
+            style = PROJECTILE_STYLES.get(self.color, PROJECTILE_STYLES["gold"])
+            sparkle_colors = style["sparkles"]
+            for offset_x, offset_y, size, ring in sparkle_ring_offsets(frame_clock.now(), radius):
+                sprite = sparkle_sprites.get((sparkle_colors[ring], size))
+                blit_sequence.append((sprite, (int(screen_x + offset_x) - size, int(screen_y + offset_y) - size)))
+
+        # 描画した範囲（大きい弾は外側のキラキラまで）
+        reach = radius + 19 if self.is_big else radius + 1
+        return scratch_rects.get(center_x - reach, center_y - reach, reach * 2, reach * 2)
+
+    def draw_explosion(self, screen, camera):
+        """爆発した弾の爆発エフェクトを描画する"""
+        if not self.active and self.explosion and self.explosion.active:
+            return self.explosion.draw(screen, camera)
+
     def draw(self, screen, camera):
         if self.active:
-            screen_x = self.x - camera.x
-            screen_y = self.y
-            if screen_x > -50 and screen_x < SCREEN_WIDTH + 50:
-                pygame.draw.circle(screen, self.color, (int(screen_x), int(screen_y)), self.radius)
+            blit_sequence = []
+            dirty = self.add_blits(camera, blit_sequence)
+            screen.blits(blit_sequence, doreturn=False)
+            return dirty
+        return self.draw_explosion(screen, camera)
 
-                # 大きい弾の特別なエフェクト
-                if self.is_big:
-                    # 青色弾と他の弾で異なるエフェクト
-                    if self.color == (100, 150, 255):  # 青色弾の場合
-                        # 内側の光る核（青色系）
-                        pygame.draw.circle(screen, (200, 220, 255), (int(screen_x), int(screen_y)), self.radius // 2)
-                        # 中間の輝き
-                        pygame.draw.circle(screen, (150, 180, 255), (int(screen_x), int(screen_y)), self.radius // 3)
-                        # キラキラエフェクト（青色系）
-                        for i in range(8):
-                            sparkle_angle = (time.time() * 8 + i * 0.785) % (2 * math.pi)
-                            sparkle_x = screen_x + math.cos(sparkle_angle) * (self.radius + 8)
-                            sparkle_y = screen_y + math.sin(sparkle_angle) * (self.radius + 8)
-                            pygame.draw.circle(screen, (150, 200, 255), (int(sparkle_x), int(sparkle_y)), 4)
-
-                        # 追加の外側キラキラ（青色系）
-                        for i in range(6):
-                            sparkle_angle2 = (time.time() * -6 + i * 1.047) % (2 * math.pi)
-                            sparkle_x2 = screen_x + math.cos(sparkle_angle2) * (self.radius + 15)
-                            sparkle_y2 = screen_y + math.sin(sparkle_angle2) * (self.radius + 15)
-                            pygame.draw.circle(screen, (100, 180, 255), (int(sparkle_x2), int(sparkle_y2)), 3)
-                    else:  # 金色弾（紫フォーム）の場合
-                        # 内側の光る核（より大きく）
-                        pygame.draw.circle(screen, WHITE, (int(screen_x), int(screen_y)), self.radius // 2)
-                        # 中間の輝き
-                        pygame.draw.circle(screen, (255, 255, 200), (int(screen_x), int(screen_y)), self.radius // 3)
-                        # キラキラエフェクト（数を増やす）
-                        for i in range(8):
-                            sparkle_angle = (time.time() * 8 + i * 0.785) % (2 * math.pi)
-                            sparkle_x = screen_x + math.cos(sparkle_angle) * (self.radius + 8)
-                            sparkle_y = screen_y + math.sin(sparkle_angle) * (self.radius + 8)
-                            pygame.draw.circle(screen, (255, 255, 150), (int(sparkle_x), int(sparkle_y)), 4)
-
-                        # 追加の外側キラキラ
-                        for i in range(6):
-                            sparkle_angle2 = (time.time() * -6 + i * 1.047) % (2 * math.pi)
-                            sparkle_x2 = screen_x + math.cos(sparkle_angle2) * (self.radius + 15)
-                            sparkle_y2 = screen_y + math.sin(sparkle_angle2) * (self.radius + 15)
-                            pygame.draw.circle(screen, (255, 200, 100), (int(sparkle_x2), int(sparkle_y2)), 3)
-
-        elif self.explosion and self.explosion.active:
-            self.explosion.update()
-            self.explosion.draw(screen, camera)
-
-    def check_collision(self, blocks):
+    def check_collision(self, platforms):
         if not self.active:
             return False
-        for block in blocks:
+        # 弾と横方向に重なるプラットフォームだけを調べる
+        for block in platforms.query(self.x - self.radius, self.x + self.radius):
             if (
                 self.x + self.radius > block.rect.left
                 and self.x - self.radius < block.rect.right
@@ -973,17 +1277,16 @@ class Projectile:
                 and self.y - self.radius < block.rect.bottom
             ):
 
-                # 貫通弾の場合は衝突時に爆発エフェクトのみ生成して、弾は継続
+                # 貫通弾の場合は爆発せずに弾は継続
                 if self.can_penetrate:
-                    # 貫通時の小爆発エフェクト
-                    penetration_explosion = Explosion(self.x, self.y, 1, False)  # 音は鳴らさない
-                    # メイン関数で管理するために、戻り値で爆発オブジェクトを返す可能性もあるが、今回は簡単な実装にする
-                    print(f"Purple bullet penetrating through platform at x={self.x:.1f}, y={self.y:.1f}")
+                    event_log.debug(
+                        "bullet", "Purple bullet penetrating through platform at x=%.1f, y=%.1f", self.x, self.y
+                    )
                     return False  # 弾は継続するので衝突扱いにしない
                 else:
                     # 通常弾の場合は従来通り爆発して停止
                     explosion_power = self.power_level * (3 if self.is_big else 1)
-                    self.explosion = Explosion(self.x, self.y, explosion_power)
+                    self.explosion = explosion_pool.acquire(self.x, self.y, explosion_power, sounds=self.sounds)
                     self.active = False
                     return True
         return False
@@ -991,9 +1294,22 @@ class Projectile:
     def explode(self):
         if self.active:
             explosion_power = self.power_level * (3 if self.is_big else 1)  # 大きい弾の爆発力も増加
-            self.explosion = Explosion(self.x, self.y, explosion_power)
+            self.explosion = explosion_pool.acquire(self.x, self.y, explosion_power, sounds=self.sounds)
             self.active = False
 
+    def release(self):
+        """使い終わった弾を爆発と一緒にプールへ戻す"""
+        if self.explosion is not None:
+            explosion_pool.release(self.explosion)
+            self.explosion = None
+        projectile_pool.release(self)
+
+
+# 使い終わった弾・爆発を使い回すプール
+projectile_pool = EntityPool(Projectile)
+explosion_pool = EntityPool(Explosion)
+big_explosion_pool = EntityPool(BigExplosion)
+
 
 class Block:
     def __init__(self, x, y, width, height):
@@ -1005,8 +1321,10 @@ class Block:
         screen_y = self.rect.y
 
         if screen_x > -self.rect.width and screen_x < SCREEN_WIDTH:
-            screen_rect = pygame.Rect(screen_x, screen_y, self.rect.width, self.rect.height)
+            screen_rect = scratch_rects.get(screen_x, screen_y, self.rect.width, self.rect.height)
             pygame.draw.rect(screen, self.color, screen_rect)
+            return screen_rect
+        return None
 
 
 class SpikedPlatform:
@@ -1022,7 +1340,7 @@ class SpikedPlatform:
 
         if screen_x > -self.rect.width and screen_x < SCREEN_WIDTH:
             # プラットフォーム本体を描画
-            screen_rect = pygame.Rect(screen_x, screen_y, self.rect.width, self.rect.height)
+            screen_rect = scratch_rects.get(screen_x, screen_y, self.rect.width, self.rect.height)
             pygame.draw.rect(screen, self.color, screen_rect)
 
             # プラットフォームの輪郭を描画
@@ -1054,12 +1372,69 @@ class SpikedPlatform:
                 # トゲの輪郭を描画
                 pygame.draw.polygon(screen, (150, 0, 0), spike_points, 2)
 
+            # 描画した範囲（上に出ているトゲと、輪郭のはみ出し分を含む）
+            return scratch_rects.get(
+                screen_x - 1, screen_y - spike_height - 1, self.rect.width + 2, self.rect.height + spike_height + 1
+            )
+        return None
+
+
+# りんごの種類ごとの本体の色と、キラキラの色（赤りんごはキラキラ無し）
+APPLE_COLORS = {
+    "red": RED,
+    "blue": BLUE,
+    "green": (0, 255, 0),  # 鮮やかな緑
+    "purple": (128, 0, 128),  # 紫色
+    "brown": BROWN,  # 茶色
+}
+APPLE_SPARKLE_COLORS = {
+    "blue": (100, 150, 255),
+    "purple": (255, 100, 255),
+    "green": (50, 255, 50),
+    "brown": (255, 200, 100),  # 茶色のキラキラは暖色系
+}
+
+# スプライト内での、本体の中心のx座標とりんごの上端のy座標（茎と葉っぱが上にはみ出す分の余白）
+APPLE_SPRITE_ORIGIN = (16, 4)
+
+
+def render_apple_sprite(apple_type):
+    """りんご1個（本体・ハイライト・茎・葉っぱ）をスプライトに描画する"""
+    color = APPLE_COLORS[apple_type]
+    sprite = new_keyed_sprite(32, 36)
+    center_x, top = APPLE_SPRITE_ORIGIN
+    center_y = top + 15
+
+    # りんごの本体（円）
+    pygame.draw.circle(sprite, color, (center_x, center_y), 15)
+
+    # りんごのハイライト
+    highlight_color = tuple(min(255, c + 50) for c in color)
+    pygame.draw.circle(sprite, highlight_color, (center_x - 3, center_y - 3), 7)
+
+    # りんごの葉っぱ（茎の部分）
+    pygame.draw.rect(sprite, (139, 69, 19), (center_x - 2, top - 2, 4, 8))  # 茶色の茎
+
+    # 葉っぱ
+    leaf_points = [
+        (center_x + 2, top + 2),
+        (center_x + 8, top - 3),
+        (center_x + 6, top + 4),
+        (center_x + 2, top + 6),
+    ]
+    pygame.draw.polygon(sprite, (0, 150, 0), leaf_points)
+    return to_colorkey_format(sprite, SPRITE_COLORKEY)
+
+
+apple_sprites = SpriteCache(render_apple_sprite)
+
 
 class Apple:
     def __init__(self, x, y, apple_type="red"):
         self.x = x
         self.y = y
         self.type = apple_type
+        self.rect = pygame.Rect(x, y, 30, 30)  # 当たり判定（りんごは動かないので位置は変わらない）
         self.consumed = False
         self.sparkle_timer = 0
         self.sparkle_particles = []
@@ -1068,15 +1443,13 @@ class Apple:
         """りんごの更新（キラキラエフェクト用）"""
         if self.type in ["blue", "purple", "green", "brown"]:
             self.sparkle_timer += 1
-            if self.sparkle_timer % 10 == 0:  # 10フレームごとに新しいキラキラ
-                for _ in range(3):
-                    particle = {
-                        "x": self.x + random.randint(-15, 15),
-                        "y": self.y + random.randint(-15, 15),
-                        "life": 30,
-                        "vx": random.uniform(-1, 1),
-                        "vy": random.uniform(-1, 1),
-                    }
+            if self.sparkle_timer % quality.settings["apple_sparkle_interval"] == 0:  # 一定フレームごとに新しいキラキラ
+                # 見た目だけの乱数はパーティクル用のものを使う（ゲームの展開に使う乱数をずらさないように）
+                rng = particle_system.rng
+                offsets = rng.integers(-15, 16, (3, 2)).tolist()
+                velocities = rng.uniform(-1, 1, (3, 2)).tolist()
+                for (offset_x, offset_y), (vx, vy) in zip(offsets, velocities):
+                    particle = {"x": self.x + offset_x, "y": self.y + offset_y, "life": 30, "vx": vx, "vy": vy}
                     self.sparkle_particles.append(particle)
 
             # パーティクルの更新
@@ -1087,136 +1460,111 @@ class Apple:
                 if particle["life"] <= 0:
                     self.sparkle_particles.remove(particle)
 
-    def draw(self, screen, camera):
-        if not self.consumed:
-            screen_x = self.x - camera.x
-            screen_y = self.y
-            width = 30
-            height = 30
-
-            # 画面外なら描画しない
-            if screen_x < -50 or screen_x > SCREEN_WIDTH + 50:
-                return
-
-            # キラキラエフェクトを描画（青、紫、緑、茶色りんご用）
-            if self.type in ["blue", "purple", "green", "brown"]:
-                for particle in self.sparkle_particles:
-                    sparkle_screen_x = particle["x"] - camera.x
-                    sparkle_screen_y = particle["y"]
-                    alpha = int(255 * (particle["life"] / 30))
-
-                    # キラキラの色
-                    if self.type == "blue":
-                        sparkle_color = (100, 150, 255)
-                    elif self.type == "purple":
-                        sparkle_color = (255, 100, 255)
-                    elif self.type == "green":
-                        sparkle_color = (50, 255, 50)
-                    elif self.type == "brown":
-                        sparkle_color = (255, 200, 100)  # 茶色のキラキラは暖色系
-
-                    # キラキラを描画
-                    size = max(1, particle["life"] // 10)
-                    if size > 0:
-                        pygame.draw.circle(screen, sparkle_color, (int(sparkle_screen_x), int(sparkle_screen_y)), size)
-
-            # りんご本体を描画
-            if self.type == "red":
-                color = RED
-            elif self.type == "blue":
-                color = BLUE
-            elif self.type == "green":
-                color = (0, 255, 0)  # 鮮やかな緑
-            elif self.type == "purple":
-                color = (128, 0, 128)  # 紫色
-            elif self.type == "brown":
-                color = BROWN  # 茶色
-
-            # りんごの本体（円）
-            apple_center_x = int(screen_x + width // 2)
-            apple_center_y = int(screen_y + height // 2)
-            pygame.draw.circle(screen, color, (apple_center_x, apple_center_y), width // 2)
-
-            # りんごのハイライト
-            highlight_color = tuple(min(255, c + 50) for c in color)
-            pygame.draw.circle(screen, highlight_color, (apple_center_x - 3, apple_center_y - 3), width // 4)
-
-            # りんごの葉っぱ（茎の部分）
-            leaf_color = (0, 150, 0)
-            stem_rect = pygame.Rect(apple_center_x - 2, screen_y - 2, 4, 8)
-            pygame.draw.rect(screen, (139, 69, 19), stem_rect)  # 茶色の茎
-
-            # 葉っぱ
-            leaf_points = [
-                (apple_center_x + 2, screen_y + 2),
-                (apple_center_x + 8, screen_y - 3),
-                (apple_center_x + 6, screen_y + 4),
-                (apple_center_x + 2, screen_y + 6),
-            ]
-            pygame.draw.polygon(screen, leaf_color, leaf_points)
-
-
-class FlyingPlatform:
-    def __init__(self, platform, angle):
-        self.x = platform.rect.x
-        self.y = platform.rect.y
-        self.width = platform.rect.width
-        self.height = platform.rect.height
-        self.angle = angle
-        self.rotation_angle = 0
-        self.speed = 15  # 速度を倍近くに上げる
-
-        # 角度から速度成分を計算
-        self.vx = math.cos(math.radians(angle)) * self.speed
-        self.vy = math.sin(math.radians(angle)) * self.speed
-
-        self.life = 180  # 3秒間表示
-        self.active = True
-
-    def update(self):
-        if not self.active:
-            return
+    def add_blits(self, camera, blit_sequence):
+        """描画するスプライトと位置をblit_sequenceに追加し、描画する範囲のRectを返す（画面外ならNone）"""
+        if self.consumed:
+            return None
+        screen_x = self.x - camera.x
+        screen_y = int(self.y)
 
-        # 移動
-        self.x += self.vx
-        self.y += self.vy
+        # 画面外なら描画しない
+        if screen_x < -50 or screen_x > SCREEN_WIDTH + 50:
+            return None
 
-        # 重力の影響を少し受ける（上に飛んでいる場合のみ）
-        if self.vy < 0:
-            self.vy += 0.5
-        else:
-            self.vy += 0.2
+        # 本体の中心のx座標（茎と葉っぱもここを基準に描かれている）
+        center_x = int(screen_x + 15)
+        origin_x, origin_y = APPLE_SPRITE_ORIGIN
+        sprite = apple_sprites.get(self.type)
+        dirty = scratch_rects.get(center_x - origin_x, screen_y - origin_y, sprite.get_width(), sprite.get_height())
 
-        # 回転
-        self.rotation_angle += 20  # 20度ずつ回転（より激しく）
+        # キラキラエフェクト（青、紫、緑、茶色りんご用。本体の下に描く）
+        sparkle_color = APPLE_SPARKLE_COLORS.get(self.type)
+        if sparkle_color is not None:
+            camera_x = camera.x
+            for particle in self.sparkle_particles:
+                size = max(1, particle["life"] // 10)
+                left = int(particle["x"] - camera_x) - size
+                top = int(particle["y"]) - size
+                blit_sequence.append((sparkle_sprites.get((sparkle_color, size)), (left, top)))
+                dirty.union_ip((left, top, size * 2 + 1, size * 2 + 1))
 
-        # ライフタイマー減少
-        self.life -= 1
-        if self.life <= 0:
-            self.active = False
+        blit_sequence.append((sprite, (center_x - origin_x, screen_y - origin_y)))
+        return dirty
 
     def draw(self, screen, camera):
-        if not self.active:
-            return
-
-        screen_x = self.x - camera.x
-        screen_y = self.y
-
-        # 画面外なら描画しない
-        if screen_x < -200 or screen_x > SCREEN_WIDTH + 200:
-            return
+        blit_sequence = []
+        dirty = self.add_blits(camera, blit_sequence)
+        screen.blits(blit_sequence, doreturn=False)
+        return dirty
+
+
+# 飛んでいくプラットフォームのアトラスの分割数
+# 回転は20度刻み。四角形は180度回すと同じ形になるので、火花が偶数個（か無し）なら0〜180度の9通りで足りる
+# 火花が奇数個の場合は180度回すと火花の位置が変わるので、0〜360度の18通りを作る
+FLYING_PLATFORM_ANGLE_STEP = 20
+FLYING_PLATFORM_ALPHA_BUCKETS = 10
+
+
+class FlyingPlatformAtlas:
+    """回転角と明るさの組み合わせごとに描画済みの飛行プラットフォーム画像
+
+    プラットフォームのサイズごとに生成し、全ての FlyingPlatform で共有する。
+    フレーム（100x20のプラットフォームで1枚約146x146ピクセル、最大90枚・約7.5MB、火花が奇数個なら倍）は、
+    初めて使うときに1枚ずつ描画する（画面外に飛んでいった後のフレームは作らずに済む）。
+    火花の数（画質レベル）が変わったら、そのサイズのアトラスを作り直す（古いフレームは残さない）。
+    """
+
+    _atlases = {}
+
+    @classmethod
+    def for_size(cls, width, height, sparks=6):
+        """サイズと火花の数に対応するアトラスを返す（無ければ生成）"""
+        atlas = cls._atlases.get((width, height))
+        if atlas is None or atlas.sparks != sparks:
+            atlas = cls(width, height, sparks)
+            cls._atlases[(width, height)] = atlas
+        return atlas
+
+    def __init__(self, width, height, sparks=6):
+        self.width = width
+        self.height = height
+        self.sparks = sparks
+        # 光の効果（1.4倍）と火花（最大40ピクセル）が収まる半径
+        glow_radius = math.hypot(width // 2 * 1.4, height // 2 * 1.4)
+        self.radius = int(max(glow_radius, 40 + 3)) + 2
+        # 回転して同じ絵になる角度（火花が奇数個だと180度回しても重ならない）
+        self.angle_range = 360 if sparks % 2 else 180
+        self.angle_steps = self.angle_range // FLYING_PLATFORM_ANGLE_STEP
+        self.frames = [[None] * FLYING_PLATFORM_ALPHA_BUCKETS for _ in range(self.angle_steps)]
+
+    def frame(self, rotation_angle, alpha_factor):
+        """回転角（度）と明るさ（0〜1）に対応するフレームを返す"""
+        step = round(rotation_angle / FLYING_PLATFORM_ANGLE_STEP) % self.angle_steps
+        bucket = min(FLYING_PLATFORM_ALPHA_BUCKETS - 1, max(0, int(alpha_factor * FLYING_PLATFORM_ALPHA_BUCKETS)))
+        surface = self.frames[step][bucket]
+        if surface is None:
+            surface = self.frames[step][bucket] = self._render(step, bucket)
+        return surface
+
+    def _render(self, step, bucket):
+        rotation_angle = step * FLYING_PLATFORM_ANGLE_STEP
+        alpha_factor = (bucket + 0.5) / FLYING_PLATFORM_ALPHA_BUCKETS
+
+        size = self.radius * 2
+        surface = to_display_format(pygame.Surface((size, size)), alpha=False)
+        surface.fill(BLACK)
 
         # 回転した四角形を描画
-        center_x = screen_x + self.width // 2
-        center_y = screen_y + self.height // 2
+        center_x = self.radius
+        center_y = self.radius
 
         # 四角形の頂点を計算
         half_width = self.width // 2
         half_height = self.height // 2
 
         # 回転行列を適用
-        cos_angle = math.cos(math.radians(self.rotation_angle))
-        sin_angle = math.sin(math.radians(self.rotation_angle))
+        cos_angle = math.cos(math.radians(rotation_angle))
+        sin_angle = math.sin(math.radians(rotation_angle))
 
         corners = [
             (-half_width, -half_height),
@@ -1232,7 +1580,6 @@ class FlyingPlatform:
             rotated_corners.append((center_x + rotated_x, center_y + rotated_y))
 
         # 色を時間と共に薄くする
-        alpha_factor = self.life / 180
         base_color = (int(255 * alpha_factor), int(100 * alpha_factor), int(100 * alpha_factor))
 
         # 背景に光の効果を追加
@@ -1249,30 +1596,254 @@ class FlyingPlatform:
                 rotated_y = expanded_x * sin_angle + expanded_y * cos_angle
                 glow_corners.append((center_x + rotated_x, center_y + rotated_y))
 
-            pygame.draw.polygon(screen, glow_color, glow_corners)
+            pygame.draw.polygon(surface, glow_color, glow_corners)
 
         # 四角形を描画
-        pygame.draw.polygon(screen, base_color, rotated_corners)
+        pygame.draw.polygon(surface, base_color, rotated_corners)
 
         # より太い輪郭を描画
         if alpha_factor > 0.3:
             outline_color = (255, 255, 100) if alpha_factor > 0.7 else (255, 200, 100)
-            pygame.draw.polygon(screen, outline_color, rotated_corners, 4)
-
-        # 火花エフェクトを追加
-        if alpha_factor > 0.5:
-            for i in range(6):
-                spark_angle = self.rotation_angle + i * 60
-                spark_distance = 30 + random.randint(-10, 10)
+            pygame.draw.polygon(surface, outline_color, rotated_corners, 4)
+
+        # 火花エフェクトを追加（揺らぎは回転角ごとに固定の乱数で焼き込む）
+        if alpha_factor > 0.5 and self.sparks:
+            spark_random = random.Random(step)
+            for i in range(self.sparks):
+                spark_angle = rotation_angle + i * 360 / self.sparks
+                spark_distance = 30 + spark_random.randint(-10, 10)
                 spark_x = center_x + math.cos(math.radians(spark_angle)) * spark_distance
                 spark_y = center_y + math.sin(math.radians(spark_angle)) * spark_distance
-                pygame.draw.circle(screen, (255, 255, 150), (int(spark_x), int(spark_y)), 3)
+                pygame.draw.circle(surface, (255, 255, 150), (int(spark_x), int(spark_y)), 3)
+
+        # 黒を透過色にして、透明部分の転送をRLEで省く
+        surface.set_colorkey(BLACK, pygame.RLEACCEL)
+        return surface
+
+
+class FlyingPlatform:
+    def __init__(self, platform, angle):
+        self.x = self.previous_x = platform.rect.x
+        self.y = self.previous_y = platform.rect.y
+        self.width = platform.rect.width
+        self.height = platform.rect.height
+        self.angle = angle
+        self.rotation_angle = 0
+        self.speed = 15  # 速度を倍近くに上げる
+
+        # 角度から速度成分を計算
+        self.vx = math.cos(math.radians(angle)) * self.speed
+        self.vy = math.sin(math.radians(angle)) * self.speed
+
+        self.life = 180  # 3秒間表示
+        self.active = True
+
+    def update(self):
+        if not self.active:
+            return
+
+        # 移動
+        self.x += self.vx
+        self.y += self.vy
+
+        # 重力の影響を少し受ける（上に飛んでいる場合のみ）
+        if self.vy < 0:
+            self.vy += 0.5
+        else:
+            self.vy += 0.2
+
+        # 回転
+        self.rotation_angle += 20  # 20度ずつ回転（より激しく）
+
+        # ライフタイマー減少
+        self.life -= 1
+        if self.life <= 0:
+            self.active = False
+
+    def draw(self, screen, camera):
+        if not self.active:
+            return
+
+        screen_x = self.x - camera.x
+        screen_y = self.y
+
+        # 画面外なら描画しない
+        if screen_x < -200 or screen_x > SCREEN_WIDTH + 200:
+            return
+
+        # 回転角と明るさに対応する描画済みフレームを1回blitするだけ
+        center_x = int(screen_x + self.width // 2)
+        center_y = int(screen_y + self.height // 2)
+        # 同じサイズ・同じ火花の数の飛行プラットフォームで共有する描画済みフレーム
+        atlas = FlyingPlatformAtlas.for_size(self.width, self.height, quality.settings["platform_sparks"])
+        frame = atlas.frame(self.rotation_angle, self.life / 180)
+        return screen.blit(frame, (center_x - atlas.radius, center_y - atlas.radius))
+
+
+# スライムの光エフェクトの脈動を量子化する段階数
+SLIME_PULSE_BUCKETS = 8
+
+# 本体スプライトの余白と透過色（本体の描画に使わない色）
+SLIME_SPRITE_PADDING = 4
+SLIME_BODY_COLORKEY = (255, 0, 255)
+
+
+def slime_size(form):
+    """フォームごとのスライムの幅（高さも同じ）"""
+    if form == 4:
+        return int(40 * 8.0)  # 紫フォームは超巨大に
+    return int(40 * (1 + (form - 1) * 0.4))
+
+
+def pulse_bucket(pulse_intensity):
+    """0〜1の脈動の強さをキャッシュ用の段階に丸める"""
+    return min(SLIME_PULSE_BUCKETS - 1, int(pulse_intensity * SLIME_PULSE_BUCKETS))
+
+
+def render_glow_rings(rings):
+    """同心円のリング (半径, 色, 太さ) を1枚の透過スプライトに描画する"""
+    max_radius = max(radius for radius, _, _ in rings)
+    size = max_radius * 2 + 2
+    sprite = to_display_format(pygame.Surface((size, size)), alpha=False)
+    sprite.fill(BLACK)
+    for radius, color, thickness in rings:
+        pygame.draw.circle(sprite, color, (size // 2, size // 2), radius, thickness)
+    # リングは黒を使わないので黒を透過色にし、RLEで透明部分の転送を省く
+    sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+    return sprite
+
+
+def render_slime_body(form, has_been_red, can_deflect, direction):
+    """スライムの本体（体・バブル・目）を描画する"""
+    width = slime_size(form)
+    height = width
+
+    # 色を決定
+    if form == 4:  # 紫フォーム
+        color = (128, 0, 128)
+        eye_color = (255, 255, 0)
+    elif form >= 3 and has_been_red:  # 3つ以上食べた場合のみ赤
+        color = RED
+        eye_color = YELLOW
+    elif can_deflect:  # 青りんご効果（第三形態）
+        color = BLUE
+        eye_color = YELLOW
+    else:
+        color = GREEN
+        eye_color = WHITE
+
+    pad = SLIME_SPRITE_PADDING
+    sprite = to_display_format(pygame.Surface((width + pad * 2, height + pad * 2)), alpha=False)
+    sprite.fill(SLIME_BODY_COLORKEY)
+    center_x = pad + width // 2
+    center_y = pad + height // 2
+
+    # スライムの本体（楕円形）
+    base_width = width * 0.9
+    base_height = height * 0.9
+    base_rect = pygame.Rect(center_x - base_width // 2, center_y - base_height // 2, base_width, base_height)
+    pygame.draw.ellipse(sprite, color, base_rect)
+
+    # 下部のつぶれた部分
+    bottom_width = base_width * 1.1
+    bottom_height = base_height * 0.3
+    bottom_rect = pygame.Rect(center_x - bottom_width // 2, center_y + base_height // 4, bottom_width, bottom_height)
+    pygame.draw.ellipse(sprite, color, bottom_rect)
+
+    # バブル（3つ）
+    bubble_flip = direction
+    bubbles = [
+        (center_x - base_width * 0.2 * bubble_flip, center_y - base_height * 0.1, base_width * 0.15),
+        (center_x + base_width * 0.15 * bubble_flip, center_y - base_height * 0.25, base_width * 0.12),
+        (center_x + base_width * 0.05 * bubble_flip, center_y + base_height * 0.15, base_width * 0.1),
+    ]
+
+    for bubble_x, bubble_y, bubble_size in bubbles:
+        pygame.draw.circle(sprite, WHITE, (int(bubble_x), int(bubble_y)), int(bubble_size))
+        pygame.draw.circle(
+            sprite,
+            WHITE,
+            (int(bubble_x - bubble_size * 0.3 * bubble_flip), int(bubble_y - bubble_size * 0.3)),
+            int(bubble_size * 0.4),
+        )
+
+    # 目
+    eye_offset = base_width // 6
+    if direction == 1:
+        left_eye_x = center_x - eye_offset
+        right_eye_x = center_x + eye_offset
+    else:
+        left_eye_x = center_x + eye_offset
+        right_eye_x = center_x - eye_offset
+
+    eye_y = center_y - base_height // 8
+    eye_radius = max(3, int(base_width // 10))
+
+    pygame.draw.circle(sprite, eye_color, (int(left_eye_x), int(eye_y)), eye_radius)
+    pygame.draw.circle(sprite, eye_color, (int(right_eye_x), int(eye_y)), eye_radius)
+
+    # 瞳
+    pupil_radius = max(1, eye_radius // 2)
+    pygame.draw.circle(sprite, (0, 0, 0), (int(left_eye_x), int(eye_y)), pupil_radius)
+    pygame.draw.circle(sprite, (0, 0, 0), (int(right_eye_x), int(eye_y)), pupil_radius)
+
+    # 半透明は使わないので、アルファブレンドではなくRLE付きのカラーキー転送にする
+    sprite.set_colorkey(SLIME_BODY_COLORKEY, pygame.RLEACCEL)
+    return sprite
+
+
+def render_slime_sprite(key):
+    """スライム用スプライトをキーの種類に応じて描画する"""
+    kind = key[0]
+    if kind == "body":
+        return render_slime_body(*key[1:])
+
+    if kind == "flying_ring":
+        # 飛行中のリング（1本ずつ。回転によるずれは描画時に加える）
+        _, i, bucket = key
+        pulse_intensity = (bucket + 0.5) / SLIME_PULSE_BUCKETS
+        glow_size = slime_size(4) * (1.8 + pulse_intensity * 0.8)
+        ring_size = glow_size * (1 + i * 0.1)
+        alpha_factor = (8 - i) / 8
+        ring_color = (int(255 * alpha_factor), int(100 * alpha_factor), int(255 * alpha_factor))
+        return render_glow_rings([(int(ring_size // 2), ring_color, 4)])
+
+    if kind == "purple_glow":
+        _, bucket, count = key
+        pulse_intensity = (bucket + 0.5) / SLIME_PULSE_BUCKETS
+        glow_size = slime_size(4) * (1.5 + pulse_intensity * 0.5)
+        rings = []
+        for i in range(count):
+            ring_size = glow_size * (1 + i * 0.15)
+            alpha_factor = (5 - i) / 5
+            ring_color = (int(255 * alpha_factor), int(0 * alpha_factor), int(255 * alpha_factor))
+            rings.append((int(ring_size // 2), ring_color, 3))
+        return render_glow_rings(rings)
+
+    if kind == "deflect_glow":
+        _, form, bucket, count = key
+        pulse_intensity = (bucket + 0.5) / SLIME_PULSE_BUCKETS
+        glow_size = slime_size(form) * (1.2 + pulse_intensity * 0.3)
+        rings = []
+        for i in range(count):
+            ring_size = glow_size * (1 + i * 0.1)
+            alpha_factor = (3 - i) / 3
+            ring_color = (int(100 * alpha_factor), int(150 * alpha_factor), int(255 * alpha_factor))
+            rings.append((int(ring_size // 2), ring_color, 2))
+        return render_glow_rings(rings)
+
+    raise KeyError(key)
+
+
+# スライムの本体・光エフェクトのスプライト（必要になった時に描画し、LRUで破棄）
+slime_sprites = SpriteCache(render_slime_sprite, max_entries=160)
 
 
 class Slime:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    def __init__(self, x, y, sounds=SILENT_SOUNDS):
+        self.sounds = sounds
+        self.x = self.previous_x = x
+        self.y = self.previous_y = y
         self.velocity_x = 0
         self.velocity_y = 0
         self.on_ground = False
@@ -1281,7 +1852,6 @@ class Slime:
         self.invincible_timer = 0
         self.purple_timer = 0  # 紫りんご効果の時間
         self.purple_invincible = False
-        self.sparkle_particles = []
         self.can_deflect = False
         self.deflect_timer = 0
         self.direction = 1  # 1: 右向き, -1: 左向き
@@ -1329,21 +1899,25 @@ class Slime:
             self.form = 4
             self.purple_timer = 300  # 5秒間（60FPS * 5）
             self.purple_invincible = True
-            purple_apple_sound.play()  # 効果音再生
+            self.sounds.purple_apple.play()  # 効果音再生
         elif apple.type == "brown":
             # 茶色りんごで二段ジャンプ追加
             self.double_jump_count += 1
             # 地面にいる場合は即座に二段ジャンプ可能にする
             if self.on_ground:
                 self.can_double_jump = self.double_jump_count > 0
-            print(
-                f"Brown apple eaten! double_jump_count: {self.double_jump_count}, can_double_jump: {self.can_double_jump}, on_ground: {self.on_ground}"
+            event_log.debug(
+                "apple",
+                "Brown apple eaten! double_jump_count: %s, can_double_jump: %s, on_ground: %s",
+                self.double_jump_count,
+                self.can_double_jump,
+                self.on_ground,
             )
             return "double_jump_gained"
 
         return None
 
-    def update(self, platforms, flying_platforms_list=None):
+    def update(self, platforms, flying_platforms_list=None, keys=None):
         # 飛行中の処理
         if self.is_flying:
             # 回転角度を更新（より高速回転）
@@ -1373,8 +1947,9 @@ class Slime:
                 if self.y + height > SCREEN_HEIGHT - 20:
                     self.y = SCREEN_HEIGHT - 20 - height
         else:
-            # 通常の移動処理
-            keys = pygame.key.get_pressed()
+            # 通常の移動処理（keysを省略した場合は現在のキーボード状態を使う）
+            if keys is None:
+                keys = pygame.key.get_pressed()
 
             # 紫フォームの場合は自動で右に移動
             if self.form == 4:
@@ -1394,28 +1969,36 @@ class Slime:
 
             if jump_key_current and not self.jump_key_pressed and self.form != 4:
                 # ジャンプキーが新たに押された（紫フォーム以外）
-                print(
-                    f"Jump key pressed! on_ground: {self.on_ground}, form: {self.form}, can_double_jump: {self.can_double_jump}, double_jump_count: {self.double_jump_count}"
+                event_log.debug(
+                    "slime",
+                    "Jump key pressed! on_ground: %s, form: %s, can_double_jump: %s, double_jump_count: %s",
+                    self.on_ground,
+                    self.form,
+                    self.can_double_jump,
+                    self.double_jump_count,
                 )
                 if self.on_ground:
                     # 地面にいる場合は必ず通常のジャンプ
                     self.velocity_y = self.jump_power
                     self.on_ground = False
                     self.can_double_jump = self.double_jump_count > 0
-                    print(
-                        f"Normal jump performed, can_double_jump: {self.can_double_jump}, count: {self.double_jump_count}"
+                    event_log.debug(
+                        "slime",
+                        "Normal jump performed, can_double_jump: %s, count: %s",
+                        self.can_double_jump,
+                        self.double_jump_count,
                     )
                 elif self.can_double_jump and self.double_jump_count > 0 and not self.on_ground:
                     # 空中にいて、二段ジャンプが可能な場合のみ二段ジャンプ
                     self.velocity_y = self.jump_power
                     self.double_jump_count -= 1
                     self.can_double_jump = False
-                    double_jump_sound.play()  # 効果音再生
-                    print(f"Double jump used! Remaining: {self.double_jump_count}")
+                    self.sounds.double_jump.play()  # 効果音再生
+                    event_log.debug("slime", "Double jump used! Remaining: %s", self.double_jump_count)
                 else:
-                    print("Jump failed - conditions not met")
+                    event_log.debug("slime", "Jump failed - conditions not met")
             elif jump_key_current and self.form == 4:
-                print("Jump blocked - purple form")
+                event_log.debug("slime", "Jump blocked - purple form")
 
             self.jump_key_pressed = jump_key_current
 
@@ -1433,14 +2016,15 @@ class Slime:
         else:
             width = int(40 * (1 + (self.form - 1) * 0.4))
             height = int(40 * (1 + (self.form - 1) * 0.4))
-        self.rect = pygame.Rect(self.x, self.y, width, height)
+        self.rect.update(self.x, self.y, width, height)
 
         # プラットフォームとの衝突（飛行中は無視）
         if not self.is_flying:
             # 現在のon_groundの状態を保持（地面の判定で上書きされる可能性があるため）
             current_on_ground = self.on_ground
 
-            for platform in platforms[:]:  # スライスを作成して安全にイテレート
+            # スライムと横方向に重なるプラットフォームだけを調べる（結果はリストなので削除しても安全）
+            for platform in platforms.query(self.rect.left, self.rect.right):
                 if self.rect.colliderect(platform.rect):
                     # トゲプラットフォームかどうかを確認
                     if hasattr(platform, "is_spiked") and platform.is_spiked:
@@ -1451,8 +2035,8 @@ class Slime:
 
                         # スライムがトゲの高さ範囲内に触れた場合
                         if slime_bottom >= platform_top - spike_height and slime_bottom <= platform_top + 5:
-                            print("SPIKE DAMAGE! Game Over!")
-                            spike_damage_sound.play()  # トゲダメージ効果音を再生
+                            event_log.info("game", "SPIKE DAMAGE! Game Over!")
+                            self.sounds.spike_damage.play()  # トゲダメージ効果音を再生
                             return "game_over"  # ゲームオーバーシグナルを返す
 
                         # トゲに触れていない場合は通常の着地判定
@@ -1468,8 +2052,10 @@ class Slime:
                             self.on_ground = True
                             self.can_double_jump = self.double_jump_count > 0
                             if self.double_jump_count > 0:
-                                print(
-                                    f"Spiked platform landing: can_double_jump set to True, count: {self.double_jump_count}"
+                                event_log.debug(
+                                    "slime",
+                                    "Spiked platform landing: can_double_jump set to True, count: %s",
+                                    self.double_jump_count,
                                 )
                             break
                     # 紫フォームでプラットフォームに当たった場合、回転飛行開始
@@ -1491,8 +2077,11 @@ class Slime:
                             flying_platforms_list.append(flying_platform)
                             platforms.remove(platform)  # 元のプラットフォームを削除
 
-                        print(
-                            f"MEGA PURPLE SMASH! Slime bounced at {angle:.1f} degrees! Platform launched at {platform_angle:.1f} degrees!"
+                        event_log.debug(
+                            "slime",
+                            "MEGA PURPLE SMASH! Slime bounced at %.1f degrees! Platform launched at %.1f degrees!",
+                            angle,
+                            platform_angle,
                         )
                         break
                     else:
@@ -1514,7 +2103,11 @@ class Slime:
                             # 地面に着地した時に二段ジャンプをリセット
                             self.can_double_jump = self.double_jump_count > 0
                             if self.double_jump_count > 0:
-                                print(f"Platform landing: can_double_jump set to True, count: {self.double_jump_count}")
+                                event_log.debug(
+                                    "slime",
+                                    "Platform landing: can_double_jump set to True, count: %s",
+                                    self.double_jump_count,
+                                )
                             break  # 一つのプラットフォームに着地したら他は確認しない
 
         # 左の壁
@@ -1527,27 +2120,21 @@ class Slime:
             if self.velocity_y > 0:  # 落下中のみ着地とする
                 self.velocity_y = 0
                 if not self.on_ground:
-                    print("Landed on ground!")
+                    event_log.debug("slime", "Landed on ground!")
                 self.on_ground = True
                 # 地面に着地した時に二段ジャンプをリセット
                 self.can_double_jump = self.double_jump_count > 0
                 if self.double_jump_count > 0:
-                    print(f"Ground landing: can_double_jump set to True, count: {self.double_jump_count}")
+                    event_log.debug(
+                        "slime", "Ground landing: can_double_jump set to True, count: %s", self.double_jump_count
+                    )
 
         # 紫フォームのタイマー更新
         if self.purple_timer > 0:
             self.purple_timer -= 1
             # キラキラパーティクル生成
-            if self.purple_timer % 5 == 0:
-                for _ in range(5):
-                    particle = {
-                        "x": self.x + random.randint(-20, 20),
-                        "y": self.y + random.randint(-20, 20),
-                        "life": 30,
-                        "vx": random.uniform(-2, 2),
-                        "vy": random.uniform(-2, 2),
-                    }
-                    self.sparkle_particles.append(particle)
+            if self.purple_timer % quality.settings["slime_sparkle_interval"] == 0:
+                self.emit_sparkles(5)
 
             if self.purple_timer <= 0:
                 old_height = height
@@ -1563,7 +2150,7 @@ class Slime:
                     self.y = SCREEN_HEIGHT - 20 - new_height
 
                 # rectも即座に更新
-                self.rect = pygame.Rect(self.x, self.y, new_width, new_height)
+                self.rect.update(self.x, self.y, new_width, new_height)
 
         # デフレクトタイマー更新
         if self.deflect_timer > 0:
@@ -1571,18 +2158,25 @@ class Slime:
             if self.deflect_timer <= 0:
                 self.can_deflect = False
 
-        # キラキラパーティクルの更新
-        for particle in self.sparkle_particles[:]:
-            particle["x"] += particle["vx"]
-            particle["y"] += particle["vy"]
-            particle["life"] -= 1
-            if particle["life"] <= 0:
-                self.sparkle_particles.remove(particle)
-
         # 射撃クールダウン
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
 
+    def emit_sparkles(self, count):
+        """紫フォームのキラキラをパーティクルシステムに追加する"""
+        rng = particle_system.rng
+        particle_system.emit(
+            self.x + rng.integers(-20, 21, count),
+            self.y + rng.integers(-20, 21, count),
+            rng.uniform(-2, 2, count),
+            rng.uniform(-2, 2, count),
+            life=30,
+            max_life=30,
+            size=3,
+            color=(255, 0, 255),
+            flags=SHRINK,
+        )
+
     def deflect_bullet(self, bullet):
         """弾をランダムな方向にはじき返す"""
         if not self.can_deflect:
@@ -1594,7 +2188,7 @@ class Slime:
         # はじき返された弾を作成
         deflected = DeflectedBullet(bullet.x, bullet.y, deflect_angle)
 
-        print("Bullet deflected!")
+        event_log.debug("bullet", "Bullet deflected!")
         return deflected
 
     def take_damage(self):
@@ -1622,7 +2216,7 @@ class Slime:
                 self.y = SCREEN_HEIGHT - 20 - new_height
 
             # rectも即座に更新
-            self.rect = pygame.Rect(self.x, self.y, new_width, new_height)
+            self.rect.update(self.x, self.y, new_width, new_height)
             return False
         elif self.form > 1:
             # サイズを小さくする（色は維持）
@@ -1633,8 +2227,8 @@ class Slime:
             return True
 
     def reset(self):
-        self.x = 100
-        self.y = SCREEN_HEIGHT - 100
+        self.x = self.previous_x = 100
+        self.y = self.previous_y = SCREEN_HEIGHT - 100
         self.velocity_x = 0
         self.velocity_y = 0
         self.on_ground = False
@@ -1643,7 +2237,6 @@ class Slime:
         self.invincible_timer = 0
         self.purple_timer = 0
         self.purple_invincible = False
-        self.sparkle_particles = []
         self.can_deflect = False
         self.deflect_timer = 0
         self.direction = 1
@@ -1654,7 +2247,7 @@ class Slime:
         self.jump_key_pressed = False
         width = int(40 * (1 + (self.form - 1) * 0.4))
         height = int(40 * (1 + (self.form - 1) * 0.4))
-        self.rect = pygame.Rect(self.x, self.y, width, height)
+        self.rect.update(self.x, self.y, width, height)
 
     def shoot(self, up_direction=False):
         if self.shoot_cooldown > 0:
@@ -1678,15 +2271,19 @@ class Slime:
             # 上方向の弾
             bullet_x = self.x + self.rect.width // 2
             bullet_y = self.y
-            projectile = Projectile(bullet_x, bullet_y, 0, self.form, is_big)  # 上方向（direction=0で上向きを示す）
+            projectile = projectile_pool.acquire(
+                bullet_x, bullet_y, 0, self.form, is_big, self.sounds
+            )  # 上方向（direction=0で上向きを示す）
             # 上方向の弾は上向きに設定
             projectile.velocity_x = 0
             projectile.velocity_y = -projectile.speed
-            print("Shooting upward!")
+            event_log.debug("slime", "Shooting upward!")
         else:
             # 通常の左右方向の弾
             bullet_x = self.x + (self.rect.width if self.direction > 0 else 0)
-            projectile = Projectile(bullet_x, self.y + self.rect.height // 2, self.direction, self.form, is_big)
+            projectile = projectile_pool.acquire(
+                bullet_x, self.y + self.rect.height // 2, self.direction, self.form, is_big, self.sounds
+            )
 
         # 青色状態の場合、弾の色を青色に変更
         if self.can_deflect:
@@ -1697,178 +2294,59 @@ class Slime:
     def draw(self, screen, camera):
         screen_x = self.x - camera.x
         screen_y = self.y
+        width = slime_size(self.form)
+        height = width
 
-        # 元のサイズ計算システムに戻す
-        width = int(40 * (1 + (self.form - 1) * 0.4))
-        height = int(40 * (1 + (self.form - 1) * 0.4))
-
-        # 紫フォームは超巨大に
-        if self.form == 4:
-            width = int(40 * 8.0)  # さらに巨大化
-            height = int(40 * 8.0)
+        center_x = int(screen_x + width // 2)
+        center_y = int(screen_y + height // 2)
+        drawn = []
 
-        # 飛行中の回転エフェクト
+        # 飛行中の回転エフェクト（リングごとに回転方向へずらして描く）
         if self.is_flying and self.form == 4:
             # 回転中は少し光らせる
-            pulse_intensity = (math.sin(time.time() * 20) + 1) / 2
-            glow_size = width * (1.8 + pulse_intensity * 0.8)
-
-            for i in range(8):
-                ring_size = glow_size * (1 + i * 0.1)
-                alpha_factor = (8 - i) / 8
-                ring_color = (int(255 * alpha_factor), int(100 * alpha_factor), int(255 * alpha_factor))
-                # 回転角度を適用して描画位置をずらす
+            bucket = pulse_bucket((math.sin(frame_clock.now() * 20) + 1) / 2)
+            for i in range(glow_ring_count(8)):
+                ring = slime_sprites.get(("flying_ring", i, bucket))
                 offset_x = math.cos(math.radians(self.rotation_angle + i * 45)) * 10
                 offset_y = math.sin(math.radians(self.rotation_angle + i * 45)) * 10
-                pygame.draw.circle(
-                    screen,
-                    ring_color,
-                    (int(screen_x + width // 2 + offset_x), int(screen_y + height // 2 + offset_y)),
-                    int(ring_size // 2),
-                    4,
+                ring_center_x = int(screen_x + width // 2 + offset_x)
+                ring_center_y = int(screen_y + height // 2 + offset_y)
+                drawn.append(
+                    screen.blit(ring, (ring_center_x - ring.get_width() // 2, ring_center_y - ring.get_height() // 2))
                 )
 
-        # 色を決定
-        if self.form == 4:  # 紫フォーム
-            color = (128, 0, 128)
-            eye_color = (255, 255, 0)
-        elif self.form >= 3 and self.has_been_red:  # 3つ以上食べた場合のみ赤
-            color = RED
-            eye_color = YELLOW
-        elif self.can_deflect:  # 青りんご効果（第三形態）
-            color = BLUE
-            eye_color = YELLOW
-        else:
-            color = GREEN
-            eye_color = WHITE
-
-        center_x = screen_x + width // 2
-        center_y = screen_y + height // 2
-
         # 紫フォームの光エフェクト
         if self.form == 4:
-            pulse_intensity = (math.sin(time.time() * 10) + 1) / 2
-            glow_size = width * (1.5 + pulse_intensity * 0.5)
-
-            for i in range(5):
-                ring_size = glow_size * (1 + i * 0.15)
-                alpha_factor = (5 - i) / 5
-                ring_color = (int(255 * alpha_factor), int(0 * alpha_factor), int(255 * alpha_factor))
-                pygame.draw.circle(screen, ring_color, (int(center_x), int(center_y)), int(ring_size // 2), 3)
+            bucket = pulse_bucket((math.sin(frame_clock.now() * 10) + 1) / 2)
+            glow = slime_sprites.get(("purple_glow", bucket, glow_ring_count(5)))
+            drawn.append(screen.blit(glow, (center_x - glow.get_width() // 2, center_y - glow.get_height() // 2)))
 
         # 第三形態の青い光エフェクト
         elif self.can_deflect:
-            pulse_intensity = (math.sin(time.time() * 8) + 1) / 2
-            glow_size = width * (1.2 + pulse_intensity * 0.3)
-
-            for i in range(3):
-                ring_size = glow_size * (1 + i * 0.1)
-                alpha_factor = (3 - i) / 3
-                ring_color = (int(100 * alpha_factor), int(150 * alpha_factor), int(255 * alpha_factor))
-                pygame.draw.circle(screen, ring_color, (int(center_x), int(center_y)), int(ring_size // 2), 2)
-
-        # スライムの本体（元の楕円形に戻す）
-        base_width = width * 0.9
-        base_height = height * 0.9
-        base_rect = pygame.Rect(center_x - base_width // 2, center_y - base_height // 2, base_width, base_height)
-        pygame.draw.ellipse(screen, color, base_rect)
-
-        # 下部のつぶれた部分
-        bottom_width = base_width * 1.1
-        bottom_height = base_height * 0.3
-        bottom_rect = pygame.Rect(
-            center_x - bottom_width // 2, center_y + base_height // 4, bottom_width, bottom_height
-        )
-        pygame.draw.ellipse(screen, color, bottom_rect)
-
-        # バブル（3つ）- 元のスタイルに戻す
-        bubble_flip = self.direction
-        bubbles = [
-            (center_x - base_width * 0.2 * bubble_flip, center_y - base_height * 0.1, base_width * 0.15),
-            (center_x + base_width * 0.15 * bubble_flip, center_y - base_height * 0.25, base_width * 0.12),
-            (center_x + base_width * 0.05 * bubble_flip, center_y + base_height * 0.15, base_width * 0.1),
-        ]
-
-        for bubble_x, bubble_y, bubble_size in bubbles:
-            pygame.draw.circle(screen, WHITE, (int(bubble_x), int(bubble_y)), int(bubble_size))
-            pygame.draw.circle(
-                screen,
-                WHITE,
-                (int(bubble_x - bubble_size * 0.3 * bubble_flip), int(bubble_y - bubble_size * 0.3)),
-                int(bubble_size * 0.4),
-            )
+            bucket = pulse_bucket((math.sin(frame_clock.now() * 8) + 1) / 2)
+            glow = slime_sprites.get(("deflect_glow", self.form, bucket, glow_ring_count(3)))
+            drawn.append(screen.blit(glow, (center_x - glow.get_width() // 2, center_y - glow.get_height() // 2)))
 
-        # 目
-        eye_offset = base_width // 6
-        if self.direction == 1:
-            left_eye_x = center_x - eye_offset
-            right_eye_x = center_x + eye_offset
-        else:
-            left_eye_x = center_x + eye_offset
-            right_eye_x = center_x - eye_offset
-
-        eye_y = center_y - base_height // 8
-        eye_radius = max(3, int(base_width // 10))
-
-        pygame.draw.circle(screen, eye_color, (int(left_eye_x), int(eye_y)), eye_radius)
-        pygame.draw.circle(screen, eye_color, (int(right_eye_x), int(eye_y)), eye_radius)
-
-        # 瞳
-        pupil_radius = max(1, eye_radius // 2)
-        pygame.draw.circle(screen, (0, 0, 0), (int(left_eye_x), int(eye_y)), pupil_radius)
-        pygame.draw.circle(screen, (0, 0, 0), (int(right_eye_x), int(eye_y)), pupil_radius)
-
-        # 紫フォームのキラキラパーティクル
-        if self.form == 4:
-            for particle in self.sparkle_particles:
-                alpha = min(255, particle["life"] * 8)
-                size = max(1, particle["life"] // 10)
-                sparkle_color = (255, 0, 255)
-                particle_x = particle["x"] - camera.x
-                particle_y = particle["y"]
-                if 0 <= particle_x < SCREEN_WIDTH and 0 <= particle_y < SCREEN_HEIGHT:
-                    pygame.draw.circle(screen, sparkle_color, (int(particle_x), int(particle_y)), size)
+        # スライムの本体
+        body = slime_sprites.get(("body", self.form, self.has_been_red, self.can_deflect, self.direction))
+        dirty = screen.blit(body, (int(screen_x) - SLIME_SPRITE_PADDING, int(screen_y) - SLIME_SPRITE_PADDING))
+        return dirty.unionall(drawn)
 
 
 class AppleGenerator:
     def __init__(self):
         self.apples = []
-        self.last_apple_x = 0
-        self.apple_spacing = 200
-
-    def generate_apples(self, camera_x):
-        # カメラの右端から少し先まで生成
-        target_x = camera_x + SCREEN_WIDTH + 500
-
-        while self.last_apple_x < target_x:
-            # プラットフォームの上にりんごを配置
-            platform_y = random.randint(200, 450)
-            apple_x = self.last_apple_x + random.randint(150, 300)
-            apple_y = platform_y - 50
-
-            # りんごの種類を決定
-            rand = random.random()
-            if rand < 0.02:  # 2%の確率で紫りんご
-                apple_type = "purple"
-            elif rand < 0.07:  # 5%の確率で緑りんご
-                apple_type = "green"
-            elif rand < 0.17:  # 10%の確率で茶色りんご
-                apple_type = "brown"
-            elif rand < 0.42:  # 25%の確率で青りんご
-                apple_type = "blue"
-            else:  # 残り58%で赤りんご
-                apple_type = "red"
-
-            apple = Apple(apple_x, apple_y, apple_type)
-            self.apples.append(apple)
-            self.last_apple_x = apple_x
-
-    def update(self, camera_x):
-        self.generate_apples(camera_x)
-
-        # 画面外の古いりんごを削除
-        self.apples = [apple for apple in self.apples if apple.x > camera_x - 200]
 
+    def load_chunk(self, chunk):
+        """チャンクのりんごを作る"""
+        for x, y, apple_type in chunk.apples:
+            self.apples.append(Apple(x, y, apple_type))
+
+    def release_before(self, x):
+        """x以左のりんごを取り除く（チャンクを手放したとき）"""
+        compact(self.apples, lambda apple: apple.x > x)
+
+    def update(self):
         # りんごを更新
         for apple in self.apples:
             apple.update()
@@ -1879,29 +2357,33 @@ class AppleGenerator:
 
     def reset(self):
         self.apples = []
-        self.last_apple_x = 0
-
-    def generate_apple(self, x):
-        """新しいりんごを生成"""
-        apple_type = "red"
-        rand = random.random()
-        if rand < 0.02:  # 2%の確率で紫りんご
-            apple_type = "purple"
-        elif rand < 0.07:  # 5%の確率で緑りんご
-            apple_type = "green"
-        elif rand < 0.17:  # 10%の確率で茶色りんご
-            apple_type = "brown"
-        elif rand < 0.42:  # 25%の確率で青りんご
-            apple_type = "blue"
-
-        y = random.randint(150, 400)
-        return Apple(x, y, apple_type)
 
 
 class DeflectedBullet:
+    __slots__ = (
+        "x",
+        "y",
+        "previous_x",
+        "previous_y",
+        "radius",
+        "speed",
+        "vx",
+        "vy",
+        "active",
+        "color",
+        "rect",
+        "creation_time",
+        "lifetime",
+    )
+
     def __init__(self, x, y, velocity_x, velocity_y):
-        self.x = x
-        self.y = y
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, velocity_x, velocity_y)
+
+    def reset(self, x, y, velocity_x, velocity_y):
+        """状態を初期化する（プールから取り出したときにも使う）"""
+        self.x = self.previous_x = x
+        self.y = self.previous_y = y
         self.radius = 8
         self.speed = 12
         # 速度を反転してランダムな角度で跳ね返す
@@ -1910,12 +2392,12 @@ class DeflectedBullet:
         self.vy = math.sin(math.radians(angle)) * self.speed
         self.active = True
         self.color = (255, 100, 255)  # ピンク色（はじき返された弾）
-        self.rect = pygame.Rect(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
-        self.creation_time = time.time()
+        self.rect.update(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+        self.creation_time = frame_clock.now()
         self.lifetime = 3.0  # 3秒で消える
 
     def update(self):
-        if time.time() - self.creation_time > self.lifetime:
+        if frame_clock.now() - self.creation_time > self.lifetime:
             self.active = False
             return
 
@@ -1935,11 +2417,45 @@ class DeflectedBullet:
 
                 # 回転するキラキラエフェクト
                 for i in range(4):
-                    sparkle_angle = (time.time() * 10 + i * 1.57) % (2 * math.pi)
+                    sparkle_angle = (frame_clock.now() * 10 + i * 1.57) % (2 * math.pi)
                     sparkle_x = screen_x + math.cos(sparkle_angle) * (self.radius + 3)
                     sparkle_y = screen_y + math.sin(sparkle_angle) * (self.radius + 3)
                     pygame.draw.circle(screen, (255, 200, 255), (int(sparkle_x), int(sparkle_y)), 2)
 
+                # 描画した範囲（キラキラまで）
+                reach = self.radius + 6
+                return scratch_rects.get(int(screen_x) - reach, int(screen_y) - reach, reach * 2, reach * 2)
+
+
+# はじき返された弾を使い回すプール
+deflected_bullet_pool = EntityPool(DeflectedBullet)
+
+
+def render_text_sprite(key):
+    """文字列のスプライトを描画する（keyは (文字列, フォント, 色)）"""
+    text, font, color = key
+    return to_display_format(font.render(text, True, color))
+
+
+# HUDなどの文字列のスプライト（表示内容が変わった時だけ描画し、LRUで破棄）
+text_sprites = SpriteCache(render_text_sprite, max_entries=64)
+
+
+def render_text(font, text, color):
+    """文字列を描画したSurfaceを返す（同じ文字列・フォント・色なら前回のものを使い回す）"""
+    return text_sprites.get((text, font, color))
+
+
+def render_overlay_sprite(color):
+    """画面全体を覆う単色のSurface（透明度は使う側がset_alphaで設定する）"""
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    overlay.fill(color)
+    return to_display_format(overlay, alpha=False)
+
+
+# フラッシュやゲームオーバーの半透明オーバーレイ（色ごとに1枚を使い回す）
+overlay_sprites = SpriteCache(render_overlay_sprite)
+
 
 # 画面フラッシュエフェクトクラス
 class ScreenFlash:
@@ -1962,8 +2478,7 @@ class ScreenFlash:
 
     def draw(self, screen):
         if self.timer > 0:
-            flash_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surface.fill(WHITE)
+            flash_surface = overlay_sprites.get(WHITE)
             flash_surface.set_alpha(self.alpha)
             screen.blit(flash_surface, (0, 0))
 
@@ -1990,26 +2505,26 @@ class GameOverScreen:
     def draw(self, screen, font):
         if self.active:
             # 背景を半透明にする
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            overlay = overlay_sprites.get(BLACK)
             overlay.set_alpha(128)
-            overlay.fill((0, 0, 0))
             screen.blit(overlay, (0, 0))
 
             # GAME OVERテキストを中央に表示
-            text = font.render("GAME OVER", True, RED)
+            text = render_text(font, "GAME OVER", RED)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             screen.blit(text, text_rect)
 
 
-def draw_score(screen, score):
-    score_text = font.render(f"スコア: {score}", True, WHITE)
+def draw_score(screen, font, score):
+    score_text = render_text(font, f"スコア: {score}", WHITE)
     screen.blit(score_text, (10, 10))
 
 
-def draw_ui(screen, score, slime):
+def draw_ui(screen, font, score, slime):
+    """スコアなどのUIを描画し、描画した範囲のRectを返す"""
     # スコア表示
-    score_text = font.render(f"スコア: {score}", True, WHITE)
-    screen.blit(score_text, (10, 10))
+    score_text = render_text(font, f"スコア: {score}", WHITE)
+    dirty = screen.blit(score_text, (10, 10))
 
     # 二段ジャンプ情報表示
     if slime.double_jump_count > 0:
@@ -2017,9 +2532,9 @@ def draw_ui(screen, score, slime):
         score_width = score_text.get_width()
 
         # 「二段ジャンプ」テキスト
-        jump_text = font.render("二段ジャンプ", True, WHITE)
+        jump_text = render_text(font, "二段ジャンプ", WHITE)
         jump_x = 10 + score_width + 20  # スコアから20ピクセル離す
-        screen.blit(jump_text, (jump_x, 10))
+        dirty.union_ip(screen.blit(jump_text, (jump_x, 10)))
 
         # 茶色りんごアイコン（小さくて取れないもの）
         jump_text_width = jump_text.get_width()
@@ -2028,8 +2543,10 @@ def draw_ui(screen, score, slime):
         apple_size = 15  # 小さなサイズ
 
         # 茶色りんごを描画
-        pygame.draw.circle(screen, BROWN, (apple_x + apple_size // 2, apple_y + apple_size // 2), apple_size // 2)
-        # ハイライト
+        dirty.union_ip(
+            pygame.draw.circle(screen, BROWN, (apple_x + apple_size // 2, apple_y + apple_size // 2), apple_size // 2)
+        )
+        # ハイライト（本体の円の内側なので範囲は本体の分で足りる）
         highlight_color = tuple(min(255, c + 50) for c in BROWN)
         pygame.draw.circle(
             screen, highlight_color, (apple_x + apple_size // 2 - 2, apple_y + apple_size // 2 - 2), apple_size // 4
@@ -2041,475 +2558,813 @@ def draw_ui(screen, score, slime):
             (apple_x + apple_size // 2 + 3, apple_y + 2),
             (apple_x + apple_size // 2 + 1, apple_y + 3),
         ]
-        pygame.draw.polygon(screen, (0, 150, 0), leaf_points)
+        dirty.union_ip(pygame.draw.polygon(screen, (0, 150, 0), leaf_points))
 
         # 残り回数をりんごの右に表示
-        count_text = font.render(f"×{slime.double_jump_count}", True, WHITE)
+        count_text = render_text(font, f"×{slime.double_jump_count}", WHITE)
         count_x = apple_x + apple_size + 5
-        screen.blit(count_text, (count_x, 10))
+        dirty.union_ip(screen.blit(count_text, (count_x, 10)))
 
     # 紫状態のタイマー表示
     if slime.form == 4 and slime.purple_timer > 0:
         # 残り時間を秒単位で計算（小数点第1位まで）
         remaining_seconds = slime.purple_timer / 60.0
-        purple_text = font.render(f"紫状態: {remaining_seconds:.1f}秒", True, (255, 100, 255))
-        screen.blit(purple_text, (10, 50))  # スコアの下に表示
+        purple_text = render_text(font, f"紫状態: {remaining_seconds:.1f}秒", (255, 100, 255))
+        dirty.union_ip(screen.blit(purple_text, (10, 50)))  # スコアの下に表示
+
+    return dirty
+
+
+def draw_quality(screen, font):
+    """画質レベルを右上に表示し、描画した範囲のRectを返す"""
+    label = f"画質: {QUALITY_LABELS[quality.name]}"
+    if quality.mode == "auto":
+        label += f"（{QUALITY_LABELS['auto']}）"
+    quality_text = render_text(font, label, (180, 180, 180))
+    return screen.blit(quality_text, (SCREEN_WIDTH - quality_text.get_width() - 10, 10))
+
+
+class DestroyQueue:
+    """1フレーム分のエイリアンの撃破と大爆発をためておき、フレームの最後にまとめて処理するキュー
+
+    衝突判定ではkill()/explode()で積むだけにして、drain()で次のようにまとめて処理する:
+    - 近い位置（merge_distance以内）の爆発は1つにまとめ、1フレームの爆発はmax_explosions個まで
+    - 撃破・爆発の効果音は1フレームに1回だけ鳴らす
+    - 赤いエイリアンの分裂先（画面の角）の座標は1回だけ求める
+    緑りんごで画面中のエイリアンを一度に倒すフレームでも、処理する量に上限ができる。
+    """
+
+    def __init__(self, max_explosions=8, merge_distance=24):
+        self.max_explosions = max_explosions
+        self.merge_distance = merge_distance
+        self.kills = []  # (エイリアン, 倒した原因)
+        self.explosions = []  # 爆発の位置 (x, y)
+
+        # 計測用の累計
+        self.merged_explosions = 0
+        self.dropped_explosions = 0
+
+    def kill(self, alien, cause, *explosion_points):
+        """エイリアンを倒し、エイリアンの中心とexplosion_pointsの位置で爆発させる
+
+        エイリアンはその場で倒れた状態になる（同じフレームで二重に倒されない）。
+        すでに倒されていた場合は何もせずFalseを返す。
+        """
+        if not alien.destroy(play_sound=False):
+            return False
+        self.kills.append((alien, cause))
+        self.explode(alien.x + alien.width // 2, alien.y + alien.height // 2)
+        for x, y in explosion_points:
+            self.explode(x, y)
+        return True
+
+    def explode(self, x, y):
+        """大爆発を起こす"""
+        self.explosions.append((x, y))
+
+    def clear(self):
+        self.kills.clear()
+        self.explosions.clear()
+
+    def drain(self, game):
+        """ためた撃破と爆発を処理する（1フレームに1回）"""
+        if not self.kills and not self.explosions:
+            return
+
+        # 大爆発（近いものはまとめ、上限を超えた分は起こさない）
+        merge_distance = self.merge_distance
+        placed = []
+        for x, y in self.explosions:
+            if any(abs(x - px) < merge_distance and abs(y - py) < merge_distance for px, py in placed):
+                self.merged_explosions += 1
+            elif len(placed) >= self.max_explosions:
+                self.dropped_explosions += 1
+            else:
+                placed.append((x, y))
+                game.big_explosions.append(big_explosion_pool.acquire(x, y, play_sound=False))
+        game.sounds.alien_destroy.play()
+
+        # スコアと赤いエイリアンの分裂
+        corners = None
+        for alien, cause in self.kills:
+            game.game_state.add_score()
+            split_corners = alien.split_corners()
+            if not split_corners:
+                continue
+            if corners is None:
+                camera_x = game.camera.x
+                corners = {
+                    "right": camera_x + SCREEN_WIDTH - 100,
+                    "left": camera_x + 100,
+                    "top": 50,
+                    "bottom": SCREEN_HEIGHT - 150,
+                }
+            event_log.info("alien", "Red alien destroyed by %s! Spawning %s aliens", cause, len(split_corners))
+            for corner_x, corner_y in split_corners:
+                game.alien_generator.add_alien(corners[corner_x], corners[corner_y], "spawned")
+
+        if len(self.explosions) > len(placed):
+            event_log.debug(
+                "alien", "%s explosions requested, %s created this frame", len(self.explosions), len(placed)
+            )
+        self.clear()
+
+
+def pool_stats():
+    """弾・爆発のプールごとの使い回しの統計を返す（デバッグ・計測用）"""
+    return {
+        "projectiles": projectile_pool.stats(),
+        "explosions": explosion_pool.stats(),
+        "big_explosions": big_explosion_pool.stats(),
+        "alien_bullets": alien_bullet_pool.stats(),
+        "deflected_bullets": deflected_bullet_pool.stats(),
+    }
+
+
+def _is_active(entity):
+    return entity.active
+
+
+def _is_alive(alien):
+    return alien.alive
+
+
+def _is_not_consumed(apple):
+    return not apple.consumed
+
+
+def _ignore_rect(rect):
+    """dirty rectを使わない場合のmarkの代わり"""
 
 
 # ゲームのメインループ
-async def main():
-    clock = pygame.time.Clock()
-    frame_count = 0
+class Game:
+    """ゲーム全体の状態と1フレーム分の処理をまとめたクラス
 
-    # ゲーム状態の管理
-    game_state = GameState()
+    begin_frame() がTrueを返したフレームでは update() → handle_collisions() → draw() の順に呼ぶ。
+    ウィンドウで遊ぶ main() と、ヘッドレスで計測する benchmark.py の両方から使う。
+    """
 
-    # カメラとプラットフォーム生成器
-    camera = Camera()
-    platform_generator = PlatformGenerator()
-    alien_generator = AlienGenerator()
+    def __init__(self, runtime=None):
+        # 画面・フォント・効果音（runtimeを省略した場合は音を鳴らさず、描画もできない）
+        self.runtime = runtime
+        self.sounds = runtime.sounds if runtime is not None else SILENT_SOUNDS
 
-    # スライムのインスタンスを作成
-    slime = Slime(100, SCREEN_HEIGHT - 100)
+        # ゲーム状態の管理
+        self.game_state = GameState()
 
-    # 弾のリスト
-    projectiles = []
-    alien_bullets = []
-    deflected_bullets = []  # はじき返された弾
+        # カメラとワールドのチャンク（ワールドのシードは全体の乱数から決める）
+        self.camera = Camera()
+        self.world = ChunkStream(plan_chunk, CHUNK_WIDTH, random.getrandbits(32))
+        self.platform_generator = PlatformGenerator()
+        self.alien_generator = AlienGenerator(self.sounds)
 
-    # 大爆発エフェクトのリスト
-    big_explosions = []
+        # スライムのインスタンスを作成
+        self.slime = Slime(100, SCREEN_HEIGHT - 100, self.sounds)
 
-    # 飛んでいくプラットフォームのリスト
-    flying_platforms = []
+        # 弾のリスト
+        self.projectiles = []
+        self.alien_bullets = BulletStore(
+            SCREEN_WIDTH, SCREEN_HEIGHT, pool=alien_bullet_pool
+        )  # 画面外・寿命切れの弾は自動で削除
+        self.deflected_bullets = []  # はじき返された弾
 
-    # りんごの生成器
-    apple_generator = AppleGenerator()
+        # 大爆発エフェクトのリスト
+        self.big_explosions = []
 
-    # 画面フラッシュエフェクト
-    screen_flash = ScreenFlash()
+        # 衝突判定で倒したエイリアンと大爆発（フレームの最後にまとめて処理する）
+        self.destroy_queue = DestroyQueue()
 
-    # ゲームオーバー画面
-    game_over_screen = GameOverScreen()
+        # 飛んでいくプラットフォームのリスト
+        self.flying_platforms = []
 
-    print("Game started! Left/Right arrows to move, UP arrow to jump, SPACE to shoot")
+        # りんごの生成器
+        self.apple_generator = AppleGenerator()
 
-    # BGMを開始（ループ再生）
-    bgm_channel = pygame.mixer.Channel(0)
-    bgm_channel.play(bgm, loops=-1)  # 無限ループ
-    print(f"BGM started - volume: {bgm.get_volume()}")
+        # 1フレームの処理の順番を守らせ、フェーズごとの処理時間を測る
+        self.scheduler = FrameScheduler()
 
-    while True:
-        try:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        pygame.quit()
-                        sys.exit()
+        # 最初に見えている範囲のチャンクを読み込む
+        self.load_chunks()
 
-            # ゲームオーバー状態の確認
-            if game_state.should_reset():
-                # ゲームリセット
-                game_state.reset()
-                camera.reset()
-                platform_generator.reset()
-                alien_generator.reset()
-                slime.reset()
-                projectiles = []
-                alien_bullets = []
-                deflected_bullets = []
-                big_explosions = []
-                flying_platforms = []  # 飛んでいくプラットフォームもリセット
-                apple_generator.reset()
-                screen_flash = ScreenFlash()  # フラッシュをリセット
-                game_over_screen = GameOverScreen()
-
-            if not game_state.game_over:
-                keys = pygame.key.get_pressed()
+        # 画面フラッシュエフェクト
+        self.screen_flash = ScreenFlash()
 
-                # スライムの移動とアップデート
-                result = slime.update(platform_generator.platforms, flying_platforms)
-                if result == "game_over":
-                    print("SPIKE DAMAGE! Game Over triggered!")
-                    big_explosions.append(
-                        BigExplosion(slime.x + slime.rect.width // 2, slime.y + slime.rect.height // 2)
-                    )
-                    game_state.trigger_game_over()
-                    game_over_screen.activate()
-
-                # カメラの更新
-                camera.update(slime.x)
-
-                # プラットフォームの生成と削除
-                platform_generator.update(camera.x)
-
-                # エイリアンの生成と削除
-                alien_generator.update(camera.x)
-
-                # エイリアンの更新
-                for alien in alien_generator.aliens:
-                    alien.update()
-
-                # りんごの更新
-                apple_generator.update(camera.x)
-                for apple in apple_generator.apples:
-                    apple.update()
-
-                # 飛んでいくプラットフォームの更新
-                for flying_platform in flying_platforms[:]:
-                    flying_platform.update()
-                    if not flying_platform.active:
-                        flying_platforms.remove(flying_platform)
-
-                # エイリアンの攻撃
-                if alien_generator.should_attack():
-                    bullets_created = 0
-                    for alien in alien_generator.get_active_aliens():
-                        bullets = alien.shoot(slime.x, slime.y)  # スライムの位置を渡す
-                        if bullets:
-                            for bullet in bullets:
-                                alien_bullets.append(bullet)
-                                bullets_created += 1
-
-                # スライムの弾の発射
-                if keys[pygame.K_SPACE] and slime.shoot_cooldown <= 0:
-                    # 上矢印キー+スペースキーで上方向射撃
-                    if keys[pygame.K_UP]:
-                        projectile = slime.shoot(up_direction=True)
+        # ゲームオーバー画面
+        self.game_over_screen = GameOverScreen()
+
+        # エイリアンのスプライトを事前に描画しておく（飛んでいくプラットフォームのフレームは使うときに描画する）
+        alien_sprites.prebuild(ALIEN_TYPES)
+
+    def reset(self):
+        """ゲームを最初の状態に戻す
+
+        やり直すたびに別のワールドにする（シードは全体の乱数から決めるので、記録したプレイの再生でも同じになる）。
+        """
+        self.game_state.reset()
+        self.camera.reset()
+        self.world.reset(random.getrandbits(32))
+        self.platform_generator.reset()
+        self.alien_generator.reset()
+        self.slime.reset()
+        # 残っている弾と爆発はプールに戻す
+        for projectile in self.projectiles:
+            projectile.release()
+        for deflected in self.deflected_bullets:
+            deflected_bullet_pool.release(deflected)
+        for big_explosion in self.big_explosions:
+            big_explosion_pool.release(big_explosion)
+        self.projectiles = []
+        self.alien_bullets.clear()
+        self.deflected_bullets = []
+        self.big_explosions = []
+        self.destroy_queue.clear()
+        self.flying_platforms = []  # 飛んでいくプラットフォームもリセット
+        self.apple_generator.reset()
+        self.screen_flash = ScreenFlash()  # フラッシュをリセット
+        self.game_over_screen = GameOverScreen()
+        particle_system.clear()
+        self.load_chunks()
+
+    def load_chunks(self):
+        """カメラの先のチャンクを読み込み、中のプラットフォーム・エイリアン・りんごを作る"""
+        for chunk in self.world.activate(self.camera.x + SCREEN_WIDTH + 200):
+            self.platform_generator.load_chunk(chunk)
+            self.alien_generator.load_chunk(chunk)
+            self.apple_generator.load_chunk(chunk)
+
+    def release_chunks(self):
+        """通り過ぎたチャンクを手放し、その範囲の物をまとめて取り除く"""
+        released = self.world.release(self.camera.x - 200)
+        if released is not None:
+            self.platform_generator.release_before(released)
+            self.alien_generator.release_before(released)
+            self.apple_generator.release_before(released)
+
+    def begin_frame(self):
+        """フレームの先頭処理。このフレームのゲームを進める場合はTrueを返す"""
+        frame_clock.tick()
+        self.scheduler.begin_frame()
+
+        # ゲームオーバー状態の確認
+        if self.game_state.should_reset():
+            # ゲームリセット
+            self.reset()
+        return not self.game_state.game_over
+
+    def trigger_game_over(self):
+        """スライムの位置で大爆発させてゲームオーバーにする"""
+        slime = self.slime
+        self.big_explosions.append(
+            big_explosion_pool.acquire(
+                slime.x + slime.rect.width // 2, slime.y + slime.rect.height // 2, sounds=self.sounds
+            )
+        )
+        self.game_state.trigger_game_over()
+        self.game_over_screen.activate()
+
+    def update(self, keys):
+        """入力・生成・移動のフェーズを実行する"""
+        self.remember_positions()
+        scheduler = self.scheduler
+        with scheduler.phase("input"):
+            self.handle_input(keys)
+        with scheduler.phase("spawn"):
+            self.spawn()
+        with scheduler.phase("simulate"):
+            self.simulate()
+
+    def handle_collisions(self):
+        """衝突判定と、消えた物・画面外に出た物を取り除くフェーズを実行する"""
+        scheduler = self.scheduler
+        with scheduler.phase("collide"):
+            self.collide()
+        with scheduler.phase("cull"):
+            self.cull()
+
+    def draw(self, screen, dirty_rects=None, alpha=1.0):
+        """画面を描画する
+
+        alphaは前回のtickから次のtickまでの進み具合（0〜1）で、カメラと動く物の位置を前回のtickとの間で補間する。
+        カメラだけを補間するとスクロールする背景に対してスライムや弾がずれて見えるので、全部を同じだけ補間する。
+        dirty_rectsを渡した場合は、描画した物の範囲をそこに登録する（present()で変わった部分だけ表示する）。
+        """
+        with self.scheduler.phase("render"):
+            if alpha >= 1.0:
+                self.render(screen, dirty_rects)
+            else:
+                with self.interpolated_positions(alpha):
+                    self.render(screen, dirty_rects, self.camera.interpolated(alpha), alpha)
+
+    def moving_entities(self):
+        """描画を補間する動く物（スライム・エイリアン・弾・飛んでいくプラットフォーム）"""
+        yield self.slime
+        yield from self.alien_generator.aliens
+        yield from self.projectiles
+        yield from self.alien_bullets
+        yield from self.deflected_bullets
+        yield from self.flying_platforms
+
+    def remember_positions(self):
+        """tickを進める前のカメラと動く物の位置を覚えておく（描画の補間用）"""
+        self.camera.previous_x = self.camera.x
+        for entity in self.moving_entities():
+            entity.previous_x = entity.x
+            entity.previous_y = entity.y
+
+    @contextlib.contextmanager
+    def interpolated_positions(self, alpha):
+        """描画する間だけ、動く物を前回のtickとの間の位置に動かす（抜けるときに元の位置に戻す）"""
+        moved = []
+        for entity in self.moving_entities():
+            x = entity.x
+            y = entity.y
+            moved.append((entity, x, y))
+            entity.x = entity.previous_x + (x - entity.previous_x) * alpha
+            entity.y = entity.previous_y + (y - entity.previous_y) * alpha
+        try:
+            yield
+        finally:
+            for entity, x, y in moved:
+                entity.x = x
+                entity.y = y
+
+    def handle_input(self, keys):
+        """スライムを操作して動かし、弾を撃ち、カメラを追従させる"""
+        slime = self.slime
+
+        # スライムの移動とアップデート
+        result = slime.update(self.platform_generator.platforms, self.flying_platforms, keys)
+        if result == "game_over":
+            event_log.info("game", "SPIKE DAMAGE! Game Over triggered!")
+            self.trigger_game_over()
+
+        # スライムの弾の発射
+        if keys[pygame.K_SPACE] and slime.shoot_cooldown <= 0:
+            # 上矢印キー+スペースキーで上方向射撃
+            if keys[pygame.K_UP]:
+                projectile = slime.shoot(up_direction=True)
+            else:
+                projectile = slime.shoot()
+            if projectile:
+                self.projectiles.append(projectile)
+
+        # カメラの更新
+        self.camera.update(slime.x)
+
+    def spawn(self):
+        """カメラの先のチャンクを読み込み、エイリアンに攻撃させる"""
+        self.load_chunks()
+
+        # エイリアンの攻撃
+        alien_generator = self.alien_generator
+        if alien_generator.should_attack():
+            slime = self.slime
+            for alien in alien_generator.get_active_aliens():
+                bullets = alien.shoot(slime.x, slime.y)  # スライムの位置を渡す
+                if bullets:
+                    for bullet in bullets:
+                        self.alien_bullets.add(bullet)
+
+    def simulate(self):
+        """ゲーム内の全オブジェクトを1回ずつ動かす"""
+        # エイリアンの更新
+        for alien in self.alien_generator.aliens:
+            alien.update()
+
+        # りんごの更新
+        self.apple_generator.update()
+
+        # 飛んでいくプラットフォームの更新
+        for flying_platform in self.flying_platforms:
+            flying_platform.update()
+
+        # スライムの弾の移動（爆発した弾は爆発エフェクトを進める）
+        for projectile in self.projectiles:
+            projectile.move()
+            projectile.update()
+
+        # エイリアンの弾を更新（画面外・寿命切れの弾はここで削除される）
+        self.alien_bullets.update(self.camera.x)
+
+        # はじき返された弾の移動
+        for deflected in self.deflected_bullets:
+            deflected.update()
+
+        # 大爆発エフェクトの更新
+        for big_explosion in self.big_explosions:
+            big_explosion.update()
+
+        # パーティクルの一括更新
+        particle_system.update()
+
+    def collide(self):
+        """衝突判定を行い、このフレームで倒したエイリアンと爆発をまとめて処理する"""
+        slime = self.slime
+        alien_generator = self.alien_generator
+        apple_generator = self.apple_generator
+        destroy_queue = self.destroy_queue
+
+        # エイリアンの衝突判定用グリッドを移動後の位置で作り直す
+        alien_generator.rebuild_grid()
+
+        # スライムの弾の衝突判定
+        platforms = self.platform_generator.platforms
+        for projectile in self.projectiles:
+            # エイリアンとの衝突判定（近くのエイリアンだけを調べる）
+            for alien in alien_generator.query(projectile.rect):
+                if alien.alive and projectile.active and projectile.rect.colliderect(alien.rect):
+                    if projectile.is_big:  # 紫フォームの超大弾
+                        # 超大爆発（エイリアンと弾の位置）
+                        destroy_queue.kill(alien, "projectile", (projectile.x, projectile.y))
+                        event_log.debug("bullet", "Super massive explosion!")
                     else:
-                        projectile = slime.shoot()
-                    if projectile:
-                        projectiles.append(projectile)
+                        destroy_queue.kill(alien, "projectile")
 
-                # スライムの弾の更新
-                for projectile in projectiles[:]:
-                    projectile.move()
-                    projectile.update()
+                    projectile.explode()
+                    break
 
-                    # エイリアンとの衝突判定
-                    for alien in alien_generator.aliens:
-                        if alien.alive and projectile.active and projectile.rect.colliderect(alien.rect):
-                            if projectile.is_big:  # 紫フォームの超大弾
-                                # 超大爆発
-                                big_explosions.append(
-                                    BigExplosion(alien.x + alien.width // 2, alien.y + alien.height // 2)
-                                )
-                                big_explosions.append(BigExplosion(projectile.x, projectile.y))
-                                print("Super massive explosion!")
-                            else:
-                                big_explosions.append(
-                                    BigExplosion(alien.x + alien.width // 2, alien.y + alien.height // 2)
-                                )
+            # プラットフォームに当たった弾はその場で爆発する
+            projectile.check_collision(platforms)
 
-                            # エイリアンを破壊し、赤いエイリアンの場合は4体分裂
-                            destroy_result = alien.destroy()
-                            if destroy_result.get("destroyed", False):
-                                spawn_aliens = destroy_result.get("spawn_aliens", [])
-                                if spawn_aliens:
-                                    print(f"Red alien destroyed! Spawning {len(spawn_aliens)} aliens")
-                                    for spawn_info in spawn_aliens:
-                                        alien_type = spawn_info.get("type", "normal")
-
-                                        # 画面の絶対座標に変換
-                                        spawn_x = spawn_info["x"]
-                                        spawn_y = spawn_info["y"]
-
-                                        if spawn_x == "screen_right":
-                                            spawn_x = camera.x + SCREEN_WIDTH - 100
-                                        elif spawn_x == "screen_left":
-                                            spawn_x = camera.x + 100
-
-                                        if spawn_y == "screen_top":
-                                            spawn_y = 50
-                                        elif spawn_y == "screen_bottom":
-                                            spawn_y = SCREEN_HEIGHT - 150
-
-                                        alien_generator.add_alien(spawn_x, spawn_y, alien_type)
-
-                            projectile.explode()
-                            game_state.add_score()
-                            break
+        # りんごとの衝突判定（食べたりんごはcullで取り除く）
+        for apple in apple_generator.apples:
+            if apple.consumed:
+                continue
+            if slime.rect.colliderect(apple.rect):
+                self.sounds.eat.play()
+                effect = slime.eat_apple(apple)
+                apple.consumed = True
 
-                    if projectile.check_collision(platform_generator.platforms):
-                        projectiles.remove(projectile)
-                    elif projectile.can_penetrate:
-                        # 貫通弾はより遠くまで飛ばす（通常の3倍の距離）
-                        if projectile.x < camera.x - 600 or projectile.x > camera.x + SCREEN_WIDTH + 600:
-                            projectiles.remove(projectile)
-                        elif not projectile.active and (not projectile.explosion or not projectile.explosion.active):
-                            projectiles.remove(projectile)
-                    elif projectile.x < camera.x - 200 or projectile.x > camera.x + SCREEN_WIDTH + 200:
-                        projectiles.remove(projectile)
-                    elif not projectile.active and (not projectile.explosion or not projectile.explosion.active):
-                        projectiles.remove(projectile)
-
-                # エイリアンの弾を更新
-                for bullet in alien_bullets[:]:
-                    bullet.update()
-                    if not bullet.active:
-                        alien_bullets.remove(bullet)
-
-                # りんごとの衝突判定
-                for apple in apple_generator.apples[:]:
-                    apple_rect = pygame.Rect(apple.x, apple.y, 30, 30)
-                    if slime.rect.colliderect(apple_rect):
-                        eat_sound.play()
-                        effect = slime.eat_apple(apple)
-                        apple.consumed = True
-                        apple_generator.apples.remove(apple)
-
-                        if effect == "destroy_all_aliens":
-                            # 緑りんご効果：画面フラッシュ + 全エイリアン爆発
-                            screen_flash = ScreenFlash()
-                            green_apple_sound.play()
-
-                            # 全エイリアンを爆発させる
-                            for alien in alien_generator.aliens[:]:  # コピーを作成して安全にイテレート
-                                if alien.alive:
-                                    big_explosions.append(
-                                        BigExplosion(alien.x + alien.width // 2, alien.y + alien.height // 2)
-                                    )
-
-                                    # エイリアンを破壊し、赤いエイリアンの場合は4体分裂
-                                    destroy_result = alien.destroy()
-                                    if destroy_result.get("destroyed", False):
-                                        spawn_aliens = destroy_result.get("spawn_aliens", [])
-                                        if spawn_aliens:
-                                            print(
-                                                f"Red alien destroyed by green apple! Spawning {len(spawn_aliens)} aliens"
-                                            )
-                                            for spawn_info in spawn_aliens:
-                                                alien_type = spawn_info.get("type", "normal")
-
-                                                # 画面の絶対座標に変換
-                                                spawn_x = spawn_info["x"]
-                                                spawn_y = spawn_info["y"]
-
-                                                if spawn_x == "screen_right":
-                                                    spawn_x = camera.x + SCREEN_WIDTH - 100
-                                                elif spawn_x == "screen_left":
-                                                    spawn_x = camera.x + 100
-
-                                                if spawn_y == "screen_top":
-                                                    spawn_y = 50
-                                                elif spawn_y == "screen_bottom":
-                                                    spawn_y = SCREEN_HEIGHT - 150
-
-                                                alien_generator.add_alien(spawn_x, spawn_y, alien_type)
-
-                                    game_state.add_score()
-                        elif effect == "double_jump_gained":
-                            # 茶色りんご効果：二段ジャンプ獲得
-                            print(f"Brown apple collected! Double jumps: {slime.double_jump_count}")
-
-                # 紫状態のスライムとエイリアンの直接衝突判定
-                if slime.form == 4:  # 紫フォーム
-                    for alien in alien_generator.aliens[:]:
-                        if alien.alive and slime.rect.colliderect(alien.rect):
-                            # 超巨大爆発
-                            big_explosions.append(BigExplosion(alien.x + alien.width // 2, alien.y + alien.height // 2))
-                            big_explosions.append(
-                                BigExplosion(slime.x + slime.rect.width // 2, slime.y + slime.rect.height // 2)
-                            )
-
-                            # エイリアンを破壊し、赤いエイリアンの場合は4体分裂
-                            destroy_result = alien.destroy()
-                            if destroy_result.get("destroyed", False):
-                                spawn_aliens = destroy_result.get("spawn_aliens", [])
-                                if spawn_aliens:
-                                    print(f"Red alien destroyed by purple slime! Spawning {len(spawn_aliens)} aliens")
-                                    for spawn_info in spawn_aliens:
-                                        alien_type = spawn_info.get("type", "normal")
-
-                                        # 画面の絶対座標に変換
-                                        spawn_x = spawn_info["x"]
-                                        spawn_y = spawn_info["y"]
-
-                                        if spawn_x == "screen_right":
-                                            spawn_x = camera.x + SCREEN_WIDTH - 100
-                                        elif spawn_x == "screen_left":
-                                            spawn_x = camera.x + 100
-
-                                        if spawn_y == "screen_top":
-                                            spawn_y = 50
-                                        elif spawn_y == "screen_bottom":
-                                            spawn_y = SCREEN_HEIGHT - 150
-
-                                        alien_generator.add_alien(spawn_x, spawn_y, alien_type)
-
-                            game_state.add_score()
-                            print("Purple slime destroyed alien with massive explosion!")
-                            break
+                if effect == "destroy_all_aliens":
+                    # 緑りんご効果：画面フラッシュ + 全エイリアン爆発
+                    self.screen_flash = ScreenFlash()
+                    self.sounds.green_apple.play()
 
-                # エイリアンの弾との衝突判定
-                for bullet in alien_bullets[:]:
-                    if bullet.active and slime.rect.colliderect(bullet.rect):
-                        if slime.purple_invincible:
-                            # 紫フォームで無敵の場合、弾を大爆発させる
-                            big_explosions.append(BigExplosion(bullet.x, bullet.y))
-                            bullet.active = False
-                            alien_bullets.remove(bullet)
-                            print("Purple invincibility blocked bullet!")
-                        elif slime.can_deflect:
-                            # デフレクト中の場合、弾をはじき返す
-                            deflected_bullets.append(DeflectedBullet(bullet.x, bullet.y, bullet.vx, bullet.vy))
-                            bullet.active = False
-                            alien_bullets.remove(bullet)
-                            print("Bullet deflected!")
-                        else:
-                            # 通常の場合、ダメージを受ける
-                            print(f"Bullet hit slime! Form: {slime.form}")
-                            if slime.take_damage():
-                                print("GAME OVER triggered!")
-                                big_explosions.append(
-                                    BigExplosion(slime.x + slime.rect.width // 2, slime.y + slime.rect.height // 2)
-                                )
-                                game_state.trigger_game_over()
-                                game_over_screen.activate()
-                            else:
-                                print(f"Slime damaged! New form: {slime.form}")
-                            bullet.active = False
-                            alien_bullets.remove(bullet)
-
-                # はじき返された弾の更新
-                for deflected in deflected_bullets[:]:
-                    deflected.update()
-
-                    # エイリアンとの衝突判定
-                    if deflected.active:
-                        for alien in alien_generator.aliens:
-                            if alien.alive and deflected.rect.colliderect(alien.rect):
-                                # はじき返された弾がエイリアンに当たったら大爆発
-                                big_explosions.append(
-                                    BigExplosion(alien.x + alien.width // 2, alien.y + alien.height // 2)
-                                )
-                                big_explosions.append(BigExplosion(deflected.x, deflected.y))  # 弾の位置でも爆発
-
-                                # エイリアンを破壊し、赤いエイリアンの場合は4体分裂
-                                destroy_result = alien.destroy()
-                                if destroy_result.get("destroyed", False):
-                                    spawn_aliens = destroy_result.get("spawn_aliens", [])
-                                    if spawn_aliens:
-                                        print(
-                                            f"Red alien destroyed by deflected bullet! Spawning {len(spawn_aliens)} aliens"
-                                        )
-                                        for spawn_info in spawn_aliens:
-                                            alien_type = spawn_info.get("type", "normal")
-
-                                            # 画面の絶対座標に変換
-                                            spawn_x = spawn_info["x"]
-                                            spawn_y = spawn_info["y"]
-
-                                            if spawn_x == "screen_right":
-                                                spawn_x = camera.x + SCREEN_WIDTH - 100
-                                            elif spawn_x == "screen_left":
-                                                spawn_x = camera.x + 100
-
-                                            if spawn_y == "screen_top":
-                                                spawn_y = 50
-                                            elif spawn_y == "screen_bottom":
-                                                spawn_y = SCREEN_HEIGHT - 150
-
-                                            alien_generator.add_alien(spawn_x, spawn_y, alien_type)
-
-                                deflected.active = False
-                                game_state.add_score()
-                                print("Deflected bullet hit alien! Double explosion!")
-                                break
-
-                    # 画面外に出たか時間切れの弾を削除
-                    if (
-                        not deflected.active
-                        or deflected.x < camera.x - 200
-                        or deflected.x > camera.x + SCREEN_WIDTH + 200
-                    ):
-                        deflected_bullets.remove(deflected)
-
-                # 画面のクリア
-                screen.fill(BLACK)
-
-                # 多重スクロール背景の描画
-                if parallax_background:
-                    parallax_background.update(camera.x)
-                    parallax_background.draw(screen)
-
-                if not game_state.game_over:
-                    # 地面の描画（スクロールに対応）
-                    ground_start_x = int(camera.x // 100) * 100 - 100
-                    for i in range(ground_start_x, int(camera.x + SCREEN_WIDTH + 100), 100):
-                        screen_x = i - camera.x
-                        pygame.draw.rect(screen, BLUE, (screen_x, SCREEN_HEIGHT - 20, 100, 20))
-
-                    # プラットフォームの描画
-                    for platform in platform_generator.platforms:
-                        platform.draw(screen, camera)
-
-                    # りんごの描画
-                    for apple in apple_generator.apples:
-                        apple.draw(screen, camera)
-
-                    # 弾の描画
-                    for projectile in projectiles:
-                        projectile.draw(screen, camera)
-
-                    # エイリアンの弾の描画
-                    for bullet in alien_bullets:
-                        bullet.draw(screen, camera)
-
-                    # はじき返された弾の描画
-                    for deflected in deflected_bullets:
-                        deflected.draw(screen, camera)
-
-                    # エイリアンの描画
+                    # 全エイリアンを爆発させる（分裂したエイリアンはフレームの最後に現れる）
                     for alien in alien_generator.aliens:
-                        alien.draw(screen, camera)
-
-                    # 飛んでいくプラットフォームの描画
-                    for flying_platform in flying_platforms:
-                        flying_platform.draw(screen, camera)
-
-                    # スライムの描画
-                    slime.draw(screen, camera)
-
-                # 大爆発エフェクトの更新と描画
-                for big_explosion in big_explosions[:]:
-                    big_explosion.update()
-                    big_explosion.draw(screen, camera)
-                    if not big_explosion.active:
-                        big_explosions.remove(big_explosion)
-
-                # UI描画
-                draw_ui(screen, game_state.score, slime)
-
-                # 画面フラッシュエフェクトの描画
-                screen_flash.draw(screen)
-
-                # ゲームオーバー画面の描画（ゲームオーバー時またはアクティブ時）
-                if game_state.game_over or game_over_screen.active:
-                    game_over_screen.draw(screen, big_font)
-
-                # デバッグ情報
-                frame_count += 1
-                if frame_count % 120 == 0:  # 2秒に1回
-                    active_aliens = len([alien for alien in alien_generator.aliens if alien.alive])
-                    print(
-                        f"FPS: {clock.get_fps():.1f}, Score: {game_state.score}, Aliens: {len(alien_generator.aliens)} (Active: {active_aliens}), Bullets: {len(alien_bullets)}, Apples: {len(apple_generator.apples)}, Flying Platforms: {len(flying_platforms)}"
+                        if alien.alive:
+                            destroy_queue.kill(alien, "green apple")
+                elif effect == "double_jump_gained":
+                    # 茶色りんご効果：二段ジャンプ獲得
+                    event_log.info("apple", "Brown apple collected! Double jumps: %s", slime.double_jump_count)
+
+        # 紫状態のスライムとエイリアンの直接衝突判定
+        if slime.form == 4:  # 紫フォーム
+            for alien in alien_generator.query(slime.rect):
+                if alien.alive and slime.rect.colliderect(alien.rect):
+                    # 超巨大爆発（エイリアンとスライムの位置）
+                    slime_center = (slime.x + slime.rect.width // 2, slime.y + slime.rect.height // 2)
+                    destroy_queue.kill(alien, "purple slime", slime_center)
+                    event_log.debug("alien", "Purple slime destroyed alien with massive explosion!")
+                    break
+
+        # エイリアンの弾との衝突判定（スライム1つとの判定なので、グリッドを作らずにcollidelistallでまとめて調べる）
+        alien_bullets = self.alien_bullets
+        bullets = list(alien_bullets)
+        for index in slime.rect.collidelistall([bullet.rect for bullet in bullets]):
+            bullet = bullets[index]
+            # ダメージでスライムが小さくなった後の弾は、今の大きさでもう一度確かめる
+            if bullet.active and slime.rect.colliderect(bullet.rect):
+                if slime.purple_invincible:
+                    # 紫フォームで無敵の場合、弾を大爆発させる
+                    destroy_queue.explode(bullet.x, bullet.y)
+                    bullet.active = False
+                    alien_bullets.remove(bullet)
+                    event_log.debug("bullet", "Purple invincibility blocked bullet!")
+                elif slime.can_deflect:
+                    # デフレクト中の場合、弾をはじき返す
+                    self.deflected_bullets.append(
+                        deflected_bullet_pool.acquire(bullet.x, bullet.y, bullet.vx, bullet.vy)
                     )
+                    bullet.active = False
+                    alien_bullets.remove(bullet)
+                    event_log.debug("bullet", "Bullet deflected!")
+                else:
+                    # 通常の場合、ダメージを受ける
+                    event_log.info("game", "Bullet hit slime! Form: %s", slime.form)
+                    if slime.take_damage():
+                        event_log.info("game", "GAME OVER triggered!")
+                        self.trigger_game_over()
+                    else:
+                        event_log.info("game", "Slime damaged! New form: %s", slime.form)
+                    bullet.active = False
+                    alien_bullets.remove(bullet)
+
+        # はじき返された弾の衝突判定
+        for deflected in self.deflected_bullets:
+            # エイリアンとの衝突判定
+            if deflected.active:
+                for alien in alien_generator.query(deflected.rect):
+                    if alien.alive and deflected.rect.colliderect(alien.rect):
+                        # はじき返された弾がエイリアンに当たったら大爆発（弾の位置でも爆発）
+                        destroy_queue.kill(alien, "deflected bullet", (deflected.x, deflected.y))
+
+                        deflected.active = False
+                        event_log.debug("bullet", "Deflected bullet hit alien! Double explosion!")
+                        break
+
+        # このフレームの撃破・爆発・分裂をまとめて処理する
+        destroy_queue.drain(self)
+
+    def cull(self):
+        """消えた物・画面外に出た物を取り除き、通り過ぎたチャンクを手放す"""
+        camera_x = self.camera.x
+
+        # スライムの弾（消える弾は爆発と一緒にプールに戻し、残る弾は順番を保ったまま前に詰める）
+        def keep_projectile(projectile):
+            # 貫通弾はより遠くまで飛ばす（通常の3倍の距離）
+            margin = 600 if projectile.can_penetrate else 200
+            if projectile.x < camera_x - margin or projectile.x > camera_x + SCREEN_WIDTH + margin:
+                return False
+            # 爆発した弾は爆発エフェクトが終わるまで残す
+            return projectile.active or (projectile.explosion is not None and projectile.explosion.active)
+
+        compact(self.projectiles, keep_projectile, Projectile.release)
+
+        # 画面外に出たか時間切れのはじき返された弾
+        def keep_deflected(deflected):
+            return deflected.active and camera_x - 200 <= deflected.x <= camera_x + SCREEN_WIDTH + 200
+
+        compact(self.deflected_bullets, keep_deflected, deflected_bullet_pool.release)
+
+        # 食べたりんご・破壊されたエイリアン・飛んでいき終わったプラットフォーム・終わった大爆発
+        compact(self.apple_generator.apples, _is_not_consumed)
+        self.alien_generator.remove_destroyed()
+        compact(self.flying_platforms, _is_active)
+        compact(self.big_explosions, _is_active, big_explosion_pool.release)
+
+        # 通り過ぎたチャンクの物をまとめて取り除く
+        self.release_chunks()
+
+    def render(self, screen, dirty_rects=None, camera=None, alpha=1.0):
+        """画面を描画する（ゲームの状態は変えない）
+
+        cameraを省略した場合は最後のtickのカメラ位置で描画する。alphaはパーティクルの位置の補間に使う。
+        """
+        scratch_rects.next_frame()
+        if camera is None:
+            camera = self.camera
+        if dirty_rects is not None:
+            # 少しだけのスクロールは前回全体を表示したときの位置のまま描画する（背景を描き直さずに済む）
+            camera_x = dirty_rects.scroll(camera.x)
+            if camera_x != camera.x:
+                camera = Camera()
+                camera.x = camera.previous_x = camera_x
+            mark = dirty_rects.mark
+        else:
+            mark = _ignore_rect
+
+        # 画面のクリア
+        screen.fill(BLACK)
+
+        # 多重スクロール背景の描画
+        parallax_background = self.runtime.parallax_background
+        if parallax_background:
+            parallax_background.draw(screen, camera.x)
+
+        if not self.game_state.game_over:
+            # 地面の描画（スクロールに対応）
+            ground_start_x = int(camera.x // 100) * 100 - 100
+            for i in range(ground_start_x, int(camera.x + SCREEN_WIDTH + 100), 100):
+                screen_x = i - camera.x
+                pygame.draw.rect(screen, BLUE, (screen_x, SCREEN_HEIGHT - 20, 100, 20))
+
+            # プラットフォームの描画（画面内のものだけ）
+            # 紫フォームで飛ばしたプラットフォームの元の場所も前のフレームの範囲として描き直されるように、毎フレーム登録する
+            for platform in self.platform_generator.platforms.query(camera.x, camera.x + SCREEN_WIDTH):
+                mark(platform.draw(screen, camera))
+
+            # りんごと弾はスプライトを集めて1回のblitsで描く（爆発した弾の爆発エフェクトはその上に描く）
+            blit_sequence = []
+            for apple in self.apple_generator.apples:
+                mark(apple.add_blits(camera, blit_sequence))
+            for projectile in self.projectiles:
+                mark(projectile.add_blits(camera, blit_sequence))
+            screen.blits(blit_sequence, doreturn=False)
+            for projectile in self.projectiles:
+                mark(projectile.draw_explosion(screen, camera))
+
+            # エイリアンの弾の描画
+            for bullet in self.alien_bullets:
+                mark(bullet.draw(screen, camera))
+
+            # はじき返された弾の描画
+            for deflected in self.deflected_bullets:
+                mark(deflected.draw(screen, camera))
+
+            # エイリアンの描画（まとめて1回のblitsで描く）
+            alien_rects = draw_aliens(screen, camera, self.alien_generator.aliens)
+            if dirty_rects is not None:
+                dirty_rects.mark_many(alien_rects)
+
+            # 飛んでいくプラットフォームの描画
+            for flying_platform in self.flying_platforms:
+                mark(flying_platform.draw(screen, camera))
+
+            # スライムの描画
+            mark(self.slime.draw(screen, camera))
+
+        # 大爆発エフェクトの描画
+        for big_explosion in self.big_explosions:
+            mark(big_explosion.draw(screen, camera))
+
+        # 全パーティクルの一括描画
+        mark(particle_system.draw(screen, camera.x, alpha))
+
+        # UI描画
+        mark(draw_ui(screen, self.runtime.font, self.game_state.score, self.slime))
+        mark(draw_quality(screen, self.runtime.font))
+
+        # 画面フラッシュエフェクトの描画
+        self.screen_flash.draw(screen)
+
+        # ゲームオーバー画面の描画（ゲームオーバー時またはアクティブ時）
+        if self.game_state.game_over or self.game_over_screen.active:
+            self.game_over_screen.draw(screen, self.runtime.big_font)
+
+        # 画面全体を覆うエフェクトが出ている間は全体を表示する
+        if dirty_rects is not None and (
+            self.screen_flash.timer > 0 or self.game_state.game_over or self.game_over_screen.active
+        ):
+            dirty_rects.mark_all()
+
+    def entity_counts(self):
+        """種類ごとのオブジェクト数を返す（デバッグ・計測用）"""
+        return {
+            "aliens": len(self.alien_generator.aliens),
+            "active_aliens": len([alien for alien in self.alien_generator.aliens if alien.alive]),
+            "alien_bullets": len(self.alien_bullets),
+            "projectiles": len(self.projectiles),
+            "deflected_bullets": len(self.deflected_bullets),
+            "big_explosions": len(self.big_explosions),
+            "platforms": len(self.platform_generator.platforms),
+            "flying_platforms": len(self.flying_platforms),
+            "apples": len(self.apple_generator.apples),
+            "particles": particle_system.count,
+        }
+
+
+async def main(record_path=None, replay_path=None, dirty_rects=False, quality_mode="auto"):
+    """ゲームを実行する
+
+    record_pathを指定すると毎フレームのキー入力と乱数のシードを記録し、終了時に保存する。
+    replay_pathを指定すると記録したキー入力を再生する（同じシードなので同じ展開になる）。
+    quality_modeはエフェクトの量（"auto" は処理時間に応じて自動で切り替える。F8キーでも切り替えられる）。
+    """
+    quality.set_mode(quality_mode)
+    clock = pygame.time.Clock()
+    timestep = FixedTimestep(FPS)
+    frame_count = 0
+
+    replay = InputReplay.load(replay_path) if replay_path else None
+    seed = replay.seed if replay is not None else random.randrange(2**31)
+    seed_random(seed)
+    recorder = InputRecorder(seed) if record_path else None
+
+    runtime = init_runtime()
+    screen = runtime.screen
+    bgm = runtime.sounds.bgm
+    game = Game(runtime)
+    presenter = DirtyRects(screen.get_size(), enabled=dirty_rects)
+
+    print("Game started! Left/Right arrows to move, UP arrow to jump, SPACE to shoot")
+    if replay is not None:
+        print(f"Replaying {replay_path} ({len(replay)} frames, seed {seed})")
+
+    # BGMのチャンネル（効果音に使われないよう予約してある。合成中の場合は合成が終わってから再生を始める）
+    sound_dispatcher = runtime.sound_dispatcher
+    bgm_channel = sound_dispatcher.bgm_channel
+    bgm_started = False
+
+    try:
+        while True:
+            try:
+                frame_started = time.perf_counter()
+
+                # BGMを開始（ループ再生）
+                if not bgm_started and bgm.ready:
+                    bgm_channel.play(bgm.sound, loops=-1)  # 無限ループ
+                    bgm_started = True
+                    print(f"BGM started - volume: {bgm.get_volume()}")
+
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            pygame.quit()
+                            sys.exit()
+                        elif event.key == pygame.K_F9:
+                            event_log.dump()
+                        elif event.key == pygame.K_F8:
+                            event_log.info("quality", "Quality mode: %s (level: %s)", quality.next_mode(), quality.name)
+
+                # 経過時間に応じた回数だけ一定間隔でシミュレーションを進める
+                keys = pygame.key.get_pressed()
+                simulated = False
+                for _ in range(timestep.advance(time.perf_counter())):
+                    if replay is not None and frame_count >= len(replay):
+                        break
+                    if not game.begin_frame():
+                        continue
+
+                    tick_keys = replay.keys_at(frame_count) if replay is not None else keys
+                    if recorder is not None:
+                        recorder.record(tick_keys)
+
+                    game.update(tick_keys)
+                    game.handle_collisions()
+                    simulated = True
+
+                    # デバッグ情報
+                    frame_count += 1
+                    if frame_count % 120 == 0 and event_log.enabled(INFO):  # 2秒に1回
+                        counts = game.entity_counts()
+                        alien_bullets = game.alien_bullets
+                        event_log.info(
+                            "perf",
+                            f"FPS: {clock.get_fps():.1f}, Ticks/s: {timestep.measured_tick_rate:.1f}, Renders/s: {timestep.measured_render_rate:.1f} (Dropped ticks: {timestep.dropped_ticks}), Score: {game.game_state.score}, Aliens: {counts['aliens']} (Active: {counts['active_aliens']}), Bullets: {counts['alien_bullets']} (Culled: {alien_bullets.culled_offscreen + alien_bullets.culled_expired}), Apples: {counts['apples']}, Flying Platforms: {counts['flying_platforms']}, Particles: {counts['particles']}, Presented px/frame: {presenter.total_pixels // max(1, presenter.presents)}",
+                        )
+                        event_log.info(
+                            "perf",
+                            "Phase ms: "
+                            + ", ".join(f"{phase} {ms:.3f}" for phase, ms in game.scheduler.stats().items()),
+                        )
+                        sound_stats = sound_dispatcher.stats()
+                        event_log.info(
+                            "sound",
+                            f"Played: {sound_stats['played']}, Dropped (voices/retrigger/busy): {sound_stats['dropped_voices']}/{sound_stats['dropped_retrigger']}/{sound_stats['dropped_busy']}, Stolen: {sound_stats['stolen']}",
+                        )
+                        event_log.info(
+                            "quality",
+                            f"Mode: {quality.mode}, Level: {quality.name}, Frame work ms: {quality.average * 1000:.2f} (budget {quality.budget * 1000:.2f}), Changes: {quality.changes}",
+                        )
+
+                if replay is not None and frame_count >= len(replay):
+                    print(f"Replay finished - Score: {game.game_state.score}")
+                    break
+
+                # 描画は1フレームに1回だけ（ゲームオーバー中は最後の画面のまま）
+                if simulated or not game.game_state.game_over:
+                    game.draw(screen, presenter, timestep.alpha)
+                    timestep.rendered()
 
-            pygame.display.flip()
-            clock.tick(60)
-            await asyncio.sleep(0)
+                presenter.present()
 
-        except Exception as e:
-            print(f"Error occurred: {e}")
-            import traceback
+                # 待ち時間を除いた1フレームの処理時間で画質レベルを調整する
+                if quality.record(time.perf_counter() - frame_started):
+                    event_log.info(
+                        "quality", "Quality level -> %s (frame work %.2f ms)", quality.name, quality.average * 1000
+                    )
+                clock.tick(FPS)
+                await asyncio.sleep(0)
+
+            except Exception as e:
+                print(f"Error occurred: {e}")
+                event_log.dump()
+                import traceback
 
-            traceback.print_exc()
-            break
+                traceback.print_exc()
+                break
+    finally:
+        if recorder is not None:
+            recorder.save(record_path)
+            print(f"Recorded {len(recorder)} frames to {record_path} (seed {seed})")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", metavar="PATH", help="キー入力を記録するファイル")
+    parser.add_argument("--replay", metavar="PATH", help="記録したキー入力を再生する")
+    parser.add_argument(
+        "--log-level", default="info", help="記録するデバッグ出力のレベル（debug/info/warning/error/off）"
+    )
+    parser.add_argument(
+        "--log-echo", default="warning", help="標準エラー出力にも書くレベル（debug/info/warning/error/off）"
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="画面のうち変わった部分だけを表示に反映する（スクロールしていない間）",
+    )
+    parser.add_argument(
+        "--quality",
+        choices=QUALITY_MODES,
+        default="auto",
+        help="エフェクトの量（autoは処理時間に応じて自動で切り替える。F8キーでも切り替えられる）",
+    )
+    args, _ = parser.parse_known_args()
+    event_log.level = parse_level(args.log_level)
+    event_log.echo_level = parse_level(args.log_echo)
+    asyncio.run(
+        main(
+            record_path=args.record,
+            replay_path=args.replay,
+            dirty_rects=args.dirty_rects,
+            quality_mode=args.quality,
+        )
+    )
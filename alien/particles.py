@@ -0,0 +1,188 @@
+import numpy as np
+import pygame
+
+# パーティクルの描画フラグ
+FADE = 1  # 残り寿命に応じて色を暗くする
+SHRINK = 2  # 残り寿命に応じて半径を小さくする
+
+# 色の減衰を量子化する段階数（スプライトの使い回し用）
+FADE_LEVELS = 32
+
+
+class ParticleSystem:
+    """全パーティクルを事前確保したNumPy配列（構造体配列）で一括管理するクラス
+
+    生存中のパーティクルは常に配列の先頭 [0:count) に詰めて保持し、
+    移動・寿命の減少・消滅判定を1フレームに1回のベクトル演算で行う。
+    """
+
+    def __init__(self, capacity=4096, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0  # 容量不足で生成できなかった数
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.ttl = np.zeros(capacity, dtype=np.int32)  # 発生源の寿命による強制消滅までのフレーム数
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+
+        self._sprites = {}
+
+    def seed(self, seed):
+        """乱数のシードを設定する"""
+        self.rng = np.random.default_rng(seed)
+
+    def clear(self):
+        """全パーティクルを消去する"""
+        self.count = 0
+
+    def emit(self, x, y, vx, vy, life, max_life, size, color, ttl=None, flags=FADE):
+        """パーティクルを追加する（各引数はスカラーまたは同じ長さの配列）"""
+        total = np.broadcast(x, y, vx, vy, life, max_life, size).size
+        free = self.capacity - self.count
+        n = min(total, free)
+        self.dropped += total - n
+        if n <= 0:
+            return 0
+
+        s = slice(self.count, self.count + n)
+        for array, value in (
+            (self.x, x),
+            (self.y, y),
+            (self.vx, vx),
+            (self.vy, vy),
+            (self.life, life),
+            (self.max_life, max_life),
+            (self.size, size),
+        ):
+            array[s] = np.broadcast_to(value, (total,))[:n]
+        self.color[s] = color
+        # ttlを指定しない場合は寿命が尽きるまで生存
+        self.ttl[s] = np.iinfo(np.int32).max if ttl is None else ttl
+        self.flags[s] = flags
+        self.count += n
+        return n
+
+    def emit_burst(self, x, y, count, speed, life, size, color, ttl=None, flags=FADE):
+        """(x, y)から全方向に飛び散るパーティクルをまとめて追加する
+
+        speed, life, size はそれぞれ (最小値, 最大値) の一様乱数の範囲。
+        """
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, count)
+        velocity = rng.uniform(speed[0], speed[1], count)
+        return self.emit(
+            x,
+            y,
+            np.cos(angle) * velocity,
+            np.sin(angle) * velocity,
+            rng.uniform(life[0], life[1], count),
+            rng.uniform(life[0], life[1], count),
+            rng.uniform(size[0], size[1], count),
+            color,
+            ttl,
+            flags,
+        )
+
+    def update(self):
+        """全パーティクルを移動させ、寿命が尽きたものを詰めて取り除く"""
+        n = self.count
+        if n == 0:
+            return
+
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= 1
+        self.ttl[:n] -= 1
+
+        alive = (self.life[:n] > 0) & (self.ttl[:n] > 0)
+        remaining = int(np.count_nonzero(alive))
+        if remaining == n:
+            return
+
+        for array in (
+            self.x,
+            self.y,
+            self.vx,
+            self.vy,
+            self.life,
+            self.max_life,
+            self.size,
+            self.color,
+            self.ttl,
+            self.flags,
+        ):
+            array[:remaining] = array[:n][alive]
+        self.count = remaining
+
+    def _sprite(self, r, g, b, radius):
+        """色と半径ごとの円スプライトを返す（初回のみ生成）"""
+        key = (r, g, b, radius)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2))
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            pygame.draw.circle(sprite, (r, g, b), (radius, radius), radius)
+            sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, screen, camera_x, alpha=1.0):
+        """画面内のパーティクルを1回のblits呼び出しでまとめて描画し、描画した範囲を囲むRectを返す
+
+        alphaが1未満の場合は、前回のupdate()との間（1回分の速度だけ戻した位置との間）の位置に描画する。
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        width, height = screen.get_size()
+        screen_x = self.x[:n] - camera_x
+        screen_y = self.y[:n]
+        if alpha < 1.0:
+            screen_x = screen_x - self.vx[:n] * (1.0 - alpha)
+            screen_y = screen_y - self.vy[:n] * (1.0 - alpha)
+        life = self.life[:n]
+        flags = self.flags[:n]
+
+        ratio = np.clip(life / self.max_life[:n], 0.0, 1.0)
+        fade = np.where(flags & FADE, ratio, 1.0)
+        radius = np.where(flags & SHRINK, self.size[:n] * ratio, self.size[:n])
+        radius = np.maximum(1, radius.astype(np.int32))
+
+        visible = (
+            (screen_x + radius >= 0)
+            & (screen_x - radius < width)
+            & (screen_y + radius >= 0)
+            & (screen_y - radius < height)
+        )
+        if not visible.any():
+            return
+
+        level = np.ceil(fade[visible] * FADE_LEVELS) / FADE_LEVELS
+        colors = np.clip(self.color[:n][visible] * level[:, None], 0, 255).astype(np.int32)
+        radius = radius[visible]
+        left = screen_x[visible].astype(np.int32) - radius
+        top = screen_y[visible].astype(np.int32) - radius
+
+        sprite = self._sprite
+        blit_sequence = [
+            (sprite(r, g, b, rad), (px, py))
+            for (r, g, b), rad, px, py in zip(colors.tolist(), radius.tolist(), left.tolist(), top.tolist())
+            if r or g or b
+        ]
+        screen.blits(blit_sequence, doreturn=False)
+
+        right = left + radius * 2
+        bottom = top + radius * 2
+        return pygame.Rect(
+            int(left.min()), int(top.min()), int(right.max() - left.min()), int(bottom.max() - top.min())
+        )
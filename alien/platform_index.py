@@ -0,0 +1,85 @@
+from bisect import bisect_right
+
+
+class PlatformIndex:
+    """x座標（左端）の昇順に並んだプラットフォームの索引
+
+    プラットフォームは右方向にしか生成されないので、末尾への追加と
+    先頭からの削除だけで並び順が保たれる。範囲検索は二分探索で行う。
+    先頭から取り除いた分はリストを詰めずに開始位置（_head）をずらすだけにして、
+    取り除いた数が残りの数を超えたときにまとめて詰める（リストなので添字アクセスはO(1)）。
+    """
+
+    # 先頭の取り除いた分がこれより少ない間は詰めない
+    COMPACT_MIN = 32
+
+    def __init__(self):
+        self._lefts = []
+        self._platforms = []
+        self._head = 0  # 先頭から取り除いた数（_head より前の要素は使わない）
+        self._max_width = 0
+
+    def __iter__(self):
+        platforms = self._platforms
+        return (platforms[index] for index in range(self._head, len(platforms)))
+
+    def __len__(self):
+        return len(self._platforms) - self._head
+
+    def append(self, platform):
+        """右端にプラットフォームを追加する"""
+        left = platform.rect.left
+        if len(self) and left < self._lefts[-1]:
+            raise ValueError(f"Platforms must be added in increasing x order (got {left} after {self._lefts[-1]})")
+        self._lefts.append(left)
+        self._platforms.append(platform)
+        self._max_width = max(self._max_width, platform.rect.width)
+
+    def query(self, x_min, x_max):
+        """x方向で [x_min, x_max) と重なるプラットフォームのリストを返す"""
+        lefts = self._lefts
+        platforms = self._platforms
+        # 左端が x_min - 最大幅 以下のものは x_min まで届かない
+        index = bisect_right(lefts, x_min - self._max_width, self._head)
+        result = []
+        for index in range(index, len(lefts)):
+            if lefts[index] >= x_max:
+                break
+            platform = platforms[index]
+            if platform.rect.right > x_min:
+                result.append(platform)
+        return result
+
+    def evict_before(self, x):
+        """右端がx以下になったプラットフォームを左から取り除く"""
+        platforms = self._platforms
+        head = self._head
+        while head < len(platforms) and platforms[head].rect.right <= x:
+            platforms[head] = None  # 参照を切っておく
+            head += 1
+        self._head = head
+        if head >= self.COMPACT_MIN and head * 2 >= len(platforms):
+            self._compact()
+
+    def _compact(self):
+        """先頭の取り除いた分を詰める"""
+        del self._lefts[: self._head]
+        del self._platforms[: self._head]
+        self._head = 0
+
+    def remove(self, platform):
+        """指定したプラットフォームを取り除く（紫フォームで飛ばした場合など）"""
+        platforms = self._platforms
+        for index in range(self._head, len(platforms)):
+            if platforms[index] is platform:
+                del platforms[index]
+                del self._lefts[index]
+                return
+        raise ValueError("platform not in index")
+
+    def clear(self):
+        """全プラットフォームを取り除く"""
+        self._lefts.clear()
+        self._platforms.clear()
+        self._head = 0
+        self._max_width = 0
@@ -0,0 +1,114 @@
+from collections import deque
+
+# 手動で選べるモード（autoは処理時間に応じて自動で切り替える）
+QUALITY_MODES = ("auto", "low", "medium", "high")
+
+
+class QualityGovernor:
+    """直近のフレームの処理時間から、エフェクトの量（画質レベル）を一段ずつ上げ下げする
+
+    levelsは低い順に並べた (名前, 設定のdict) のタプル。現在のレベルの設定は settings で参照する。
+    mode が "auto" の場合、record() に渡した処理時間（描画の待ち時間を除く）の直近window
+    フレームの平均が budget * downgrade_ratio を超えたら一段下げ、budget * upgrade_ratio を
+    下回ったら一段上げる。上げ下げの閾値を離しておき、変えた直後は平均を取り直すので、
+    2つのレベルの間を行ったり来たりしにくい（上げる方は upgrade_hold フレーム続いた場合だけ）。
+    mode にレベルの名前を指定した場合は、そのレベルに固定する。
+    """
+
+    def __init__(
+        self,
+        levels,
+        budget=1 / 60,
+        mode="auto",
+        window=30,
+        downgrade_ratio=0.9,
+        upgrade_ratio=0.5,
+        upgrade_hold=180,
+    ):
+        self.levels = levels
+        self.names = tuple(name for name, _ in levels)
+        self.budget = budget
+        self.window = window
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.upgrade_hold = upgrade_hold
+        self.samples = deque(maxlen=window)
+        self.total = 0.0
+        self.calm_frames = 0  # 平均がupgrade_ratioを下回り続けているフレーム数
+        self.level = len(levels) - 1
+        self.settings = levels[self.level][1]
+        self.mode = "auto"
+        self.changes = 0
+        self.set_mode(mode)
+
+    @property
+    def name(self):
+        """現在のレベルの名前"""
+        return self.names[self.level]
+
+    def set_mode(self, mode):
+        """モード（"auto" かレベルの名前）を切り替える"""
+        if mode != "auto":
+            if mode not in self.names:
+                raise ValueError(f"Unknown quality mode: {mode} (expected auto or one of {', '.join(self.names)})")
+            self._set_level(self.names.index(mode))
+        self.mode = mode
+        self._restart()
+
+    def next_mode(self, modes=QUALITY_MODES):
+        """modesの中の次のモードに切り替え、切り替えたモードを返す（キー操作用）"""
+        index = modes.index(self.mode) if self.mode in modes else -1
+        self.set_mode(modes[(index + 1) % len(modes)])
+        return self.mode
+
+    def _set_level(self, level):
+        if level != self.level:
+            self.level = level
+            self.settings = self.levels[level][1]
+            self.changes += 1
+
+    def _restart(self):
+        self.samples.clear()
+        self.total = 0.0
+        self.calm_frames = 0
+
+    @property
+    def average(self):
+        """直近のフレームの平均処理時間（秒）"""
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def record(self, frame_time):
+        """1フレームの処理時間（秒）を記録する。レベルを変えた場合はTrueを返す"""
+        samples = self.samples
+        if len(samples) == samples.maxlen:
+            self.total -= samples[0]
+        samples.append(frame_time)
+        self.total += frame_time
+        if self.mode != "auto" or len(samples) < self.window:
+            return False
+
+        average = self.total / len(samples)
+        if average > self.budget * self.downgrade_ratio:
+            if self.level > 0:
+                self._set_level(self.level - 1)
+                self._restart()
+                return True
+            self.calm_frames = 0
+        elif average < self.budget * self.upgrade_ratio:
+            self.calm_frames += 1
+            if self.calm_frames >= self.upgrade_hold and self.level < len(self.levels) - 1:
+                self._set_level(self.level + 1)
+                self._restart()
+                return True
+        else:
+            self.calm_frames = 0
+        return False
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "level": self.name,
+            "average_ms": round(self.average * 1000, 3),
+            "budget_ms": round(self.budget * 1000, 3),
+            "changes": self.changes,
+        }
@@ -0,0 +1,101 @@
+import struct
+import zlib
+
+import pygame
+
+# 再生ファイルの形式
+# ヘッダ（マジック, バージョン, 乱数のシード, フレーム数, キーの数）+ キーコードの一覧
+# + フレームごとに1バイトの押下状態（ビットiがキーiに対応）をzlibで圧縮したもの
+REPLAY_MAGIC = b"ALRP"
+REPLAY_VERSION = 1
+_HEADER = struct.Struct("<4sBqIB")
+_KEY_CODE = struct.Struct("<i")
+
+# 記録するキー（ゲームが読むキーだけ）
+RECORDED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_SPACE)
+
+
+class PressedKeys:
+    """pygame.key.get_pressed() の代わりに使うキー状態"""
+
+    def __init__(self, pressed):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+def encode_keys(keys, key_codes=RECORDED_KEYS):
+    """キー状態を1バイトのビットマスクにする"""
+    mask = 0
+    for bit, key in enumerate(key_codes):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+class InputRecorder:
+    """毎フレームのキー状態を記録してファイルに保存する"""
+
+    def __init__(self, seed, key_codes=RECORDED_KEYS):
+        if len(key_codes) > 8:
+            raise ValueError("At most 8 keys can be recorded")
+        self.seed = seed
+        self.key_codes = tuple(key_codes)
+        self.masks = bytearray()
+
+    def __len__(self):
+        return len(self.masks)
+
+    def record(self, keys):
+        """1フレーム分のキー状態を記録する"""
+        self.masks.append(encode_keys(keys, self.key_codes))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, len(self.masks), len(self.key_codes)))
+            for key in self.key_codes:
+                f.write(_KEY_CODE.pack(key))
+            f.write(zlib.compress(bytes(self.masks), 9))
+
+
+class InputReplay:
+    """記録したキー状態をフレームごとに返す"""
+
+    def __init__(self, seed, masks, key_codes=RECORDED_KEYS):
+        self.seed = seed
+        self.masks = bytes(masks)
+        self.key_codes = tuple(key_codes)
+        # 押下状態の組み合わせは高々256通りなので使い回す
+        self._states = {}
+
+    def __len__(self):
+        return len(self.masks)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, frames, key_count = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {version} (expected {REPLAY_VERSION})")
+        offset = _HEADER.size
+        key_codes = []
+        for _ in range(key_count):
+            key_codes.append(_KEY_CODE.unpack_from(data, offset)[0])
+            offset += _KEY_CODE.size
+        masks = zlib.decompress(data[offset:])
+        if len(masks) != frames:
+            raise ValueError(f"{path} is truncated ({len(masks)} of {frames} frames)")
+        return cls(seed, masks, key_codes)
+
+    def keys_at(self, frame):
+        """指定フレームのキー状態を返す"""
+        mask = self.masks[frame]
+        state = self._states.get(mask)
+        if state is None:
+            state = PressedKeys(key for bit, key in enumerate(self.key_codes) if mask >> bit & 1)
+            self._states[mask] = state
+        return state
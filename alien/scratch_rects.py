@@ -0,0 +1,41 @@
+import pygame
+
+
+class ScratchRects:
+    """描画中だけ使う一時的なRectを、フレームごとに使い回すプール
+
+    get() はRectを新しく作らずに、このフレームでまだ使っていないRectの値を書き換えて返す。
+    next_frame() を描画の先頭で呼ぶと、generations フレーム前に渡したRectから使い回す。
+    DirtyRectsは前回のフレームに登録された範囲も次のpresent()まで持っているので、
+    既定の2世代なら、描画が返したRectをそのまま登録してもpresent()前に書き換わることはない。
+    """
+
+    def __init__(self, generations=2):
+        self.banks = [[] for _ in range(generations)]
+        self.bank = self.banks[0]
+        self.generation = 0
+        self.used = 0  # 今のフレームで渡した数
+        self.peak = 0
+
+    def next_frame(self):
+        """次のフレームの描画を始める（generationsフレーム前のRectを使い回せるようになる）"""
+        self.peak = max(self.peak, self.used)
+        self.generation = (self.generation + 1) % len(self.banks)
+        self.bank = self.banks[self.generation]
+        self.used = 0
+
+    def get(self, x, y, width, height):
+        """(x, y, width, height) のRectを返す（次にこの世代が回ってくるまで有効）"""
+        bank = self.bank
+        used = self.used
+        self.used = used + 1
+        if used < len(bank):
+            rect = bank[used]
+            rect.update(x, y, width, height)
+            return rect
+        rect = pygame.Rect(x, y, width, height)
+        bank.append(rect)
+        return rect
+
+    def stats(self):
+        return {"peak": max(self.peak, self.used), "allocated": sum(len(bank) for bank in self.banks)}
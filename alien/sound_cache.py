@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pygame
+
+# 合成処理の中身を変えたときに上げる（古いキャッシュを使わないように）
+SYNTH_VERSION = 1
+
+
+def default_cache_dir():
+    """キャッシュの保存先（ALIEN_SOUND_CACHE > XDG_CACHE_HOME > ~/.cache の順）"""
+    directory = os.environ.get("ALIEN_SOUND_CACHE")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "alien", "sounds")
+
+
+def _code_fingerprint(code):
+    """関数の中身（バイトコードと定数）を再帰的にハッシュ用のバイト列にする"""
+    parts = [code.co_code]
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            parts.append(_code_fingerprint(const))
+        else:
+            parts.append(repr(const).encode())
+    return b"\0".join(parts)
+
+
+class SynthesizedSound:
+    """合成した効果音
+
+    合成が終わるまでは鳴らしても何も起きない（キャッシュが無い初回起動時、
+    バックグラウンドで合成している間も画面を先に出せるように）。
+    """
+
+    def __init__(self, name, volume=1.0, sound=None):
+        self.name = name
+        self.volume = volume
+        self.sound = sound
+        self._pcm = None
+        if sound is not None:
+            sound.set_volume(volume)
+
+    @property
+    def ready(self):
+        return self._resolve() is not None
+
+    def _resolve(self):
+        # 合成スレッドが用意したPCMは、使うときにメインスレッドでSoundにする
+        if self.sound is None and self._pcm is not None:
+            self.sound = pygame.sndarray.make_sound(self._pcm)
+            self.sound.set_volume(self.volume)
+            self._pcm = None
+        return self.sound
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.sound is not None:
+            self.sound.set_volume(volume)
+
+    def get_volume(self):
+        return self.volume
+
+    def play(self, *args, **kwargs):
+        sound = self._resolve()
+        if sound is None:
+            return None
+        return sound.play(*args, **kwargs)
+
+
+class SoundCache:
+    """合成した効果音のPCM（int16）をディスクに保存して使い回すキャッシュ
+
+    キャッシュのキーは、合成関数の名前・中身・引数とSYNTH_VERSIONのハッシュ。
+    保存済みなら.npyをメモリマップで読み込み、無ければ合成して保存する。
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+        self.pending = []
+        self.hits = 0
+        self.misses = 0
+        self._thread = None
+
+    def key(self, generate, params):
+        digest = hashlib.sha256()
+        defaults = list(generate.__defaults__ or ())
+        digest.update(json.dumps([generate.__name__, SYNTH_VERSION, defaults, params], sort_keys=True).encode())
+        digest.update(_code_fingerprint(generate.__code__))
+        return digest.hexdigest()[:24]
+
+    def path_for(self, generate, params):
+        return os.path.join(self.directory, f"{generate.__name__}-{self.key(generate, params)}.npy")
+
+    def load(self, generate, volume=1.0, **params):
+        """合成関数generate(**params)の効果音を返す（キャッシュに無ければ合成待ちに登録する）"""
+        sound = SynthesizedSound(generate.__name__, volume)
+        path = self.path_for(generate, params)
+        try:
+            pcm = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            self.misses += 1
+            self.pending.append((sound, generate, params, path))
+        else:
+            self.hits += 1
+            sound.sound = pygame.sndarray.make_sound(pcm)
+            sound.sound.set_volume(volume)
+        return sound
+
+    def _synthesize(self, sound, generate, params, path):
+        pcm = np.ascontiguousarray(generate(**params), dtype=np.int16)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                np.save(f, pcm)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write sound cache {path}: {e}")
+        sound._pcm = pcm
+
+    def _synthesize_pending(self):
+        pending, self.pending = self.pending, []
+        for job in pending:
+            self._synthesize(*job)
+
+    def synthesize_pending(self, background=True):
+        """合成待ちの効果音を合成する（backgroundならスレッドで、使えない環境ではその場で）"""
+        if not self.pending:
+            return
+        if background and sys.platform != "emscripten":
+            self._thread = threading.Thread(target=self._synthesize_pending, name="sound-synth", daemon=True)
+            try:
+                self._thread.start()
+                return
+            except RuntimeError:
+                self._thread = None
+        self._synthesize_pending()
+
+    def wait(self, timeout=None):
+        """バックグラウンドの合成が終わるまで待つ"""
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,132 @@
+from collections import namedtuple
+
+import pygame
+
+# 効果音ごとの鳴らし方
+# max_voices: 同時に鳴らせる数（鳴っている数がこれに達していたら新しく鳴らさない）
+# min_interval: 前回鳴らしてから次に鳴らせるまでの最短間隔（秒）
+# priority: チャンネルが足りないとき、これより低い優先度の音を止めて鳴らす
+SoundPolicy = namedtuple("SoundPolicy", "max_voices min_interval priority")
+
+DEFAULT_POLICY = SoundPolicy(max_voices=2, min_interval=0.0, priority=0)
+
+
+class DispatchedSound:
+    """SoundDispatcherを通して鳴らす効果音（SynthesizedSoundの代わりにそのまま使える）"""
+
+    def __init__(self, dispatcher, name, sound):
+        self.dispatcher = dispatcher
+        self.name = name
+        self.sound = sound
+
+    @property
+    def ready(self):
+        return self.sound.ready
+
+    def set_volume(self, volume):
+        self.sound.set_volume(volume)
+
+    def get_volume(self):
+        return self.sound.get_volume()
+
+    def play(self):
+        if not self.sound.ready:
+            return None
+        return self.dispatcher.play(self.name, self.sound.sound)
+
+
+class SoundDispatcher:
+    """同時発音数を制限して効果音を鳴らす
+
+    pygame.mixer.Sound.play() は空いたチャンネルが無いと黙って鳴らない（爆発が重なると
+    後から鳴らした大事な効果音ほど消える）うえに、BGMのチャンネルも効果音に使われてしまう。
+    ここではBGM用に先頭のチャンネルを予約し、残りのチャンネルを効果音ごとのSoundPolicyに従って割り当てる:
+    - 同じ効果音が max_voices 個鳴っている、または min_interval 以内に鳴らしたばかりなら鳴らさない
+    - 空いたチャンネルが無ければ、優先度が一番低く一番古い音を止めて鳴らす（自分より低いものが無ければ鳴らさない）
+
+    clockは now() でゲーム内の経過時間（秒）を返すもの（FrameClockなど）。
+    """
+
+    def __init__(self, policies=None, clock=None, channels=16):
+        self.policies = dict(policies or {})
+        self.clock = clock
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(1)  # 予約したチャンネルはSound.play()やfind_channel()で使われない
+        self.bgm_channel = pygame.mixer.Channel(0)
+        self.channels = [pygame.mixer.Channel(i) for i in range(1, channels)]
+        self.voices = [None] * len(self.channels)  # チャンネルごとの (名前, 優先度, 鳴らし始めた時刻)
+        self.last_played = {}
+
+        # 調整用のカウンタ
+        self.played = 0
+        self.dropped_voices = 0  # max_voicesに達していて鳴らさなかった
+        self.dropped_retrigger = 0  # min_interval以内なので鳴らさなかった
+        self.dropped_busy = 0  # チャンネルが埋まっていて止められる音も無かった
+        self.stolen = 0  # 優先度の低い音を止めて鳴らした
+        self.dropped_by_sound = {}  # 効果音ごとの鳴らさなかった数
+
+    def wrap(self, name, sound):
+        """soundをこのディスパッチャを通して鳴らす効果音にする"""
+        return DispatchedSound(self, name, sound)
+
+    def _now(self):
+        return self.clock.now() if self.clock is not None else pygame.time.get_ticks() / 1000
+
+    def play(self, name, sound):
+        """効果音を鳴らし、使ったチャンネルを返す（鳴らさなかった場合はNone）"""
+        policy = self.policies.get(name, DEFAULT_POLICY)
+        now = self._now()
+        last = self.last_played.get(name)
+        if last is not None and now - last < policy.min_interval:
+            self.dropped_retrigger += 1
+            return self._drop(name)
+
+        free = None
+        playing = 0
+        victim = None
+        for index, channel in enumerate(self.channels):
+            voice = self.voices[index]
+            if voice is None or not channel.get_busy():
+                self.voices[index] = None
+                if free is None:
+                    free = index
+                continue
+            if voice[0] == name:
+                playing += 1
+            # 止める候補は優先度が低い順、同じなら古い順
+            if voice[1] < policy.priority and (victim is None or voice[1:] < self.voices[victim][1:]):
+                victim = index
+        if playing >= policy.max_voices:
+            self.dropped_voices += 1
+            return self._drop(name)
+
+        if free is None:
+            if victim is None:
+                self.dropped_busy += 1
+                return self._drop(name)
+            free = victim
+            self.channels[free].stop()
+            self.stolen += 1
+
+        channel = self.channels[free]
+        channel.play(sound)
+        self.voices[free] = (name, policy.priority, now)
+        self.last_played[name] = now
+        self.played += 1
+        return channel
+
+    def _drop(self, name):
+        self.dropped_by_sound[name] = self.dropped_by_sound.get(name, 0) + 1
+        return None
+
+    def stats(self):
+        """鳴らした数と、鳴らさなかった・止めた数の累計を返す"""
+        return {
+            "played": self.played,
+            "dropped_voices": self.dropped_voices,
+            "dropped_retrigger": self.dropped_retrigger,
+            "dropped_busy": self.dropped_busy,
+            "stolen": self.stolen,
+            "dropped_by_sound": dict(self.dropped_by_sound),
+            "channels": len(self.channels),
+        }
@@ -0,0 +1,65 @@
+class SpatialHash:
+    """一様グリッドによる衝突判定のブロードフェーズ
+
+    オブジェクトを矩形が重なるセルに登録し、query()では問い合わせ矩形と
+    同じセルにいるオブジェクトだけを候補として返す。
+    候補は登録順に並べて返すので、総当たりの場合と判定順が変わらない。
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._next_order = 0
+
+    def __len__(self):
+        return self._next_order
+
+    def clear(self):
+        """全オブジェクトの登録を解除する"""
+        self.cells.clear()
+        self._next_order = 0
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (
+            range(rect.left // size, (rect.right - 1) // size + 1),
+            range(rect.top // size, (rect.bottom - 1) // size + 1),
+        )
+
+    def insert(self, obj, rect=None):
+        """オブジェクトを登録する（rectを省略した場合はobj.rectを使用）"""
+        if rect is None:
+            rect = obj.rect
+        entry = (self._next_order, obj)
+        self._next_order += 1
+
+        cells = self.cells
+        columns, rows = self._cell_range(rect)
+        for cx in columns:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [entry]
+                else:
+                    bucket.append(entry)
+
+    def rebuild(self, objects):
+        """登録をすべて作り直す（毎フレームの先頭で呼ぶ）"""
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+
+    def query(self, rect):
+        """rectと同じセルにいるオブジェクトを登録順で返す"""
+        cells = self.cells
+        columns, rows = self._cell_range(rect)
+        found = {}
+        for cx in columns:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for order, obj in bucket:
+                        found[order] = obj
+        if len(found) <= 1:
+            return list(found.values())
+        return [found[order] for order in sorted(found)]
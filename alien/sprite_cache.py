@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+import pygame
+
+
+def to_display_format(surface, alpha=True):
+    """画面のピクセル形式に変換する（画面がまだ無い場合はそのまま返す）"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def to_colorkey_format(surface, colorkey):
+    """colorkeyの色を透明にしたRLE圧縮のスプライトにする（半透明の無い絵はアルファ付きより速く転送できる）"""
+    surface = to_display_format(surface, alpha=False)
+    surface.set_colorkey(colorkey, pygame.RLEACCEL)
+    return surface
+
+
+class SpriteCache:
+    """キーごとに一度だけ描画したスプライトを使い回すキャッシュ
+
+    render(key) がキーに対応するSurfaceを描画して返す。
+    max_entriesを指定した場合は、最も長く使われていないものから破棄する（LRU）。
+    """
+
+    def __init__(self, render, max_entries=None):
+        self.render = render
+        self.max_entries = max_entries
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def get(self, key):
+        """キーに対応するスプライトを返す（無ければ描画して登録）"""
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = self.render(key)
+            self._store(key, sprite)
+        else:
+            self.hits += 1
+            if self.max_entries is not None:
+                self.sprites.move_to_end(key)
+        return sprite
+
+    def _store(self, key, sprite):
+        self.sprites[key] = sprite
+        if self.max_entries is not None:
+            while len(self.sprites) > self.max_entries:
+                self.sprites.popitem(last=False)
+                self.evictions += 1
+
+    def prebuild(self, keys):
+        """起動時などにまとめて描画しておく"""
+        for key in keys:
+            if key not in self.sprites:
+                self._store(key, self.render(key))
+
+    def clear(self):
+        """全スプライトを破棄する（画面モード変更時など）"""
+        self.sprites.clear()
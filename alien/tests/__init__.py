@@ -0,0 +1,5 @@
+"""
+テストモジュール
+
+ゲームの部品（衝突判定・コンテナ・再生・チャンク生成など）のユニットテスト
+"""
@@ -0,0 +1,17 @@
+"""
+pytest設定ファイル
+
+ゲームのモジュールをimportできるようにし、画面と音を使わずに実行する
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# pygameのimport前に設定しておく必要がある
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# alienディレクトリをパスに追加
+sys.path.insert(0, str(Path(__file__).parent.parent))
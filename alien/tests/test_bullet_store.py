@@ -0,0 +1,141 @@
+"""
+bullet_store.py のテスト
+
+画面外・寿命切れの弾の削除と、上限を超えたときの古い弾の破棄を確認する
+"""
+
+from bullet_store import BulletStore
+from entity_pool import EntityPool
+
+
+class Bullet:
+    """位置と速度だけを持つテスト用の弾"""
+
+    def __init__(self, x, y, vx=0.0, vy=0.0):
+        self.reset(x, y, vx, vy)
+
+    def reset(self, x, y, vx=0.0, vy=0.0):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.active = True
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+
+
+def make_store(**kwargs):
+    return BulletStore(800, 600, **kwargs)
+
+
+class TestBulletStore:
+    """エイリアンの弾のコンテナのテスト"""
+
+    def test_画面内の弾は残る(self):
+        """画面内を飛んでいる弾は消さずに動かす"""
+        store = make_store()
+        bullet = Bullet(400, 300, vx=-2)
+        store.add(bullet)
+        store.update(camera_x=0)
+
+        assert list(store) == [bullet]
+        assert bullet.x == 398
+        assert bullet.age == 1
+
+    def test_左に抜けた弾を消す(self):
+        """カメラは左に戻らないので、画面の左に抜けた弾は消す"""
+        store = make_store(margin=100)
+        bullet = Bullet(950, 300, vx=-10)
+        store.add(bullet)
+        store.update(camera_x=1100)
+
+        assert len(store) == 0
+        assert not bullet.active
+        assert store.culled_offscreen == 1
+
+    def test_上下に抜けた弾を消す(self):
+        """画面の上下にマージンより離れた弾は消す"""
+        store = make_store(margin=100)
+        store.add(Bullet(400, -150))
+        store.add(Bullet(400, 750))
+        store.update(camera_x=0)
+
+        assert len(store) == 0
+        assert store.culled_offscreen == 2
+
+    def test_右にいる弾は向きで判断する(self):
+        """画面の右にいる弾は、右へ進んでいれば消し、左へ進んでいれば残す"""
+        store = make_store(margin=100)
+        leaving = Bullet(1000, 300, vx=5)
+        coming = Bullet(1000, 300, vx=-5)
+        store.add(leaving)
+        store.add(coming)
+        store.update(camera_x=0)
+
+        assert list(store) == [coming]
+
+    def test_寿命切れの弾を消す(self):
+        """max_lifetimeフレーム経った弾は画面内でも消す"""
+        store = make_store(max_lifetime=3)
+        store.add(Bullet(400, 300))
+        for _ in range(2):
+            store.update(camera_x=0)
+        assert len(store) == 1
+
+        store.update(camera_x=0)
+        assert len(store) == 0
+        assert store.culled_expired == 1
+
+    def test_上限を超えたら古い弾を捨てる(self):
+        """max_bulletsを超えて追加すると、最も古い弾から捨てる"""
+        store = make_store(max_bullets=3)
+        bullets = [Bullet(400 + i, 300) for i in range(5)]
+        for bullet in bullets:
+            store.add(bullet)
+
+        assert list(store) == bullets[2:]
+        assert not bullets[0].active and not bullets[1].active
+        assert store.evicted == 2
+
+    def test_命中した弾を取り除く(self):
+        """removeした弾は非アクティブになり、数えられる"""
+        store = make_store()
+        bullet = Bullet(400, 300)
+        store.add(bullet)
+        store.remove(bullet)
+
+        assert len(store) == 0
+        assert not bullet.active
+        assert store.removed == 1
+
+    def test_取り除いた弾をプールに戻す(self):
+        """poolを指定した場合は、削除・破棄した弾を全てプールに戻す"""
+        pool = EntityPool(Bullet)
+        store = make_store(max_bullets=2, max_lifetime=1, pool=pool)
+        for i in range(3):
+            store.add(pool.acquire(400 + i, 300))  # 1発は上限で破棄
+        store.remove(next(iter(store)))  # 1発は命中
+        store.update(camera_x=0)  # 残りは寿命切れ
+
+        assert len(store) == 0
+        assert pool.released == 3
+        assert len(pool.free) == 3
+
+    def test_statsの集計(self):
+        """statsは生存数と削除理由ごとの累計を返す"""
+        store = make_store(max_bullets=2)
+        for i in range(3):
+            store.add(Bullet(400 + i, 300))
+        store.add(Bullet(400, -500))
+        store.update(camera_x=0)
+
+        assert store.stats() == {
+            "live": 1,
+            "spawned": 4,
+            "culled_offscreen": 1,
+            "culled_expired": 0,
+            "evicted": 2,
+            "removed": 0,
+        }
@@ -0,0 +1,100 @@
+"""
+entity_pool.py のテスト
+
+オブジェクトの使い回しと、リストからの一括削除を確認する
+"""
+
+from entity_pool import EntityPool, compact
+
+
+class Shot:
+    """reset()で初期化し直せるテスト用のオブジェクト"""
+
+    created = 0
+
+    def __init__(self, x, y=0, power=1):
+        Shot.created += 1
+        self.reset(x, y, power)
+
+    def reset(self, x, y=0, power=1):
+        self.x = x
+        self.y = y
+        self.power = power
+        self.active = True
+
+
+class TestEntityPool:
+    """フリーリストのテスト"""
+
+    def test_空きが無ければ新しく作る(self):
+        """最初のacquireはコンストラクタで作る"""
+        pool = EntityPool(Shot)
+        shot = pool.acquire(10, y=20, power=3)
+
+        assert (shot.x, shot.y, shot.power) == (10, 20, 3)
+        assert pool.misses == 1 and pool.hits == 0
+
+    def test_戻したオブジェクトを使い回す(self):
+        """releaseしたオブジェクトをresetして返す"""
+        pool = EntityPool(Shot)
+        shot = pool.acquire(10, power=3)
+        shot.active = False
+        pool.release(shot)
+
+        again = pool.acquire(50)
+        assert again is shot
+        assert (again.x, again.y, again.power, again.active) == (50, 0, 1, True)
+        assert pool.hits == 1
+
+    def test_使い回すと作らない(self):
+        """取り出しと戻しを繰り返しても、同時に使う数より多くは作らない"""
+        Shot.created = 0
+        pool = EntityPool(Shot)
+        for frame in range(100):
+            shots = [pool.acquire(frame) for _ in range(5)]
+            for shot in shots:
+                pool.release(shot)
+
+        assert Shot.created == 5
+        assert pool.stats() == {"free": 5, "hits": 495, "misses": 5, "released": 500, "discarded": 0}
+
+    def test_max_freeを超えた分は捨てる(self):
+        """空きはmax_free個までしか取っておかない"""
+        pool = EntityPool(Shot, max_free=2)
+        for shot in [Shot(i) for i in range(4)]:
+            pool.release(shot)
+
+        assert len(pool.free) == 2
+        assert pool.discarded == 2
+        assert pool.released == 4
+
+
+class TestCompact:
+    """リストの一括削除のテスト"""
+
+    def test_残すものの順番を保つ(self):
+        """keepがFalseのものだけを取り除き、残りの順番は変えない"""
+        items = [Shot(i) for i in range(10)]
+        kept = [shot for shot in items if shot.x % 3]
+        compact(items, lambda shot: shot.x % 3)
+
+        assert items == kept
+
+    def test_取り除いたものをreleaseに渡す(self):
+        """取り除いたものを元の順番でreleaseに渡す"""
+        pool = EntityPool(Shot)
+        items = [Shot(i) for i in range(6)]
+        removed = [shot for shot in items if shot.x % 2 == 0]
+        compact(items, lambda shot: shot.x % 2, pool.release)
+
+        assert pool.free == removed
+        assert [shot.x for shot in items] == [1, 3, 5]
+
+    def test_同じリストのまま詰める(self):
+        """新しいリストを作らずに、渡したリストをその場で詰める"""
+        items = [Shot(i) for i in range(4)]
+        same = items
+        compact(items, lambda shot: False)
+
+        assert same is items
+        assert items == []
@@ -0,0 +1,105 @@
+"""
+event_log.py のテスト
+
+レベルによる絞り込みと、リングバッファに直近のイベントだけが残ることを確認する
+"""
+
+import io
+
+import pytest
+
+from event_log import DEBUG, ERROR, INFO, OFF, WARNING, EventLog, parse_level
+
+
+class Clock:
+    """frame属性だけを持つテスト用の時計"""
+
+    def __init__(self):
+        self.frame = 0
+
+
+class TestEventLog:
+    """デバッグ出力のリングバッファのテスト"""
+
+    def test_レベル名の変換(self):
+        """大文字・小文字を区別せずにレベル名を数値にし、知らない名前はValueError"""
+        assert parse_level("debug") == DEBUG
+        assert parse_level("INFO") == INFO
+        assert parse_level("Off") == OFF
+        with pytest.raises(ValueError):
+            parse_level("verbose")
+
+    def test_レベルより低いものは記録しない(self):
+        """levelより低いイベントは捨て、enabledもFalseになる"""
+        log = EventLog(level=INFO, echo_level=OFF)
+        log.debug("slime", "jump")
+        log.info("game", "start")
+
+        assert len(log) == 1
+        assert not log.enabled(DEBUG)
+        assert log.enabled(WARNING)
+
+    def test_直近のcapacity件だけ残す(self):
+        """capacityを超えた古いイベントは捨てるが、累計の記録数は数える"""
+        log = EventLog(capacity=3, level=DEBUG, echo_level=OFF)
+        for i in range(5):
+            log.debug("alien", "spawned %s", i)
+
+        assert len(log) == 3
+        assert log.recorded == 5
+        output = io.StringIO()
+        log.dump(output)
+        text = output.getvalue()
+        assert "2 older events dropped" in text
+        assert "spawned 1" not in text
+        assert "spawned 4" in text
+
+    def test_書き出すときに文字列にする(self):
+        """メッセージの組み立ては記録時ではなく書き出し時に行う"""
+
+        class Expensive:
+            formatted = 0
+
+            def __str__(self):
+                Expensive.formatted += 1
+                return "value"
+
+        log = EventLog(level=DEBUG, echo_level=OFF)
+        log.debug("perf", "%s", Expensive())
+        assert Expensive.formatted == 0
+
+        output = io.StringIO()
+        log.dump(output)
+        assert Expensive.formatted == 1
+        assert "value" in output.getvalue()
+
+    def test_フレーム番号を記録する(self):
+        """clockを渡した場合は記録時のフレーム番号を残す"""
+        clock = Clock()
+        log = EventLog(level=INFO, echo_level=OFF, clock=clock)
+        clock.frame = 42
+        log.info("game", "over")
+
+        assert log.events[0][0] == 42
+
+    def test_カテゴリで絞り込んで書き出す(self):
+        """dumpにcategoryを指定するとそのカテゴリだけを書き出す"""
+        log = EventLog(level=DEBUG, echo_level=OFF)
+        log.debug("slime", "jump")
+        log.debug("alien", "spawn")
+        output = io.StringIO()
+        log.dump(output, category="alien")
+
+        assert "spawn" in output.getvalue()
+        assert "jump" not in output.getvalue()
+
+    def test_echo_level以上は標準エラー出力にも書く(self, capsys):
+        """echo_level以上のイベントは記録と同時に標準エラー出力に書く"""
+        log = EventLog(level=DEBUG, echo_level=ERROR)
+        log.warning("sound", "quiet")
+        log.error("game", "broken")
+
+        err = capsys.readouterr().err
+        assert "broken" in err
+        assert "quiet" not in err
+        assert len(log) == 2
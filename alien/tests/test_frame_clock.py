@@ -0,0 +1,61 @@
+"""
+frame_clock.py のテスト
+
+一定間隔のtickの数え方と、描画の補間係数を確認する
+"""
+
+import pytest
+
+from frame_clock import FixedTimestep, FrameClock
+
+
+class TestFrameClock:
+    """フレーム数で進む時計のテスト"""
+
+    def test_フレーム数から経過時間を返す(self):
+        """nowはフレーム数をfpsで割った秒数"""
+        clock = FrameClock(fps=60)
+        for _ in range(90):
+            clock.tick()
+
+        assert clock.now() == 1.5
+
+
+class TestFixedTimestep:
+    """一定間隔でシミュレーションを進めるアキュムレータのテスト"""
+
+    def test_最初のフレームは1tick進める(self):
+        """最初のadvanceはすぐに1tick進め、補間係数は0になる"""
+        timestep = FixedTimestep(tick_rate=60)
+
+        assert timestep.advance(10.0) == 1
+        assert timestep.alpha == 0.0
+
+    def test_経過時間に応じたtick数(self):
+        """貯まった時間のうちtickの間隔の分だけ進め、残りは次に持ち越す"""
+        timestep = FixedTimestep(tick_rate=100)
+        timestep.advance(0.0)
+
+        assert timestep.advance(0.025) == 2
+        assert timestep.alpha == pytest.approx(0.5)
+        assert timestep.advance(0.036) == 1
+        assert timestep.alpha == pytest.approx(0.6)
+
+    def test_描画が速ければtickを進めない(self):
+        """tickの間隔より短い間に描画した場合は0tickで、補間係数だけ進む"""
+        timestep = FixedTimestep(tick_rate=50)
+        timestep.advance(0.0)
+
+        assert timestep.advance(0.005) == 0
+        assert timestep.alpha == pytest.approx(0.25)
+        assert timestep.advance(0.015) == 0
+        assert timestep.alpha == pytest.approx(0.75)
+
+    def test_遅れすぎた分は捨てる(self):
+        """1回にmax_ticksを超える分は進めずに捨て、捨てたtick数を数える"""
+        timestep = FixedTimestep(tick_rate=60, max_ticks=5)
+        timestep.advance(0.0)
+
+        assert timestep.advance(1.0) == 5
+        assert timestep.dropped_ticks == 55
+        assert timestep.alpha == 0.0
@@ -0,0 +1,133 @@
+"""
+platform_index.py のテスト
+
+範囲検索・左からの削除・途中の削除が、全件を調べた場合と同じ結果になることを確認する
+"""
+
+import random
+
+import pygame
+import pytest
+
+from platform_index import PlatformIndex
+
+
+class Platform:
+    """rect属性だけを持つテスト用のプラットフォーム"""
+
+    def __init__(self, x, width=100):
+        self.rect = pygame.Rect(x, 300, width, 20)
+
+    def __repr__(self):
+        return f"Platform({self.rect.x})"
+
+
+def make_index(xs, width=100):
+    index = PlatformIndex()
+    platforms = [Platform(x, width) for x in xs]
+    for platform in platforms:
+        index.append(platform)
+    return index, platforms
+
+
+class TestPlatformIndex:
+    """プラットフォームの索引のテスト"""
+
+    def test_範囲と重なるものを返す(self):
+        """x方向で [x_min, x_max) と重なるプラットフォームを左から順に返す"""
+        index, platforms = make_index([0, 150, 300, 450])
+
+        assert index.query(120, 320) == platforms[1:3]
+        assert index.query(50, 60) == platforms[:1]
+
+    def test_範囲の端は含まない(self):
+        """右端がx_minちょうど、左端がx_maxちょうどのものは重ならない"""
+        index, platforms = make_index([0, 100, 200])
+
+        assert index.query(100, 200) == [platforms[1]]
+
+    def test_幅の違うプラットフォーム(self):
+        """左端がx_minより十分左でも、幅が広くて届いているものは返す"""
+        index = PlatformIndex()
+        wide = Platform(0, width=1000)
+        narrow = Platform(100, width=10)
+        index.append(wide)
+        index.append(narrow)
+
+        assert index.query(500, 600) == [wide]
+
+    def test_左から順に追加しないとエラー(self):
+        """並び順が崩れる追加はValueError"""
+        index, _ = make_index([100])
+
+        with pytest.raises(ValueError):
+            index.append(Platform(50))
+
+    def test_通り過ぎたものを取り除く(self):
+        """evict_beforeは右端がx以下になったものを左から取り除く"""
+        index, platforms = make_index([0, 150, 300])
+        index.evict_before(200)
+
+        assert list(index) == platforms[1:]
+        assert len(index) == 2
+        assert index.query(0, 1000) == platforms[1:]
+
+        # 右端がちょうどxのものも取り除く
+        index.evict_before(250)
+        assert list(index) == platforms[2:]
+
+    def test_取り除いた後も検索できる(self):
+        """先頭を取り除いた分を詰めた後も検索結果は変わらない"""
+        index, platforms = make_index(range(0, 100 * 200, 100))
+        index.evict_before(100 * 150)
+
+        assert len(index) == 50
+        assert index.query(100 * 160 + 50, 100 * 161 + 50) == platforms[160:162]
+        assert index.query(0, 100 * 150) == []
+
+    def test_途中のプラットフォームを取り除く(self):
+        """removeは指定したものだけを取り除き、無ければValueError"""
+        index, platforms = make_index([0, 150, 300])
+        index.remove(platforms[1])
+
+        assert list(index) == [platforms[0], platforms[2]]
+        with pytest.raises(ValueError):
+            index.remove(platforms[1])
+
+    def test_clearで空になる(self):
+        """clearの後は何も返さず、また追加できる"""
+        index, _ = make_index([0, 150])
+        index.clear()
+
+        assert len(index) == 0
+        assert index.query(-1000, 1000) == []
+        index.append(Platform(-50))
+        assert len(index) == 1
+
+    def test_全件を調べた場合と同じ結果になる(self):
+        """追加・左からの削除・途中の削除を繰り返しても、検索結果は全件を調べた場合と一致する"""
+        rng = random.Random(3)
+        index = PlatformIndex()
+        expected = []
+        x = 0
+        cut = 0
+        for step in range(3000):
+            x += rng.randint(0, 150)
+            platform = Platform(x, width=rng.randint(20, 200))
+            index.append(platform)
+            expected.append(platform)
+
+            if step % 7 == 0:
+                cut += rng.randint(0, 400)
+                index.evict_before(cut)
+                while expected and expected[0].rect.right <= cut:
+                    expected.pop(0)
+            if step % 13 == 0 and expected:
+                removed = rng.choice(expected)
+                index.remove(removed)
+                expected.remove(removed)
+
+            x_min = rng.randint(0, x)
+            x_max = x_min + rng.randint(0, 800)
+            assert index.query(x_min, x_max) == [p for p in expected if p.rect.right > x_min and p.rect.left < x_max]
+            assert list(index) == expected
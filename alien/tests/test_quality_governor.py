@@ -0,0 +1,127 @@
+"""
+quality_governor.py のテスト
+
+処理時間に応じた画質レベルの上げ下げ（ヒステリシス）と、手動のモード切り替えを確認する
+"""
+
+import pytest
+
+from quality_governor import QUALITY_MODES, QualityGovernor
+
+LEVELS = (("low", {"particles": 0.3}), ("medium", {"particles": 0.6}), ("high", {"particles": 1.0}))
+BUDGET = 0.010  # 10ms（下げる閾値は9ms、上げる閾値は5ms）
+
+
+def make_governor(**kwargs):
+    kwargs.setdefault("window", 10)
+    kwargs.setdefault("upgrade_hold", 30)
+    return QualityGovernor(LEVELS, budget=BUDGET, **kwargs)
+
+
+def feed(governor, frame_time, frames):
+    """同じ処理時間のフレームをframes回記録し、レベルが変わったときのレベル名の一覧を返す"""
+    return [governor.name for _ in range(frames) if governor.record(frame_time)]
+
+
+class TestQualityGovernor:
+    """画質レベルの自動調整のテスト"""
+
+    def test_最初は一番高いレベル(self):
+        """自動の場合は一番高いレベルから始める"""
+        governor = make_governor()
+
+        assert governor.name == "high"
+        assert governor.settings == {"particles": 1.0}
+
+    def test_重いと一段ずつ下げる(self):
+        """平均が予算に近づいたら一段下げ、平均を取り直してからさらに下げる"""
+        governor = make_governor()
+
+        assert feed(governor, 0.0095, 9) == []  # windowフレームたまるまでは変えない
+        assert feed(governor, 0.0095, 1) == ["medium"]
+        assert feed(governor, 0.0095, 9) == []
+        assert feed(governor, 0.0095, 1) == ["low"]
+        assert feed(governor, 0.0095, 100) == []  # 一番低いレベルより下には行かない
+        assert governor.settings == {"particles": 0.3}
+
+    def test_中間の処理時間では変えない(self):
+        """上げる閾値と下げる閾値の間ではレベルを変えない（行ったり来たりしない）"""
+        governor = make_governor()
+        feed(governor, 0.0095, 10)
+        assert governor.name == "medium"
+
+        assert feed(governor, 0.007, 1000) == []
+
+    def test_余裕が続いたときだけ上げる(self):
+        """平均が上げる閾値を下回る状態がupgrade_holdフレーム続いたら一段上げる"""
+        governor = make_governor()
+        feed(governor, 0.0095, 20)
+        assert governor.name == "low"
+
+        # windowがたまった後、upgrade_holdフレーム続くまでは上げない
+        assert feed(governor, 0.002, 10 + 29 - 1) == []
+        assert feed(governor, 0.002, 1) == ["medium"]
+        # 上げた後も平均を取り直してから、同じだけ続いたら次を上げる
+        assert feed(governor, 0.002, 10 + 29 - 1) == []
+        assert feed(governor, 0.002, 1) == ["high"]
+
+    def test_余裕が途切れたら数え直す(self):
+        """途中で中間の処理時間に戻ったら、余裕のあるフレームの数を数え直す"""
+        governor = make_governor(window=1)
+        feed(governor, 0.0095, 1)
+        assert governor.name == "medium"
+
+        assert feed(governor, 0.002, 29) == []
+        feed(governor, 0.007, 1)
+        assert feed(governor, 0.002, 29) == []
+        assert feed(governor, 0.002, 1) == ["high"]
+
+    def test_一瞬の遅れでは下げない(self):
+        """1フレームだけ重くても、直近windowフレームの平均が閾値を超えなければ下げない"""
+        governor = make_governor()
+        feed(governor, 0.003, 10)
+
+        assert feed(governor, 0.040, 1) == []  # 平均は (9*3 + 40) / 10 = 6.7ms
+        assert governor.name == "high"
+
+    def test_手動のレベルは固定(self):
+        """レベル名を指定した場合は、処理時間に関係なくそのレベルのまま"""
+        governor = make_governor(mode="medium")
+
+        assert governor.name == "medium"
+        assert feed(governor, 0.050, 100) == []
+        assert feed(governor, 0.001, 1000) == []
+        assert governor.name == "medium"
+
+    def test_知らないモードはエラー(self):
+        """autoとレベル名以外のモードはValueError"""
+        with pytest.raises(ValueError):
+            make_governor(mode="ultra")
+
+    def test_モードを順に切り替える(self):
+        """next_modeは auto → low → medium → high → auto の順に切り替える"""
+        governor = make_governor()
+
+        assert [governor.next_mode() for _ in range(len(QUALITY_MODES))] == ["low", "medium", "high", "auto"]
+
+    def test_autoに戻すと測り直す(self):
+        """autoに戻した直後は、前の処理時間を使わずに平均を取り直す"""
+        governor = make_governor(mode="low")
+        feed(governor, 0.001, 10)
+        governor.set_mode("auto")
+
+        assert governor.name == "low"
+        assert governor.average == 0.0
+
+    def test_statsの集計(self):
+        """statsはモード・レベル・平均の処理時間・予算・変更回数を返す"""
+        governor = make_governor()
+        feed(governor, 0.0095, 10)
+
+        assert governor.stats() == {
+            "mode": "auto",
+            "level": "medium",
+            "average_ms": 0.0,
+            "budget_ms": 10.0,
+            "changes": 1,
+        }
@@ -0,0 +1,123 @@
+"""
+replay.py のテスト
+
+キー入力の記録ファイルの保存・読み込みと、記録したプレイを再生すると同じ展開になることを確認する
+"""
+
+import pygame
+import pytest
+
+import main as game_module
+from replay import RECORDED_KEYS, InputRecorder, InputReplay, PressedKeys, encode_keys
+
+
+def scripted_keys(frame):
+    """右へ進み、ときどき左へ戻りながら、定期的にジャンプと射撃をする入力"""
+    pressed = {pygame.K_RIGHT if frame // 90 % 3 != 2 else pygame.K_LEFT}
+    if frame % 40 < 3:
+        pressed.add(pygame.K_UP)
+    if frame % 7 == 0:
+        pressed.add(pygame.K_SPACE)
+    return PressedKeys(pressed)
+
+
+def play(seed, keys_at, frames, recorder=None):
+    """ゲームをframesフレーム進め、毎フレームの状態の一覧を返す"""
+    game_module.frame_clock.frame = 0  # main()と同じく、ゲーム内の時計を0から始める
+    game_module.seed_random(seed)
+    game = game_module.Game()
+    trace = []
+    frame = 0
+    while frame < frames:
+        if not game.begin_frame():
+            continue  # ゲームオーバー中（main()と同じくキー入力を進めない）
+        keys = keys_at(frame)
+        frame += 1
+        if recorder is not None:
+            recorder.record(keys)
+        game.update(keys)
+        game.handle_collisions()
+        slime = game.slime
+        trace.append(
+            (
+                round(slime.x, 3),
+                round(slime.y, 3),
+                slime.form,
+                game.game_state.score,
+                len(game.alien_generator.aliens),
+                len(game.alien_bullets),
+            )
+        )
+    return trace
+
+
+class TestInputFile:
+    """記録ファイルのテスト"""
+
+    def test_保存と読み込みで同じキー状態になる(self, tmp_path):
+        """保存したキー状態とシードがそのまま読み込める"""
+        path = tmp_path / "play.rec"
+        recorder = InputRecorder(seed=1234)
+        frames = [scripted_keys(frame) for frame in range(500)]
+        for keys in frames:
+            recorder.record(keys)
+        recorder.save(path)
+
+        replay = InputReplay.load(path)
+        assert replay.seed == 1234
+        assert len(replay) == 500
+        for frame, keys in enumerate(frames):
+            for key in RECORDED_KEYS:
+                assert replay.keys_at(frame)[key] == keys[key]
+
+    def test_記録しないキーは押されていない扱い(self):
+        """RECORDED_KEYS以外のキーはビットマスクに入らない"""
+        keys = PressedKeys({pygame.K_a, pygame.K_UP})
+
+        assert encode_keys(keys) == 1 << RECORDED_KEYS.index(pygame.K_UP)
+
+    def test_キーは8個まで(self):
+        """1フレーム1バイトなので9個以上のキーは記録できない"""
+        with pytest.raises(ValueError):
+            InputRecorder(seed=0, key_codes=tuple(range(9)))
+
+    def test_別の形式のファイルはエラー(self, tmp_path):
+        """マジックが違うファイルはValueError"""
+        path = tmp_path / "other.rec"
+        path.write_bytes(b"XXXX" + bytes(32))
+
+        with pytest.raises(ValueError):
+            InputReplay.load(path)
+
+    def test_途中で切れたファイルはエラー(self, tmp_path):
+        """ヘッダのフレーム数と中身の数が合わなければValueError"""
+        path = tmp_path / "play.rec"
+        recorder = InputRecorder(seed=1)
+        for frame in range(10):
+            recorder.record(scripted_keys(frame))
+        recorder.save(path)
+        # フレーム数だけ書き換える
+        data = bytearray(path.read_bytes())
+        data[13:17] = (20).to_bytes(4, "little")
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(ValueError):
+            InputReplay.load(path)
+
+
+class TestReplayDeterminism:
+    """記録したプレイの再生のテスト"""
+
+    def test_再生すると同じ展開になる(self, tmp_path):
+        """記録したキー入力とシードで再生すると、毎フレームの状態が記録時と一致する"""
+        path = tmp_path / "play.rec"
+        recorder = InputRecorder(seed=7)
+        recorded = play(7, scripted_keys, 1200, recorder)
+        recorder.save(path)
+
+        replay = InputReplay.load(path)
+        assert play(replay.seed, replay.keys_at, len(replay)) == recorded
+
+    def test_シードが違えば展開が変わる(self):
+        """比較が意味を持つことの確認（シードを変えると展開が変わる）"""
+        assert play(7, scripted_keys, 1200) != play(8, scripted_keys, 1200)
@@ -0,0 +1,114 @@
+"""
+spatial_hash.py のテスト
+
+セルの境界をまたぐ矩形の検索と、総当たりと同じ結果になることを確認する
+"""
+
+import random
+
+import pygame
+
+from spatial_hash import SpatialHash
+
+
+class Item:
+    """rect属性だけを持つテスト用のオブジェクト"""
+
+    def __init__(self, name, x, y, width, height):
+        self.name = name
+        self.rect = pygame.Rect(x, y, width, height)
+
+    def __repr__(self):
+        return f"Item({self.name})"
+
+
+class TestSpatialHash:
+    """一様グリッドのブロードフェーズのテスト"""
+
+    def test_同じセルのオブジェクトが見つかる(self):
+        """問い合わせ矩形と同じセルにいるオブジェクトを返す"""
+        grid = SpatialHash(cell_size=100)
+        item = Item("a", 10, 10, 20, 20)
+        grid.insert(item)
+
+        assert grid.query(pygame.Rect(50, 50, 10, 10)) == [item]
+
+    def test_離れたセルのオブジェクトは返さない(self):
+        """別のセルにしかいないオブジェクトは候補にならない"""
+        grid = SpatialHash(cell_size=100)
+        grid.insert(Item("a", 10, 10, 20, 20))
+
+        assert grid.query(pygame.Rect(250, 250, 10, 10)) == []
+
+    def test_セルの境界をまたぐオブジェクト(self):
+        """境界をまたぐオブジェクトは重なる全てのセルから見つかる"""
+        grid = SpatialHash(cell_size=100)
+        item = Item("a", 90, 90, 20, 20)  # 4つのセルにまたがる
+        grid.insert(item)
+
+        for x, y in ((0, 0), (150, 0), (0, 150), (150, 150)):
+            assert grid.query(pygame.Rect(x, y, 10, 10)) == [item]
+        assert len(grid.cells) == 4
+
+    def test_右端と下端は含まない(self):
+        """右端・下端がちょうどセルの境界にある矩形は次のセルに登録しない"""
+        grid = SpatialHash(cell_size=100)
+        grid.insert(Item("a", 0, 0, 100, 100))
+
+        assert list(grid.cells) == [(0, 0)]
+        assert grid.query(pygame.Rect(100, 0, 10, 10)) == []
+
+    def test_負の座標(self):
+        """画面外（負の座標）のオブジェクトも検索できる"""
+        grid = SpatialHash(cell_size=64)
+        item = Item("a", -70, -10, 20, 20)
+        grid.insert(item)
+
+        assert grid.query(pygame.Rect(-60, -5, 5, 5)) == [item]
+        assert grid.query(pygame.Rect(10, 10, 5, 5)) == []
+
+    def test_複数セルにいても1回だけ返す(self):
+        """問い合わせ矩形も複数のセルにまたがる場合に重複しない"""
+        grid = SpatialHash(cell_size=50)
+        item = Item("a", 0, 0, 200, 200)
+        grid.insert(item)
+
+        assert grid.query(pygame.Rect(0, 0, 200, 200)) == [item]
+
+    def test_登録順に返す(self):
+        """候補は登録順に並ぶ（総当たりの場合と判定順が変わらない）"""
+        grid = SpatialHash(cell_size=100)
+        items = [Item("c", 150, 10, 10, 10), Item("a", 10, 10, 10, 10), Item("b", 90, 10, 20, 10)]
+        for item in items:
+            grid.insert(item)
+
+        assert grid.query(pygame.Rect(0, 0, 200, 50)) == items
+
+    def test_rebuildで登録を作り直す(self):
+        """rebuildは前の登録を消してから登録し直す"""
+        grid = SpatialHash(cell_size=100)
+        old = Item("old", 10, 10, 10, 10)
+        new = Item("new", 20, 20, 10, 10)
+        grid.insert(old)
+        grid.rebuild([new])
+
+        assert grid.query(pygame.Rect(0, 0, 100, 100)) == [new]
+        assert len(grid) == 1
+
+    def test_総当たりと同じ結果になる(self):
+        """重なっているオブジェクトは必ず候補に含まれ、候補を絞り込むと総当たりと一致する"""
+        rng = random.Random(1)
+        grid = SpatialHash(cell_size=64)
+        items = [
+            Item(i, rng.randint(-200, 1000), rng.randint(-200, 800), rng.randint(1, 150), rng.randint(1, 150))
+            for i in range(300)
+        ]
+        grid.rebuild(items)
+
+        for _ in range(200):
+            query = pygame.Rect(
+                rng.randint(-200, 1000), rng.randint(-200, 800), rng.randint(1, 300), rng.randint(1, 300)
+            )
+            expected = [item for item in items if query.colliderect(item.rect)]
+            candidates = grid.query(query)
+            assert [item for item in candidates if query.colliderect(item.rect)] == expected
@@ -0,0 +1,193 @@
+"""
+world_chunks.py のテスト
+
+同じシードからは同じチャンクができること、チャンクの読み込み・手放しとキャッシュを確認する
+"""
+
+import random
+
+import pytest
+
+import main as game_module
+from world_chunks import ChunkStream, WorldChunk, chunk_random, chunk_seed, spaced_positions
+
+
+def snapshot(chunk):
+    return (chunk.index, chunk.left, chunk.right, chunk.platforms, chunk.aliens, chunk.apples)
+
+
+class CountingPlan:
+    """作ったチャンクの数を数えるテスト用のplan関数"""
+
+    def __init__(self, width=1000):
+        self.width = width
+        self.calls = []
+
+    def __call__(self, world_seed, index):
+        self.calls.append((world_seed, index))
+        rng = chunk_random(world_seed, index)
+        left = index * self.width
+        return WorldChunk(index, left, left + self.width, [(left + rng.randint(0, 999), 0, False)], [], [])
+
+
+class TestChunkSeed:
+    """チャンクごとの乱数のテスト"""
+
+    def test_同じシードと番号なら同じ乱数(self):
+        """シードとチャンク番号が同じなら同じ乱数列になる"""
+        assert chunk_random(5, 3).random() == chunk_random(5, 3).random()
+
+    def test_番号やシードが違えば別の乱数(self):
+        """隣のチャンクや別のシードとは乱数のシードが重ならない"""
+        seeds = {chunk_seed(world_seed, index) for world_seed in range(20) for index in range(50)}
+        assert len(seeds) == 20 * 50
+
+
+class TestSpacedPositions:
+    """等間隔でない配置のテスト"""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_間隔が範囲に収まる(self, seed):
+        """並べた位置の間隔も、最後の位置とendの間隔もmin_step〜max_stepに収まる"""
+        rng = random.Random(seed)
+        start = rng.randint(0, 100)
+        end = start + rng.randint(150, 3000)
+        positions = spaced_positions(rng, start, end, 150, 300)
+
+        assert positions[0] == start
+        for left, right in zip(positions, positions[1:] + [end]):
+            assert 150 <= right - left <= 300
+
+    def test_stepを指定すると決まった間隔(self):
+        """stepを指定した場合はその間隔で並べる（最後だけendとの間隔に合わせて詰める）"""
+        positions = spaced_positions(random.Random(0), 0, 1000, 150, 300, step=150)
+
+        assert positions[:5] == [0, 150, 300, 450, 600]
+        assert 150 <= 1000 - positions[-1] <= 300
+
+
+class TestWorldPlan:
+    """ゲームのワールドの生成のテスト"""
+
+    def test_同じシードなら同じワールド(self):
+        """同じシードとチャンク番号からは、いつ作っても同じ中身のチャンクができる"""
+        for index in range(10):
+            assert snapshot(game_module.plan_chunk(99, index)) == snapshot(game_module.plan_chunk(99, index))
+
+    def test_別のシードなら別のワールド(self):
+        """シードを変えるとチャンクの中身が変わる"""
+        first = [snapshot(game_module.plan_chunk(1, index)) for index in range(1, 5)]
+        second = [snapshot(game_module.plan_chunk(2, index)) for index in range(1, 5)]
+        assert first != second
+
+    def test_作る順番に関係なく同じ(self):
+        """チャンクは前のチャンクの乱数に頼らないので、作る順番を変えても同じになる"""
+        forward = [snapshot(game_module.plan_chunk(7, index)) for index in range(8)]
+        backward = [snapshot(game_module.plan_chunk(7, index)) for index in reversed(range(8))]
+        assert forward == backward[::-1]
+
+    def test_チャンクの境目でも間隔が保たれる(self):
+        """隣り合うチャンクをつなげても、プラットフォームの間隔が範囲に収まる"""
+        xs = [x for index in range(1, 20) for x, _, _ in game_module.plan_chunk(3, index).platforms]
+        gaps = [right - left for left, right in zip(xs, xs[1:])]
+        width = game_module.PLATFORM_WIDTH
+        assert all(width + 50 <= gap <= width + 200 for gap in gaps)
+
+    def test_ゲームの乱数を使わない(self):
+        """チャンクの生成は全体の乱数（random）を進めない"""
+        random.seed(0)
+        expected = random.random()
+        random.seed(0)
+        game_module.plan_chunk(11, 4)
+        assert random.random() == expected
+
+
+class TestGameWorldSeed:
+    """ゲームをやり直したときのワールドのシードのテスト"""
+
+    def test_やり直すと別のワールドになる(self):
+        """ゲームオーバー後のやり直しでは新しいシードのワールドにする"""
+        game_module.seed_random(3)
+        game = game_module.Game()
+        first = game.world.world_seed
+        game.reset()
+
+        assert game.world.world_seed != first
+
+    def test_やり直した後のワールドも開始時のシードで決まる(self):
+        """新しいシードは全体の乱数から決めるので、同じシードで始めれば同じ順番のワールドになる"""
+
+        def world_seeds(seed):
+            game_module.seed_random(seed)
+            game = game_module.Game()
+            seeds = [game.world.world_seed]
+            for _ in range(3):
+                game.reset()
+                seeds.append(game.world.world_seed)
+            return seeds
+
+        assert world_seeds(9) == world_seeds(9)
+
+
+class TestChunkStream:
+    """チャンクの読み込みとキャッシュのテスト"""
+
+    def test_カメラの先のチャンクを順に読み込む(self):
+        """activateはxより左から始まる未読み込みのチャンクを順に返す"""
+        stream = ChunkStream(CountingPlan(), 1000, world_seed=1, prefetch=0)
+
+        assert [chunk.index for chunk in stream.activate(1500)] == [0, 1]
+        assert stream.activate(1800) == []
+        assert [chunk.index for chunk in stream.activate(2001)] == [2]
+
+    def test_通り過ぎたチャンクを手放す(self):
+        """releaseは右端がx以下のチャンクを手放し、手放した範囲の右端を返す"""
+        stream = ChunkStream(CountingPlan(), 1000, world_seed=1, prefetch=0)
+        stream.activate(3500)
+
+        assert stream.release(999) is None
+        assert stream.release(2000) == 2000
+        assert [chunk.index for chunk in stream.active] == [2, 3]
+
+    def test_同じシードなら同じチャンク(self):
+        """別のストリームでも、同じシードなら同じチャンクが読み込まれる"""
+        first = ChunkStream(CountingPlan(), 1000, world_seed=42, prefetch=0)
+        second = ChunkStream(CountingPlan(), 1000, world_seed=42, prefetch=0)
+
+        assert [snapshot(c) for c in first.activate(5000)] == [snapshot(c) for c in second.activate(5000)]
+
+    def test_同じシードでやり直すとキャッシュを使う(self):
+        """resetで同じシードに戻した場合（同じワールドを読み込み直す場合）は、キャッシュしたチャンクを使う"""
+        plan = CountingPlan()
+        stream = ChunkStream(plan, 1000, world_seed=42, prefetch=0)
+        before = [snapshot(c) for c in stream.activate(3000)]
+        stream.reset(42)
+        after = [snapshot(c) for c in stream.activate(3000)]
+
+        assert after == before
+        assert len(plan.calls) == 3
+        assert stream.stats()["hits"] == 3
+
+    def test_別のシードでやり直すと作り直す(self):
+        """resetで別のシードにした場合は新しく作る"""
+        plan = CountingPlan()
+        stream = ChunkStream(plan, 1000, world_seed=1, prefetch=0)
+        stream.activate(1000)
+        stream.reset(2)
+        stream.activate(1000)
+
+        assert plan.calls == [(1, 0), (2, 0)]
+
+    def test_キャッシュの上限(self):
+        """cache_sizeを超えたら古いチャンクから捨てる"""
+        stream = ChunkStream(CountingPlan(), 1000, world_seed=1, prefetch=0, cache_size=3)
+        stream.activate(5000)
+
+        assert [index for _, index in stream.cache] == [2, 3, 4]
+
+    def test_先読みしても同じチャンク(self):
+        """ワーカースレッドで先に作ったチャンクも、その場で作ったものと同じになる"""
+        prefetched = ChunkStream(CountingPlan(), 1000, world_seed=5, prefetch=2)
+        inline = ChunkStream(CountingPlan(), 1000, world_seed=5, prefetch=0)
+
+        assert [snapshot(c) for c in prefetched.activate(8000)] == [snapshot(c) for c in inline.activate(8000)]
@@ -0,0 +1,159 @@
+import random
+import sys
+import threading
+from collections import OrderedDict
+
+
+def chunk_seed(world_seed, index):
+    """ワールドのシードとチャンク番号から、そのチャンク用の乱数のシードを求める（SplitMix64）"""
+    z = (world_seed * 0x9E3779B97F4A7C15 + index + 1) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return z ^ (z >> 31)
+
+
+def chunk_random(world_seed, index):
+    """そのチャンク専用の乱数生成器"""
+    return random.Random(chunk_seed(world_seed, index))
+
+
+def spaced_positions(rng, start, end, min_step, max_step, step=None):
+    """startからendの手前まで、間隔がmin_step〜max_stepになるように並べた位置を返す
+
+    最後の位置とendの間隔も同じ範囲に収めるので、次のチャンクの最初の位置をendにすれば
+    チャンクの境目でも間隔が保たれる（end - start >= min_step であること）。
+    stepを指定した場合は、その間隔で並べる（最初のチャンクの決まった配置用）。
+    """
+    positions = []
+    x = start
+    while end - x > max_step:
+        positions.append(x)
+        x += min(step or rng.randint(min_step, max_step), end - x - min_step)
+    positions.append(x)
+    return positions
+
+
+class WorldChunk:
+    """ワールドを一定の幅で区切った1区画の生成内容
+
+    platforms / aliens / apples は生成する物の (x, y, 種類) のタプルのリスト。
+    中身はシードから決まるただのデータなので、ワーカースレッドで作ってキャッシュしておける。
+    """
+
+    __slots__ = ("index", "left", "right", "platforms", "aliens", "apples")
+
+    def __init__(self, index, left, right, platforms, aliens, apples):
+        self.index = index
+        self.left = left
+        self.right = right
+        self.platforms = platforms
+        self.aliens = aliens
+        self.apples = apples
+
+
+class ChunkStream:
+    """カメラの周りのチャンクを順に読み込み、通り過ぎたものをまとめて手放す
+
+    plan(world_seed, index) はそのチャンクのWorldChunkを返す関数（ゲームの状態を触らないこと）。
+    activate(x) は左端がxより左のチャンクを順に返し、release(x) は右端がx以下になったチャンクを手放す。
+    読み込んだチャンクの次の prefetch 個はワーカースレッドで先に作っておく（使えない環境ではその場で作る）。
+    作ったチャンクは (シード, 番号) ごとに cache_size 個までキャッシュするので、
+    同じシードでやり直した場合は作り直さずに済む。
+    """
+
+    def __init__(self, plan, chunk_width, world_seed=0, prefetch=2, cache_size=64):
+        self.plan = plan
+        self.chunk_width = chunk_width
+        self.prefetch = prefetch
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue = []
+        self._ready = threading.Condition(self._lock)
+        self._thread = None
+        self.reset(world_seed)
+
+        # キャッシュの効き具合の確認用
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self, world_seed):
+        """別のシードで最初のチャンクからやり直す"""
+        self.world_seed = world_seed
+        self.next_index = 0  # 次に読み込むチャンク
+        self.active = []
+
+    def _plan(self, key):
+        chunk = self.plan(*key)
+        with self._lock:
+            self.cache[key] = chunk
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return chunk
+
+    def _worker(self):
+        while True:
+            with self._ready:
+                while not self._queue:
+                    self._ready.wait()
+                key = self._queue.pop(0)
+                if key in self.cache:
+                    continue
+            self._plan(key)
+
+    def _request(self, key):
+        """ワーカースレッドにチャンクを作らせる"""
+        if self._thread is None:
+            if sys.platform == "emscripten":
+                return
+            self._thread = threading.Thread(target=self._worker, name="world-chunks", daemon=True)
+            try:
+                self._thread.start()
+            except RuntimeError:
+                self.prefetch = 0
+                return
+        with self._ready:
+            if key not in self.cache and key not in self._queue:
+                self._queue.append(key)
+                self._ready.notify()
+
+    def get(self, index):
+        """チャンクを返す（キャッシュに無ければその場で作る）"""
+        key = (self.world_seed, index)
+        with self._lock:
+            chunk = self.cache.get(key)
+            if chunk is not None:
+                self.cache.move_to_end(key)
+        if chunk is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            chunk = self._plan(key)
+        for ahead in range(1, self.prefetch + 1):
+            self._request((self.world_seed, index + ahead))
+        return chunk
+
+    def activate(self, x):
+        """左端がxより左にある未読み込みのチャンクを読み込み、読み込んだチャンクのリストを返す"""
+        chunks = []
+        while self.next_index * self.chunk_width < x:
+            chunk = self.get(self.next_index)
+            self.active.append(chunk)
+            chunks.append(chunk)
+            self.next_index += 1
+        return chunks
+
+    def release(self, x):
+        """右端がx以下になったチャンクを手放し、手放した範囲の右端を返す（無ければNone）"""
+        released = None
+        while self.active and self.active[0].right <= x:
+            released = self.active.pop(0).right
+        return released
+
+    def stats(self):
+        return {
+            "active": len(self.active),
+            "cached": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -3,6 +3,7 @@ import math
 import random
 import sys
 from grenade import Grenade
+from font_cache import load_font
 
 pygame.init()
 pygame.mixer.pre_init(frequency=22050, size=-16, channels=2, buffer=512)
@@ -76,6 +77,12 @@ def create_sound_effects():
     except:
         return None, None, None, None, None
 
+# 日本語フォントの候補（上から順に探す）
+JAPANESE_FONTS = (
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/TTF/HackGen-Regular.ttf",
+)
+
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 GAME_WIDTH = int(SCREEN_WIDTH * 0.65)
@@ -834,19 +841,9 @@ class Game:
             self.joystick = pygame.joystick.Joystick(0)
             self.joystick.init()
             print(f"コントローラーが検出されました: {self.joystick.get_name()}")
-        try:
-            # 日本語フォントを使用
-            self.font = pygame.font.Font("/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc", 36)
-            self.large_font = pygame.font.Font("/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc", 48)
-        except:
-            try:
-                # HackGenフォントを試す
-                self.font = pygame.font.Font("/usr/share/fonts/TTF/HackGen-Regular.ttf", 36)
-                self.large_font = pygame.font.Font("/usr/share/fonts/TTF/HackGen-Regular.ttf", 48)
-            except:
-                # それでもダメならpygameの日本語対応フォントを使用
-                self.font = pygame.font.Font(None, 36)
-                self.large_font = pygame.font.Font(None, 48)
+        # 日本語フォントを使用（見つからなければpygameの既定フォント）
+        self.font = load_font(JAPANESE_FONTS, 36)
+        self.large_font = load_font(JAPANESE_FONTS, 48)
         
         self.state = "player_select"
         self.selected_player = 1
@@ -1,17 +1,12 @@
 import pygame
+from font_cache import load_font
+from text_display import MINCHO_FONTS
 
 class ChoiceSystem:
     def __init__(self, screen):
         self.screen = screen
         # 明朝体フォントを使用
-        try:
-            self.font = pygame.font.Font("/usr/share/fonts/noto-cjk/NotoSerifCJK-Regular.ttc", 28)
-        except:
-            try:
-                # fallbackとしてシステムフォントを試す
-                self.font = pygame.font.SysFont("notoserifcjkjp", 28)
-            except:
-                self.font = pygame.font.Font(None, 28)
+        self.font = load_font(MINCHO_FONTS, 28)
         self.choices = []
         self.selected_choice = 0
         self.choice_rect_height = 50
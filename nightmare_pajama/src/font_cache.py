@@ -0,0 +1,160 @@
+"""起動時のフォント探索結果をディスクに保存して使い回すキャッシュ
+
+pygame.font.SysFont / match_font は初回呼び出し時にLinuxではfc-listでシステムフォントを列挙するため、
+起動のたびに数百ミリ秒かかる。ここでは「候補リスト → 見つかったフォントファイルのパス」を保存しておき、
+2回目以降の起動ではfc-listを呼ばずにパスから直接フォントを開く。
+
+フォントの追加・削除に追従するため、キャッシュはフォント設定・フォントディレクトリ・fontconfigの
+キャッシュディレクトリの最終更新時刻がすべて前回と同じときだけ使う。
+
+alien / hyper_shooting / nightmare_pajama は同じ内容のこのファイルをそれぞれ持ち、
+キャッシュファイル（既定は ~/.cache/sandbox/fonts.json）を共有する。
+書き込むときはファイルを読み直して他のゲームが保存した分とまとめ、一時ファイルからの置き換えで保存するので、
+同時に起動したゲーム同士で互いの保存内容を消すことはない。
+
+候補は次のどちらかの文字列で指定する:
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc"  # フォントファイルのパス
+    "notosanscjkjp"                                      # システムフォント名（match_fontで探す）
+"""
+
+import json
+import os
+import sys
+
+import pygame
+
+# キャッシュの中身の形式を変えたときに上げる
+CACHE_VERSION = 1
+
+# フォントのインストール・削除で更新時刻が変わる場所
+FONT_CONFIG_PATHS = (
+    "/etc/fonts",
+    "/etc/fonts/conf.d",
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "/var/cache/fontconfig",
+    "~/.fonts",
+    "~/.local/share/fonts",
+    "~/.cache/fontconfig",
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    "~/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+)
+
+
+def default_cache_path():
+    """キャッシュファイルのパス（SANDBOX_FONT_CACHE > XDG_CACHE_HOME > ~/.cache の順）"""
+    path = os.environ.get("SANDBOX_FONT_CACHE")
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "sandbox", "fonts.json")
+
+
+def font_config_mtime():
+    """フォント関連のディレクトリの最終更新時刻（存在しないものは無視。1つも無ければ0）"""
+    latest = 0.0
+    for path in FONT_CONFIG_PATHS:
+        try:
+            mtime = os.stat(os.path.expanduser(path)).st_mtime
+        except OSError:
+            continue
+        if mtime > latest:
+            latest = mtime
+    return latest
+
+
+def _is_file_candidate(candidate):
+    return os.sep in candidate or "/" in candidate or candidate.lower().endswith((".ttf", ".ttc", ".otf"))
+
+
+def _find(candidate):
+    """候補1つをフォントファイルのパスにする（見つからなければNone）"""
+    if _is_file_candidate(candidate):
+        return candidate if os.path.isfile(candidate) else None
+    try:
+        return pygame.font.match_font(candidate)
+    except Exception:
+        return None
+
+
+class FontCache:
+    """候補リストごとに、最初に見つかったフォントファイルのパスを覚えておくキャッシュ"""
+
+    def __init__(self, path=None):
+        self.path = path or default_cache_path()
+        self.mtime = font_config_mtime()
+        self.fonts = self._read()
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        if data.get("version") != CACHE_VERSION or data.get("font_config_mtime") != self.mtime:
+            return {}  # フォントの構成が変わったので全部探し直す
+        fonts = data.get("fonts")
+        return fonts if isinstance(fonts, dict) else {}
+
+    def _write(self):
+        if sys.platform == "emscripten":
+            return
+        # 読み込んだ後に他のゲームが保存した分を取り込んでから書く（自分が探した結果を優先）
+        fonts = self._read()
+        fonts.update(self.fonts)
+        self.fonts = fonts
+        data = {"version": CACHE_VERSION, "font_config_mtime": self.mtime, "fonts": fonts}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write font cache {self.path}: {e}")
+
+    def resolve(self, candidates):
+        """候補を順に探し、最初に見つかったフォントファイルのパスを返す（どれも無ければNone）"""
+        key = json.dumps(list(candidates), ensure_ascii=False)
+        if key in self.fonts:
+            path = self.fonts[key]
+            # 保存後にファイルだけ消された場合は探し直す
+            if path is None or os.path.isfile(path):
+                self.hits += 1
+                return path
+        self.misses += 1
+        path = None
+        for candidate in candidates:
+            path = _find(candidate)
+            if path:
+                break
+        self.fonts[key] = path
+        self._write()
+        return path
+
+    def load(self, candidates, size):
+        """候補から見つかったフォントをsizeで開く（どれも無ければpygameの既定フォント）"""
+        path = self.resolve(candidates)
+        if path is not None:
+            try:
+                return pygame.font.Font(path, size)
+            except (OSError, pygame.error):
+                pass
+        return pygame.font.Font(None, size)
+
+
+_default_cache = None
+
+
+def load_font(candidates, size):
+    """既定のキャッシュを使ってフォントを開く"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FontCache()
+    return _default_cache.load(candidates, size)
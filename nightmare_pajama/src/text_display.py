@@ -1,4 +1,11 @@
 import pygame
+from font_cache import load_font
+
+# 明朝体フォントの候補（上から順に探す）
+MINCHO_FONTS = (
+    "/usr/share/fonts/noto-cjk/NotoSerifCJK-Regular.ttc",
+    "notoserifcjkjp",
+)
 
 class TextDisplay:
     def __init__(self, screen):
@@ -6,14 +13,7 @@ class TextDisplay:
         self.font_size = 24
         # 明朝体フォントを使用（ホラー風にサイズを調整）
         self.font_size = 26  # 少し大きめでインパクトを
-        try:
-            self.font = pygame.font.Font("/usr/share/fonts/noto-cjk/NotoSerifCJK-Regular.ttc", self.font_size)
-        except:
-            try:
-                # fallbackとしてシステムフォントを試す
-                self.font = pygame.font.SysFont("notoserifcjkjp", self.font_size)
-            except:
-                self.font = pygame.font.Font(None, self.font_size)
+        self.font = load_font(MINCHO_FONTS, self.font_size)
         
         # テキスト表示領域（画面中央）
         self.text_box_rect = pygame.Rect(50, 284, 924, 200)  # 中央に配置